@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Run several GONet log analyzers over ONE read of a log file.
+
+Instead of running analyze_quantization_anchoring.py, analyze_physics_time.py,
+analyze_rpc_validation.py and analyze_ongonetready_timing.py one after another
+(each re-reading the same 1GB+ log), this streams the file once and hands
+every line to every selected analyzer.
+
+Usage:
+    python analyze_all.py <log_file_path>... [--analyzers quantization,physics,rpc,ongonetready]
+                          [--gonetid <id>[,<id>...] [--index]] [--server-only] [--jobs <N>] [--cache]
+                          [--reset-seconds <s>] [--ping-pong-ms <ms>]
+                          [--burst-frames <N>] [--burst-min <N>] [--stalls <N>] [--pacing-window <s>]
+                          [--since <time>] [--until <time>] [--time-index]
+                          [--follow [--state <file>] [--report-every <seconds>]]
+
+Example:
+    python analyze_all.py gonet-2025-10-26.log
+    python analyze_all.py gonet-2025-10-26.log --analyzers quantization,physics --gonetid 5119
+    python analyze_all.py gonet-2025-10-26.log --cache
+    python analyze_all.py gonet-2025-10-26.log --analyzers quantization --gonetid 5119,5120 --index
+    python analyze_all.py gonet-2025-10-26.log --since "2025-10-26 14:05" --until 14:10
+    python analyze_all.py archive/gonet-2025-10-2*.log.gz      (a week of compressed daily logs)
+    python analyze_all.py ~/AppData/LocalLow/<company>/<product>/logs --follow --analyzers quantization,ongonetready
+"""
+
+import argparse
+import sys
+
+from gonet_log_driver import ANALYZER_REGISTRY, create_analyzers, parse_int_list, run_analyzers
+from gonet_log_follow import DEFAULT_REPORT_SECONDS, follow_log
+
+# Importing the analyzer scripts registers their visitors with the driver
+import analyze_ongonetready_timing  # noqa: F401
+import analyze_physics_time  # noqa: F401
+import analyze_quantization_anchoring  # noqa: F401
+import analyze_rpc_validation  # noqa: F401
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run GONet log analyzers in a single pass over the log file.")
+    parser.add_argument('log_file', nargs='+',
+                        help="GONet log file(s), folders or glob patterns; .gz/.bz2/.zst archives are "
+                             "decompressed on the fly (--follow: one live log or logs folder)")
+    parser.add_argument('--analyzers', default=','.join(ANALYZER_REGISTRY),
+                        help=f"Comma-separated analyzers to run (default: all of {', '.join(ANALYZER_REGISTRY)})")
+    parser.add_argument('--gonetid', type=parse_int_list,
+                        help="Comma-separated GONetId filter for the quantization analyzer")
+    parser.add_argument('--index', action='store_true',
+                        help="With --gonetid, read only the lines mentioning those ids via <log_file>.gonetid.gonetcache "
+                             "(only when every selected analyzer is GONetId-filtered)")
+    parser.add_argument('--server-only', action='store_true', help="Physics analyzer ignores client logs")
+    parser.add_argument('--reset-seconds', type=float, default=analyze_physics_time.SESSION_RESET_SECONDS,
+                        help="Physics analyzer: a clock stepping back further than this is a session reset, "
+                             f"not a violation (default: {analyze_physics_time.SESSION_RESET_SECONDS:g})")
+    parser.add_argument('--ping-pong-ms', type=float, default=analyze_physics_time.PING_PONG_GAP_SECONDS * 1000,
+                        help="Physics analyzer: gonet.std ahead of gonet.fixed by more than this is ping-pong "
+                             f"(default: {analyze_physics_time.PING_PONG_GAP_SECONDS * 1000:g})")
+    parser.add_argument('--burst-frames', type=int, default=analyze_physics_time.BURST_FRAMES,
+                        help="Physics analyzer: catch-ups at most this many frames apart form a burst "
+                             f"(default: {analyze_physics_time.BURST_FRAMES})")
+    parser.add_argument('--burst-min', type=int, default=analyze_physics_time.BURST_MIN_CATCHUPS,
+                        help="Physics analyzer: catch-ups a burst needs to be reported "
+                             f"(default: {analyze_physics_time.BURST_MIN_CATCHUPS})")
+    parser.add_argument('--stalls', type=int, default=analyze_physics_time.STALLS_SHOWN,
+                        help="Physics analyzer: worst stall windows and bursts listed "
+                             f"(default: {analyze_physics_time.STALLS_SHOWN})")
+    parser.add_argument('--pacing-window', type=float,
+                        help="Physics analyzer: seconds per catch-up timeline window "
+                             f"(default: {analyze_physics_time.PACING_WINDOWS} windows over the session)")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Parse the file in N worker processes (analyzers without chunk support run single-threaded)")
+    parser.add_argument('--cache', action='store_true',
+                        help="Load/refresh decoded events of cacheable analyzers from <log_file>.<analyzer>.gonetcache")
+    parser.add_argument('--since',
+                        help="Only analyze lines logged at/after this time (\"2025-10-26 14:05:30\" or \"14:05:30\")")
+    parser.add_argument('--until', help="Only analyze lines logged at/before this time (same formats as --since)")
+    parser.add_argument('--time-index', action='store_true',
+                        help="Locate --since/--until via a timestamp index kept in <log_file>.timeindex.gonetcache")
+    parser.add_argument('--follow', action='store_true',
+                        help="Keep tailing the live log (following daily rollover) and print live summaries until Ctrl+C")
+    parser.add_argument('--state', help="Follow state file used to resume (default: <log>.follow.gonetcache, or .gonet-follow.state in a followed folder)")
+    parser.add_argument('--report-every', type=int, default=DEFAULT_REPORT_SECONDS,
+                        help=f"Seconds between live summaries in --follow mode (default: {DEFAULT_REPORT_SECONDS})")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.analyzers.split(',') if name.strip()]
+    unknown = [name for name in names if name not in ANALYZER_REGISTRY]
+    if unknown:
+        print(f"[ERROR] Unknown analyzer(s): {', '.join(unknown)} (available: {', '.join(ANALYZER_REGISTRY)})")
+        sys.exit(1)
+
+    options = {
+        'log_file': args.log_file,
+        'gonetid': args.gonetid,
+        'server_only': args.server_only,
+        'reset_seconds': args.reset_seconds,
+        'ping_pong_seconds': args.ping_pong_ms / 1000,
+        'burst_frames': args.burst_frames,
+        'burst_min': args.burst_min,
+        'stalls': args.stalls,
+        'pacing_window': args.pacing_window,
+    }
+    analyzers = create_analyzers(names, options)
+
+    print("=" * 80)
+    print("GONet Single-Pass Log Analysis")
+    print("=" * 80)
+    print(f"Log file:  {', '.join(args.log_file)}")
+    print(f"Analyzers: {', '.join(names)}")
+    print()
+
+    if args.follow:
+        if len(args.log_file) > 1:
+            print("[ERROR] --follow takes a single log file or logs folder")
+            sys.exit(1)
+        line_count = follow_log(args.log_file[0], analyzers, state_file=args.state, report_seconds=args.report_every,
+                                signature=(args.gonetid, args.server_only))
+        print(f"[OK] Followed {line_count:,} lines")
+    else:
+        try:
+            line_count = run_analyzers(args.log_file, analyzers, jobs=args.jobs, use_cache=args.cache,
+                                       since=args.since, until=args.until, time_index=args.time_index,
+                                       use_index=args.index)
+        except FileNotFoundError as e:
+            print(f"ERROR: Log file not found: {e}")
+            sys.exit(1)
+
+        print(f"[OK] Single pass complete! Processed {line_count:,} lines")
+
+    for analyzer in analyzers:
+        print()
+        print("#" * 80)
+        print(f"# {analyzer.name}")
+        print("#" * 80)
+        analyzer.report()
+
+
+if __name__ == "__main__":
+    main()
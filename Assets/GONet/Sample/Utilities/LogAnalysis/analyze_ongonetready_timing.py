@@ -3,73 +3,326 @@
 analyze_ongonetready_timing.py
 Analyzes OnGONetReady timing for all GONetParticipants (client and server)
 
-Usage: python3 analyze_ongonetready_timing.py <logfile>
+Usage: python3 analyze_ongonetready_timing.py <logfile> [--follow] [--since <time>] [--until <time>] [--time-index]
+
+Every peer found in the log is reported. Besides the Start() -> OnGONetReady
+frame delays, each participant's lifecycle is joined from its
+"Awake() START - InstanceID: N" line (by InstanceID), its optional
+"Start() called" line and its "OnGONetReady FIRED" line (by GONetId), and
+the Awake -> Start -> OnGONetReady latencies are reported in frames and
+wall-clock milliseconds per peer and per prefab. The join uses hash tables
+(one pass over each event list), so sessions with 100k+ participants stay
+linear.
+
+--follow keeps tailing the live log (or the newest gonet-YYYY-MM-DD.log of a
+logs folder) and prints per-peer OnGONetReady delays every 10 seconds; Ctrl+C
+prints the full report.
+
+--since/--until ("2025-10-11 14:05:30" or "14:05:30") only analyze the lines
+logged in that window, located by binary search on the log timestamps;
+--time-index keeps a timestamp index next to the log for repeated queries.
 """
 
 import sys
 import re
 from collections import defaultdict, Counter
+from typing import NamedTuple, Optional, Tuple
+
+from gonet_log_driver import LogAnalyzer, dispatch_records, parse_str_option, register_analyzer, run_analyzers
+from gonet_log_follow import follow_log
+from gonet_log_parser import iter_log_records, peer_sort_key, timestamp_seconds
+from gonet_log_stats import StreamingStats
+
+GONETID_PATTERN = re.compile(r'GONetId: (\d+)')
+GAMEOBJECT_PATTERN = re.compile(r'GameObject: ([^,]+)')
+INSTANCEID_PATTERN = re.compile(r'InstanceID: (-?\d+)')
+
+# Lifecycle latencies reported per peer and prefab: (label, from stage, to stage)
+LIFECYCLE_SPANS = (
+    ('Awake -> Start', 'awake', 'start'),
+    ('Start -> Ready', 'start', 'ready'),
+    ('Awake -> Ready', 'awake', 'ready'),
+)
+
+# Participants that never became ready, printed per peer in the lifecycle report
+NEVER_READY_SHOWN = 10
+
+
+class AwakeEvent(NamedTuple):
+    """A participant's GONetParticipant.Awake() START line"""
+    peer: str
+    instance_id: int
+    frame: int
+    wall: Optional[float]  # Wall-clock seconds (see timestamp_seconds)
+    gameobject: str
+
+
+class StartEvent(NamedTuple):
+    """A participant's Start() call (peer and GameObject strings are shared, not copied per line)"""
+    peer: str
+    gonetid: int
+    frame: int
+    gameobject: str
+    wall: Optional[float]
+
+
+class ReadyEvent(NamedTuple):
+    """A participant's OnGONetReady FIRED line"""
+    peer: str
+    gonetid: int
+    frame: int
+    instance_id: Optional[int]
+    wall: Optional[float]
+    gameobject: Optional[str]
+
+
+class Lifecycle(NamedTuple):
+    """One participant's joined lifecycle; each stage is (frame, wall-clock seconds) or None if not logged"""
+    peer: str
+    instance_id: Optional[int]
+    gonetid: Optional[int]
+    gameobject: str
+    awake: Optional[Tuple[int, Optional[float]]]
+    start: Optional[Tuple[int, Optional[float]]]
+    ready: Optional[Tuple[int, Optional[float]]]
+
+
+@register_analyzer('ongonetready')
+class OnGONetReadyTimingAnalyzer(LogAnalyzer):
+    """Collects Awake(), Start() and OnGONetReady FIRED events, one log record at a time"""
+
+    markers = ('Awake() START', 'Start() called', 'OnGONetReady FIRED')
+    supports_chunks = True
+
+    def __init__(self):
+        self.awake_events = []  # [AwakeEvent]
+        self.start_events = []  # [StartEvent]
+        self.ready_events = []  # [ReadyEvent]
+        self.results = []
+        self.stats_by_peer = {}
+        self.stats_by_type = {}
+        self.lifecycle_by_peer = {}
+        self.lifecycle_by_prefab = {}
+        self.never_ready = {}
+
+    def chunk_spec(self):
+        return OnGONetReadyTimingAnalyzer, ()
+
+    def get_state(self):
+        return self.awake_events, self.start_events, self.ready_events
+
+    def merge_state(self, state, line_offset):
+        awake_events, start_events, ready_events = state
+        self.awake_events.extend(awake_events)
+        self.start_events.extend(start_events)
+        self.ready_events.extend(ready_events)
+
+    def consume(self, line_number, record):
+        message = record.message
+        if not record.peer or record.frame is None:
+            return
+
+        # Extract Awake() events (every GONetParticipant, before it has a GONetId)
+        if 'Awake() START' in message:
+            instanceid_match = INSTANCEID_PATTERN.search(message)
+            gameobject_match = GAMEOBJECT_PATTERN.search(message)
+
+            if instanceid_match and gameobject_match:
+                self.awake_events.append(AwakeEvent(
+                    record.peer,
+                    int(instanceid_match.group(1)),
+                    record.frame,
+                    timestamp_seconds(record.timestamp),
+                    sys.intern(gameobject_match.group(1).strip())
+                ))
+
+        # Extract Start() events
+        elif 'Start() called' in message:
+            gonetid_match = GONETID_PATTERN.search(message)
+            gameobject_match = GAMEOBJECT_PATTERN.search(message)
+
+            if gonetid_match and gameobject_match:
+                self.start_events.append(StartEvent(
+                    record.peer,
+                    int(gonetid_match.group(1)),
+                    record.frame,
+                    sys.intern(gameobject_match.group(1).strip()),
+                    timestamp_seconds(record.timestamp)
+                ))
+
+        # Extract OnGONetReady FIRED events
+        elif 'OnGONetReady FIRED' in message:
+            gonetid_match = GONETID_PATTERN.search(message)
+            instanceid_match = INSTANCEID_PATTERN.search(message)
+            gameobject_match = GAMEOBJECT_PATTERN.search(message)
+
+            if gonetid_match:
+                self.ready_events.append(ReadyEvent(
+                    record.peer,
+                    int(gonetid_match.group(1)),
+                    record.frame,
+                    int(instanceid_match.group(1)) if instanceid_match else None,
+                    timestamp_seconds(record.timestamp),
+                    sys.intern(gameobject_match.group(1).strip()) if gameobject_match else None
+                ))
+
+    def finalize(self):
+        self.results = join_events(self.start_events, self.ready_events)
+        self.stats_by_peer = calculate_stats(self.results)
+        self.stats_by_type = calculate_gameobject_stats(self.results)
+        self.lifecycle_by_peer, self.lifecycle_by_prefab, self.never_ready = calculate_lifecycle_stats(
+            join_lifecycles(self.awake_events, self.start_events, self.ready_events))
+
+    def live_summary(self):
+        parts = []
+        for peer, stats in sorted(calculate_stats(join_events(self.start_events, self.ready_events)).items()):
+            delays = stats['delays']
+            avg_delay = f"{delays.mean:.2f}" if delays.count else "-"
+            parts.append(f"{peer} fired {stats['fired']}/{stats['total']} avg {avg_delay} frames")
+        return ' | '.join(parts) or "no participants yet"
+
+    def report(self):
+        print(f"Extracted {len(self.awake_events)} Awake() events")
+        print(f"Extracted {len(self.start_events)} Start() events")
+        print(f"Extracted {len(self.ready_events)} OnGONetReady FIRED events")
+        print()
+
+        print_stats(self.stats_by_peer)
+        print_never_fired(self.stats_by_peer)
+        print_gameobject_stats(self.stats_by_type)
+        print_lifecycle_stats(self.lifecycle_by_peer, self.lifecycle_by_prefab, self.never_ready)
+        print_results_sample(self.results)
 
 def parse_log(logfile):
     """Parse log file and extract Start() and OnGONetReady FIRED events"""
 
-    start_events = []  # [(peer, gonetid, frame, gameobject)]
-    ready_events = []  # [(peer, gonetid, frame)]
-
-    with open(logfile, 'r', encoding='utf-8', errors='ignore') as f:
-        for line in f:
-            # Extract Start() events
-            if 'Start() called' in line:
-                peer_match = re.search(r'\[(Client:\d+|Server)\]', line)
-                frame_match = re.search(r'frame:(\d+)/', line)
-                gonetid_match = re.search(r'GONetId: (\d+)', line)
-                gameobject_match = re.search(r'GameObject: ([^,]+)', line)
-
-                if peer_match and frame_match and gonetid_match and gameobject_match:
-                    start_events.append((
-                        peer_match.group(1),
-                        int(gonetid_match.group(1)),
-                        int(frame_match.group(1)),
-                        gameobject_match.group(1).strip()
-                    ))
-
-            # Extract OnGONetReady FIRED events
-            elif 'OnGONetReady FIRED' in line:
-                peer_match = re.search(r'\[(Client:\d+|Server)\]', line)
-                frame_match = re.search(r'frame:(\d+)/', line)
-                gonetid_match = re.search(r'GONetId: (\d+)', line)
-
-                if peer_match and frame_match and gonetid_match:
-                    ready_events.append((
-                        peer_match.group(1),
-                        int(gonetid_match.group(1)),
-                        int(frame_match.group(1))
-                    ))
-
-    return start_events, ready_events
+    analyzer = OnGONetReadyTimingAnalyzer()
+    dispatch_records(iter_log_records(logfile, markers=analyzer.markers), [analyzer])
+    return analyzer.start_events, analyzer.ready_events
 
 def join_events(start_events, ready_events):
     """Join Start and Ready events to calculate frame delays"""
 
     # Create dict for quick lookup of ready events
     ready_dict = {}
-    for peer, gonetid, frame in ready_events:
-        key = (peer, gonetid)
+    for ready in ready_events:
+        key = (ready.peer, ready.gonetid)
         if key not in ready_dict:
-            ready_dict[key] = frame
+            ready_dict[key] = ready.frame
 
     results = []
-    for peer, gonetid, start_frame, gameobject in start_events:
-        key = (peer, gonetid)
+    for start in start_events:
+        key = (start.peer, start.gonetid)
         if key in ready_dict:
             ready_frame = ready_dict[key]
-            frame_delay = ready_frame - start_frame
-            results.append((peer, gonetid, gameobject, start_frame, ready_frame, frame_delay))
+            frame_delay = ready_frame - start.frame
+            results.append((start.peer, start.gonetid, start.gameobject, start.frame, ready_frame, frame_delay))
         else:
-            results.append((peer, gonetid, gameobject, start_frame, None, None))
+            results.append((start.peer, start.gonetid, start.gameobject, start.frame, None, None))
 
     return results
 
+def join_lifecycles(awake_events, start_events, ready_events):
+    """
+    Yield one Lifecycle per participant: Awake -> OnGONetReady by (peer, InstanceID),
+    Start -> OnGONetReady by (peer, GONetId). The first event per key wins.
+
+    Participants whose Awake() was not logged still yield their Start/Ready
+    stages, and an Awake that never became ready yields a Lifecycle without
+    a ready stage. Start() lines carry no InstanceID, so a Start that never
+    became ready only counts as a participant on peers that log no Awake()
+    at all (elsewhere its Awake already did). Each event list is read once,
+    so the join is linear.
+    """
+    ready_by_instance = {}
+    ready_by_gonetid = {}
+    for ready in ready_events:
+        ready_by_gonetid.setdefault((ready.peer, ready.gonetid), ready)
+        if ready.instance_id is not None:
+            ready_by_instance.setdefault((ready.peer, ready.instance_id), ready)
+
+    start_by_gonetid = {}
+    for start in start_events:
+        start_by_gonetid.setdefault((start.peer, start.gonetid), start)
+
+    joined_ready = set()  # (peer, gonetid) of the ready events consumed by an Awake
+    seen_awake = set()
+    for awake in awake_events:
+        key = (awake.peer, awake.instance_id)
+        if key in seen_awake:
+            continue
+        seen_awake.add(key)
+
+        ready = ready_by_instance.get(key)
+        if ready is None:
+            yield Lifecycle(awake.peer, awake.instance_id, None, awake.gameobject, (awake.frame, awake.wall), None, None)
+            continue
+        ready_key = (ready.peer, ready.gonetid)
+        joined_ready.add(ready_key)
+        start = start_by_gonetid.get(ready_key)
+        yield Lifecycle(awake.peer, awake.instance_id, ready.gonetid, awake.gameobject, (awake.frame, awake.wall),
+                        (start.frame, start.wall) if start else None, (ready.frame, ready.wall))
+
+    # Participants without a logged Awake(): Start and/or Ready only
+    for ready_key, ready in ready_by_gonetid.items():
+        if ready_key in joined_ready:
+            continue
+        start = start_by_gonetid.get(ready_key)
+        gameobject = start.gameobject if start else (ready.gameobject or '?')
+        yield Lifecycle(ready.peer, ready.instance_id, ready.gonetid, gameobject, None,
+                        (start.frame, start.wall) if start else None, (ready.frame, ready.wall))
+    awake_peers = {peer for peer, _ in seen_awake}
+    for start_key, start in start_by_gonetid.items():
+        if start_key not in ready_by_gonetid and start.peer not in awake_peers:
+            yield Lifecycle(start.peer, None, start.gonetid, start.gameobject, None, (start.frame, start.wall), None)
+
+class LifecycleStats:
+    """Participant counts plus frame and wall-clock latency distributions of every LIFECYCLE_SPANS span"""
+
+    def __init__(self):
+        self.participants = 0
+        self.ready = 0
+        self.frames = {label: StreamingStats() for label, _, _ in LIFECYCLE_SPANS}
+        self.millis = {label: StreamingStats() for label, _, _ in LIFECYCLE_SPANS}
+
+    def add(self, lifecycle):
+        self.participants += 1
+        if lifecycle.ready is not None:
+            self.ready += 1
+        for label, first, last in LIFECYCLE_SPANS:
+            begin, end = getattr(lifecycle, first), getattr(lifecycle, last)
+            if begin is None or end is None:
+                continue
+            self.frames[label].add(end[0] - begin[0])
+            if begin[1] is not None and end[1] is not None:
+                self.millis[label].add((end[1] - begin[1]) * 1000.0)
+
+    def merge(self, other):
+        self.participants += other.participants
+        self.ready += other.ready
+        for label, _, _ in LIFECYCLE_SPANS:
+            self.frames[label].merge(other.frames[label])
+            self.millis[label].merge(other.millis[label])
+
+def calculate_lifecycle_stats(lifecycles):
+    """Aggregate lifecycles by peer and by (peer, prefab); keeps only the first never-ready participants per peer"""
+
+    by_prefab = defaultdict(LifecycleStats)
+    never_ready = defaultdict(list)
+
+    for lifecycle in lifecycles:
+        prefab = lifecycle.gameobject.replace('(Clone)', '').strip()
+        by_prefab[(lifecycle.peer, prefab)].add(lifecycle)
+        if lifecycle.ready is None and len(never_ready[lifecycle.peer]) < NEVER_READY_SHOWN:
+            never_ready[lifecycle.peer].append(lifecycle)
+
+    # Peer totals are merged from the prefab distributions instead of adding every latency twice
+    by_peer = defaultdict(LifecycleStats)
+    for (peer, _), stats in by_prefab.items():
+        by_peer[peer].merge(stats)
+
+    return by_peer, by_prefab, never_ready
+
 def calculate_stats(results):
     """Calculate statistics by peer"""
 
@@ -77,7 +330,8 @@ def calculate_stats(results):
         'total': 0,
         'fired': 0,
         'never': 0,
-        'delays': [],
+        'delays': StreamingStats(),
+        'delay_counts': Counter(),
         'never_fired': []
     })
 
@@ -87,7 +341,8 @@ def calculate_stats(results):
 
         if frame_delay is not None:
             stats['fired'] += 1
-            stats['delays'].append(frame_delay)
+            stats['delays'].add(frame_delay)
+            stats['delay_counts'][frame_delay] += 1
         else:
             stats['never'] += 1
             stats['never_fired'].append((gonetid, gameobject, start_frame))
@@ -100,7 +355,7 @@ def calculate_gameobject_stats(results):
     stats_by_type = defaultdict(lambda: {
         'fired': 0,
         'never': 0,
-        'delays': []
+        'delays': StreamingStats()
     })
 
     for peer, gonetid, gameobject, start_frame, ready_frame, frame_delay in results:
@@ -109,7 +364,7 @@ def calculate_gameobject_stats(results):
 
         if frame_delay is not None:
             stats_by_type[name]['fired'] += 1
-            stats_by_type[name]['delays'].append(frame_delay)
+            stats_by_type[name]['delays'].add(frame_delay)
         else:
             stats_by_type[name]['never'] += 1
 
@@ -123,37 +378,33 @@ def print_stats(stats_by_peer):
     print("=" * 60)
     print()
 
-    for peer in ['Server', 'Client:1']:
-        if peer not in stats_by_peer:
-            print(f"--- {peer} ---")
-            print("No participants found")
-            print()
-            continue
+    if not stats_by_peer:
+        print("No participants found")
+        print()
 
+    for peer in sorted(stats_by_peer, key=peer_sort_key):
         stats = stats_by_peer[peer]
         print(f"--- {peer} ---")
         print(f"Total participants: {stats['total']}")
         print(f"[OK] OnGONetReady fired: {stats['fired']} ({100.0 * stats['fired'] / stats['total']:.1f}%)")
         print(f"[!!] OnGONetReady NEVER fired: {stats['never']}")
 
-        if stats['delays']:
+        if stats['delays'].count:
             delays = stats['delays']
-            avg_delay = sum(delays) / len(delays)
-            min_delay = min(delays)
-            max_delay = max(delays)
 
             print()
-            print(f"Average frame delay: {avg_delay:.2f} frames")
-            print(f"Min frame delay: {min_delay} frame(s)")
-            print(f"Max frame delay: {max_delay} frame(s)")
+            print(f"Average frame delay: {delays.mean:.2f} frames")
+            print(f"Min frame delay: {delays.min} frame(s)")
+            print(f"Max frame delay: {delays.max} frame(s)")
+            print(f"Frame delay percentiles: {delays.format_percentiles('.0f')}")
 
             # Delay distribution
             print()
             print("Frame delay distribution:")
-            delay_counts = Counter(delays)
+            delay_counts = stats['delay_counts']
             for delay in sorted(delay_counts.keys()):
                 count = delay_counts[delay]
-                pct = 100.0 * count / len(delays)
+                pct = 100.0 * count / delays.count
                 print(f"  {delay:2d} frames: {count:4d} participants ({pct:5.1f}%)")
 
         print()
@@ -191,40 +442,67 @@ def print_gameobject_stats(stats_by_type):
         stats = stats_by_type[name]
         print(f"{name}:")
 
-        if stats['delays']:
-            avg_delay = sum(stats['delays']) / len(stats['delays'])
-            min_delay = min(stats['delays'])
-            max_delay = max(stats['delays'])
-            print(f"  [OK] Fired: {stats['fired']}, [!!] Never: {stats['never']}, Avg: {avg_delay:.2f} frames, Min: {min_delay}, Max: {max_delay}")
+        delays = stats['delays']
+        if delays.count:
+            print(f"  [OK] Fired: {stats['fired']}, [!!] Never: {stats['never']}, Avg: {delays.mean:.2f} frames, Min: {delays.min}, Max: {delays.max}, p99: {delays.percentile(99):.0f}")
         else:
             print(f"  [OK] Fired: 0, [!!] Never: {stats['never']}")
 
         print()
 
-def main():
-    logfile = sys.argv[1] if len(sys.argv) > 1 else \
-        "C:/Users/shash/AppData/LocalLow/Galore Interactive/GONetSandbox/logs/gonet-2025-10-11.log"
+def print_lifecycle_spans(stats, indent):
+    """One line per lifecycle span that has joined participants: count, frame and wall-clock percentiles"""
+    for label, _, _ in LIFECYCLE_SPANS:
+        frames, millis = stats.frames[label], stats.millis[label]
+        if not frames.count:
+            continue
+        line = f"{indent}{label}: {frames.count:6d} joined | frames {frames.format_percentiles('.0f')}"
+        if millis.count:
+            line += f" | wall {millis.format_percentiles('.1f', 'ms')}"
+        print(line)
+
+def print_lifecycle_stats(lifecycle_by_peer, lifecycle_by_prefab, never_ready):
+    """Print Awake -> Start -> OnGONetReady latencies by peer and prefab"""
 
     print("=" * 60)
-    print("OnGONetReady Timing Analysis")
+    print("LIFECYCLE BY PEER (Awake -> Start -> OnGONetReady)")
     print("=" * 60)
-    print(f"Log file: {logfile}")
     print()
 
-    start_events, ready_events = parse_log(logfile)
-    print(f"Extracted {len(start_events)} Start() events")
-    print(f"Extracted {len(ready_events)} OnGONetReady FIRED events")
-    print()
+    if not lifecycle_by_peer:
+        print("No participants found")
+        print()
+        return
+
+    prefabs_by_peer = defaultdict(list)
+    for peer, prefab in lifecycle_by_prefab:
+        prefabs_by_peer[peer].append(prefab)
 
-    results = join_events(start_events, ready_events)
-    stats_by_peer = calculate_stats(results)
-    stats_by_type = calculate_gameobject_stats(results)
+    for peer in sorted(lifecycle_by_peer, key=peer_sort_key):
+        stats = lifecycle_by_peer[peer]
+        never = stats.participants - stats.ready
+        print(f"--- {peer} ---")
+        print(f"Participants: {stats.participants}, [OK] ready: {stats.ready} "
+              f"({100.0 * stats.ready / stats.participants:.1f}%), [!!] never ready: {never}")
+        print_lifecycle_spans(stats, "  ")
+
+        print("  By prefab:")
+        for prefab in sorted(prefabs_by_peer[peer]):
+            prefab_stats = lifecycle_by_prefab[(peer, prefab)]
+            print(f"    {prefab}: {prefab_stats.ready}/{prefab_stats.participants} ready")
+            print_lifecycle_spans(prefab_stats, "      ")
+
+        if never:
+            print(f"  Never ready (first {min(never, NEVER_READY_SHOWN)} of {never}):")
+            for lifecycle in never_ready[peer]:
+                first_frame = (lifecycle.awake or lifecycle.start)[0]
+                print(f"    InstanceID: {lifecycle.instance_id}, GONetId: {lifecycle.gonetid}, "
+                      f"GameObject: {lifecycle.gameobject}, FirstFrame: {first_frame}")
+        print()
 
-    print_stats(stats_by_peer)
-    print_never_fired(stats_by_peer)
-    print_gameobject_stats(stats_by_type)
+def print_results_sample(results):
+    """Print the first 20 joined results"""
 
-    # Print sample results
     print("=" * 60)
     print("DETAILED RESULTS SAMPLE")
     print("=" * 60)
@@ -238,5 +516,23 @@ def main():
         print(f"{peer:<12} {gonetid:<10} {gameobject:<30} {start_frame:<12} {ready_str:<12} {delay_str:<12}")
     print()
 
+def main():
+    logfile = sys.argv[1] if len(sys.argv) > 1 else \
+        "C:/Users/shash/AppData/LocalLow/Galore Interactive/GONetSandbox/logs/gonet-2025-10-11.log"
+
+    print("=" * 60)
+    print("OnGONetReady Timing Analysis")
+    print("=" * 60)
+    print(f"Log file: {logfile}")
+    print()
+
+    analyzer = OnGONetReadyTimingAnalyzer()
+    if '--follow' in sys.argv:
+        follow_log(logfile, [analyzer])
+    else:
+        run_analyzers(logfile, [analyzer], progress=False, since=parse_str_option(sys.argv, '--since'),
+                      until=parse_str_option(sys.argv, '--until'), time_index='--time-index' in sys.argv)
+    analyzer.report()
+
 if __name__ == '__main__':
     main()
@@ -31,19 +31,16 @@ echo "Extracted $(wc -l < "$START_FILE") Start() events"
 echo "Extracted $(wc -l < "$READY_FILE") OnGONetReady FIRED events"
 echo ""
 
-# Join Start and Ready data
+# Join Start and Ready data (hash join in one awk pass: first Ready per peer+GONetId)
 echo -e "Peer\tGONetId\tGameObject\tStartFrame\tReadyFrame\tFrameDelay" > "$RESULTS_FILE"
 
-while IFS=$'\t' read -r peer gonetid start_frame gameobject; do
-    ready_frame=$(grep "^${peer}	${gonetid}	" "$READY_FILE" | head -1 | cut -f3)
-    
-    if [ -n "$ready_frame" ]; then
-        frame_delay=$((ready_frame - start_frame))
-        echo -e "$peer\t$gonetid\t$gameobject\t$start_frame\t$ready_frame\t$frame_delay" >> "$RESULTS_FILE"
-    else
-        echo -e "$peer\t$gonetid\t$gameobject\t$start_frame\tNEVER\tNEVER" >> "$RESULTS_FILE"
-    fi
-done < "$START_FILE"
+awk -F'\t' -v OFS='\t' '
+NR == FNR { key = $1 FS $2; if (!(key in ready)) ready[key] = $3; next }
+{
+    key = $1 FS $2
+    if (key in ready) print $1, $2, $4, $3, ready[key], ready[key] - $3
+    else print $1, $2, $4, $3, "NEVER", "NEVER"
+}' "$READY_FILE" "$START_FILE" >> "$RESULTS_FILE"
 
 # Calculate statistics
 echo "========================================"
@@ -51,8 +48,9 @@ echo "SUMMARY BY PEER"
 echo "========================================"
 echo ""
 
-for peer in "Server" "Client:1"; do
-    peer_data=$(grep "^${peer}	" "$RESULTS_FILE" | tail -n +2)
+# Every peer in the log: Server first, then clients by authority id
+for peer in $(tail -n +2 "$RESULTS_FILE" | cut -f1 | sort -u -t: -k1,1r -k2,2n); do
+    peer_data=$(grep "^${peer}	" "$RESULTS_FILE")
     
     if [ -z "$peer_data" ]; then
         echo "--- $peer ---"
@@ -3,42 +3,259 @@
 Analyzes GONet physics time logs to detect ping-pong behavior and verify monotonicity.
 
 Usage:
-    python analyze_physics_time.py <log_file_path>
+    python analyze_physics_time.py <log_file_path> [--server-only] [--jobs <N>] [--cache] [--follow]
+                                   [--since <time>] [--until <time>] [--time-index]
+                                   [--reset-seconds <s>] [--ping-pong-ms <ms>]
+                                   [--burst-frames <N>] [--burst-min <N>] [--stalls <N>] [--pacing-window <s>]
+
+--since/--until ("2025-10-16 14:05:30" or "14:05:30") analyze only the lines
+logged in that window; --time-index keeps a timestamp index next to the log
+for repeated window queries.
+
+--reset-seconds (default 1) is how far gonet.fixed/gonet.std may step back
+before it counts as a session reset instead of a monotonicity violation;
+--ping-pong-ms (default 5) is the gonet.std - gonet.fixed gap reported as
+ping-pong.
+
+Each peer of a shared log ("Server", "Client:N") is checked against its own
+previous values in the same pass; the report lists the results per peer.
+
+The Frame Pacing section shows catch-ups per wall-clock window (--pacing-window
+seconds, default: 20 windows over the session), bursts of --burst-min (3)
+catch-ups each at most --burst-frames (30) frames apart, the drift of
+unity.realtimeSinceStartup against gonet.fixed per peer, and the --stalls (10)
+largest unity.realtimeSinceStartup gaps between a peer's entries.
 
 Example:
     python analyze_physics_time.py "C:/Users/shash/AppData/LocalLow/Galore Interactive/GONetSandbox/logs/gonet-2025-10-16.log"
 """
 
+import bisect
+import heapq
+import math
 import sys
 import re
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import time
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 from enum import Enum
 
+from gonet_log_cache import StringColumn, decode_strings, encode_strings
+from gonet_log_driver import (LogAnalyzer, parse_float_option, parse_int_option, parse_str_option, register_analyzer,
+                              run_analyzers)
+from gonet_log_follow import follow_log
+from gonet_log_parser import FieldTokenizer, LogRecord, peer_sort_key, timestamp_seconds
+from gonet_log_stats import StreamingStats
+
+try:
+    import numpy as np
+except ImportError:  # Optional: the checks fall back to one pure-Python pass over the same columns
+    np = None
+
+# gonet.fixed/gonet.std stepping back by more than this is a session reset (new client, scene reload), not a violation
+SESSION_RESET_SECONDS = 1.0
+
+# gonet.std ahead of gonet.fixed by more than this is ping-pong (smaller gaps are caching differences)
+PING_PONG_GAP_SECONDS = 0.005
+
+# Label of entries whose log header carried no role
+UNKNOWN_PEER = 'Unknown'
+
+# Violations listed per peer and check
+VIOLATIONS_SHOWN = 10
+
+# Catch-ups at most this many frames after the peer's previous catch-up belong to the same burst
+BURST_FRAMES = 30
+
+# Catch-ups a burst needs before it is reported
+BURST_MIN_CATCHUPS = 3
+
+# Worst stall windows and bursts listed
+STALLS_SHOWN = 10
+
+# Windows of the catch-up timeline when no window width is given
+PACING_WINDOWS = 20
+
+# Width in characters of the catch-up timeline bars
+PACING_BAR_WIDTH = 30
+
 
 class UpdateType(Enum):
     UPDATE = "Update"
     FIXED_UPDATE = "FixedUpdate"
 
 
-@dataclass
 class TimeEntry:
-    """Single time measurement from logs"""
+    """Single time measurement from logs (one row of a PhysicsTimeSeries)"""
+    __slots__ = ('line_number', 'timestamp', 'update_type', 'gonet_fixed', 'gonet_std', 'unity_fixed',
+                 'unity_std', 'unity_realtime', 'debug_stopwatch', 'peer')
+
+    def __init__(self, line_number: int, timestamp: str, update_type: UpdateType, gonet_fixed: float,
+                 gonet_std: float, unity_fixed: float, unity_std: float, unity_realtime: float,
+                 debug_stopwatch: float, peer: Optional[str] = None):
+        self.line_number = line_number
+        self.timestamp = timestamp
+        self.update_type = update_type
+        self.gonet_fixed = gonet_fixed
+        self.gonet_std = gonet_std
+        self.unity_fixed = unity_fixed
+        self.unity_std = unity_std
+        self.unity_realtime = unity_realtime
+        self.debug_stopwatch = debug_stopwatch
+
+        # Peer label from the log header ("Server", "Client:N")
+        self.peer = peer
+
+    def __repr__(self) -> str:
+        return (f"TimeEntry(line_number={self.line_number}, update_type={self.update_type.name}, "
+                f"gonet_fixed={self.gonet_fixed}, gonet_std={self.gonet_std}, peer={self.peer!r})")
+
+
+class CatchupEvent(NamedTuple):
+    """One "Caught up N physics steps" line"""
     line_number: int
-    timestamp: str
-    update_type: UpdateType
-    gonet_fixed: float
-    gonet_std: float
-    unity_fixed: float
-    unity_std: float
-    unity_realtime: float
-    debug_stopwatch: float
-
-    # Optional catchup info
-    catchup_iterations: Optional[int] = None
-    catchup_from: Optional[float] = None
-    catchup_to: Optional[float] = None
-    catchup_target: Optional[float] = None
+    iterations: int
+    from_time: float
+    to_time: float
+    target_time: float
+    peer: Optional[str]
+    frame: int = -1      # GONet frame of the log header, -1 if it had none
+    timestamp: str = ''  # Wall-clock timestamp of the log header
+
+UPDATE_TYPE_CODES = {UpdateType.UPDATE: 0, UpdateType.FIXED_UPDATE: 1}
+UPDATE_TYPES_BY_CODE = [UpdateType.UPDATE, UpdateType.FIXED_UPDATE]
+
+
+def _vector(column: array):
+    """Zero-copy NumPy view of an array.array column (the column itself without NumPy)."""
+    if np is None:
+        return column
+    if not column:
+        return np.empty(0, dtype=column.typecode)
+    return np.frombuffer(column, dtype=column.typecode)
+
+
+def _extend_column(column: array, values):
+    """Append a NumPy array or any iterable of values to an array.array column."""
+    if np is not None and isinstance(values, np.ndarray):
+        column.frombytes(values.astype(column.typecode, copy=False).tobytes())
+    else:
+        column.extend(values)
+
+
+class PhysicsTimeSeries:
+    """
+    [PhysicsTime] entries as growable typed columns instead of one TimeEntry per line.
+
+    Numeric fields are array.array columns, the timestamp and peer are
+    dictionary-encoded StringColumns ('' for an unknown peer). A soak log with
+    tens of millions of entries then costs a few bytes per field, and
+    analyze_time_entries() checks whole columns through NumPy views.
+    """
+    numeric_fields = {'line_number': 'q', 'update_type': 'b', 'gonet_fixed': 'd', 'gonet_std': 'd',
+                      'unity_fixed': 'd', 'unity_std': 'd', 'unity_realtime': 'd', 'debug_stopwatch': 'd'}
+    string_fields = ('timestamp', 'peer')
+
+    def __init__(self):
+        for field in self.string_fields:
+            setattr(self, field, StringColumn())
+        for field, typecode in self.numeric_fields.items():
+            setattr(self, field, array(typecode))
+
+    def __len__(self) -> int:
+        return len(self.line_number)
+
+    def append(self, entry: TimeEntry):
+        self.line_number.append(entry.line_number)
+        self.timestamp.append(entry.timestamp)
+        self.update_type.append(UPDATE_TYPE_CODES[entry.update_type])
+        self.gonet_fixed.append(entry.gonet_fixed)
+        self.gonet_std.append(entry.gonet_std)
+        self.unity_fixed.append(entry.unity_fixed)
+        self.unity_std.append(entry.unity_std)
+        self.unity_realtime.append(entry.unity_realtime)
+        self.debug_stopwatch.append(entry.debug_stopwatch)
+        self.peer.append(entry.peer or '')
+
+    def entry(self, row: int) -> TimeEntry:
+        return TimeEntry(self.line_number[row], self.timestamp[row], UPDATE_TYPES_BY_CODE[self.update_type[row]],
+                         self.gonet_fixed[row], self.gonet_std[row], self.unity_fixed[row], self.unity_std[row],
+                         self.unity_realtime[row], self.debug_stopwatch[row], peer=self.peer[row] or None)
+
+    def extend(self, other: 'PhysicsTimeSeries', line_offset: int = 0):
+        """Append other's rows, shifting their line numbers by line_offset."""
+        for field in self.string_fields:
+            getattr(self, field).extend(getattr(other, field))
+        for field in self.numeric_fields:
+            if field != 'line_number':
+                getattr(self, field).extend(getattr(other, field))
+        lines = other.line_number
+        if line_offset:
+            lines = _vector(lines) + line_offset if np is not None else (line + line_offset for line in lines)
+        _extend_column(self.line_number, lines)
+
+    @staticmethod
+    def cache_name(field: str) -> str:
+        return 'entry_line' if field == 'line_number' else f'entry_{field}'
+
+    def to_columns(self) -> Dict[str, object]:
+        columns = {}
+        for field in self.string_fields:
+            column = getattr(self, field)
+            columns[f'{self.cache_name(field)}s'] = column.table
+            columns[self.cache_name(field)] = column.codes
+        for field in self.numeric_fields:
+            columns[self.cache_name(field)] = getattr(self, field)
+        return columns
+
+    def extend_from_columns(self, columns: Dict[str, object], peer: Optional[str] = None):
+        """Append cached columns; with peer, only the rows that peer logged."""
+        rows = None
+        if peer is not None:
+            peers = columns['entry_peers']
+            code = peers.index(peer) if peer in peers else -1
+            codes = columns['entry_peer']
+            rows = _vector(codes) == code if np is not None else [row for row, item in enumerate(codes) if item == code]
+
+        def take(column: array):
+            if rows is None:
+                return column
+            if np is not None:
+                return _vector(column)[rows]
+            return (column[row] for row in rows)
+
+        for field in self.string_fields:
+            name = self.cache_name(field)
+            getattr(self, field).extend_codes(columns[f'{name}s'], array('I', take(columns[name])))
+        for field in self.numeric_fields:
+            _extend_column(getattr(self, field), take(columns[self.cache_name(field)]))
+
+
+class Violations:
+    """(line, first value, second value) rows of one check as columns; a slice reads back as tuples."""
+    __slots__ = ('lines', 'first', 'second')
+
+    def __init__(self):
+        self.lines = array('q')
+        self.first = array('d')
+        self.second = array('d')
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def __getitem__(self, rows: slice) -> List[Tuple[int, float, float]]:
+        return list(zip(self.lines[rows], self.first[rows], self.second[rows]))
+
+    def append(self, line: int, first: float, second: float):
+        self.lines.append(line)
+        self.first.append(first)
+        self.second.append(second)
+
+    def extend(self, lines, first, second):
+        _extend_column(self.lines, lines)
+        _extend_column(self.first, first)
+        _extend_column(self.second, second)
 
 
 @dataclass
@@ -49,29 +266,41 @@ class AnalysisResult:
     fixed_update_entries: int
 
     # Monotonicity checks
-    gonet_fixed_violations: List[Tuple[int, float, float]]  # (line, prev, curr)
-    gonet_std_violations: List[Tuple[int, float, float]]
+    gonet_fixed_violations: Violations  # (line, prev, curr)
+    gonet_std_violations: Violations
 
     # Ping-pong detection (fixed < std when it shouldn't be)
-    ping_pong_violations: List[Tuple[int, float, float]]  # (line, fixed, std)
+    ping_pong_violations: Violations  # (line, fixed, std)
 
     # Gap analysis
     max_gonet_fixed_gap: float
     max_gonet_std_gap: float
     avg_gonet_fixed_delta: float
     avg_gonet_std_delta: float
+    gonet_fixed_delta_stats: StreamingStats
+    gonet_std_delta_stats: StreamingStats
 
     # Catchup statistics
     total_catchups: int
     total_catchup_iterations: int
     max_catchup_iterations: int
-    catchup_lines: List[int]
+    catchup_iteration_stats: StreamingStats
+    catchups: List[CatchupEvent]
 
     # Overall health
     is_monotonic: bool
     has_ping_pong: bool
     overall_health: str  # "GOOD", "WARNING", "FAILED"
 
+    # gonet.fixed/gonet.std steps back larger than the reset threshold (new baselines)
+    session_resets: int = 0
+
+    # Peer label ("Server", "Client:N") -> that peer's own analysis (only on the all-peers result)
+    peers: Dict[str, 'AnalysisResult'] = field(default_factory=dict)
+
+    # Catch-up timeline, bursts, clock drift and stalls (only on the all-peers result)
+    pacing: Optional['PacingAnalysis'] = None
+
 
 def detect_session_reset(line: str) -> bool:
     """
@@ -85,82 +314,75 @@ def detect_session_reset(line: str) -> bool:
     return "Initialized - Anchored to network time" in line
 
 
-def is_server_log_line(line: str) -> bool:
-    """Check if log line is from server"""
-    return '[Server]' in line or '[DEBUG][Server]' in line or '[INFO][Server]' in line
+def is_server_log_line(record: LogRecord) -> bool:
+    """Check if log record is from server"""
+    return record.role == 'Server'
 
-def is_client_log_line(line: str) -> bool:
-    """Check if log line is from client"""
-    return '[Client' in line or '[DEBUG][Client' in line or '[INFO][Client' in line
+def is_client_log_line(record: LogRecord) -> bool:
+    """Check if log record is from client"""
+    return record.role == 'Client'
 
-def parse_physics_time_line(line: str, line_number: int) -> Optional[TimeEntry]:
+class PhysicsTimeFields(NamedTuple):
+    """Clock readings of one [PhysicsTime] line (0.0 for a clock the line does not log)."""
+    gonet_fixed: float = 0.0
+    gonet_std: float = 0.0
+    unity_fixed: float = 0.0
+    unity_std: float = 0.0
+    unity_realtime: float = 0.0
+    debug_stopwatch: float = 0.0
+
+
+PHYSICS_TIME_FIELDS = FieldTokenizer(PhysicsTimeFields, {
+    'gonet.fixed': 'gonet_fixed',
+    'gonet.std': 'gonet_std',
+    'unity.fixed': 'unity_fixed',
+    'unity.std': 'unity_std',
+    'unity.realtimeSinceStartup': 'unity_realtime',
+    'debugStopwatch': 'debug_stopwatch',
+})
+
+# First word of the message after the tag ("Update," or "Update[hashcode],")
+UPDATE_TYPES = {'Update': UpdateType.UPDATE, 'FixedUpdate': UpdateType.FIXED_UPDATE}
+
+
+def parse_physics_time_line(record: LogRecord, line_number: int) -> Optional[TimeEntry]:
     """
-    Parse a [PhysicsTime] log line.
+    Parse a [PhysicsTime] log record.
 
     Expected formats:
     [PhysicsTime] Update, gonet.std:0.1920540  unity.std:0.0010014  unity.realtimeSinceStartup:0.0010014
     [PhysicsTime] FixedUpdate, gonet.fixed:0.4846504  gonet.std:0.4846504  unity.fixed:0.0200000  unity.std:0.0200000  unity.realtimeSinceStartup:0.4846504
     """
     # Check if this is a PhysicsTime log line
-    if '[PhysicsTime]' not in line:
+    if record.tag != 'PhysicsTime':
         return None
 
-    # Extract update type (handles both "Update," and "Update[hashcode],")
-    if 'FixedUpdate' in line and ('FixedUpdate,' in line or 'FixedUpdate[' in line):
-        update_type = UpdateType.FIXED_UPDATE
-    elif 'Update' in line and ('Update,' in line or 'Update[' in line) and 'FixedUpdate' not in line:
-        update_type = UpdateType.UPDATE
-    else:
+    line = record.message
+    head, separator, _ = line[len(record.tag) + 2:].partition(',')
+    update_type = UPDATE_TYPES.get(head.strip().partition('[')[0])
+    if update_type is None or not separator:
         return None
 
-    # Extract timestamp (if present)
-    timestamp_match = re.search(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})', line)
-    timestamp = timestamp_match.group(1) if timestamp_match else ""
-
-    # Extract time values
-    def extract_float(pattern: str) -> float:
-        match = re.search(pattern + r':([-\d.]+)', line)
-        if match:
-            value_str = match.group(1).rstrip('.')  # Remove trailing period if present
-            try:
-                return float(value_str)
-            except ValueError:
-                return 0.0
-        return 0.0
-
-    gonet_fixed = extract_float(r'gonet\.fixed')
-    gonet_std = extract_float(r'gonet\.std')
-    unity_fixed = extract_float(r'unity\.fixed')
-    unity_std = extract_float(r'unity\.std')
-    unity_realtime = extract_float(r'unity\.realtimeSinceStartup')
-    debug_stopwatch = extract_float(r'debugStopwatch')
-
-    return TimeEntry(
-        line_number=line_number,
-        timestamp=timestamp,
-        update_type=update_type,
-        gonet_fixed=gonet_fixed,
-        gonet_std=gonet_std,
-        unity_fixed=unity_fixed,
-        unity_std=unity_std,
-        unity_realtime=unity_realtime,
-        debug_stopwatch=debug_stopwatch
-    )
+    fields = PHYSICS_TIME_FIELDS.parse(line)
+    return TimeEntry(line_number, record.timestamp, update_type, *fields, peer=record.peer)
 
 
-def parse_catchup_line(line: str, line_number: int) -> Optional[Tuple[int, float, float, float]]:
+CATCHUP_PATTERN = re.compile(r'Caught up (\d+) physics steps \(from ([\d.]+)s to ([\d.]+)s, target: ([\d.]+)s\)')
+
+
+def parse_catchup_line(record: LogRecord, line_number: int) -> Optional[Tuple[int, float, float, float]]:
     """
-    Parse a catchup log line.
+    Parse a catchup log record.
 
     Expected format:
     [PhysicsTime] Caught up 17 physics steps (from 0.200000s to 0.500300s, target: 0.500000s)
 
     Returns: (iterations, from_time, to_time, target_time)
     """
-    if 'Caught up' not in line:
+    if record.tag != 'PhysicsTime' or 'Caught up' not in record.message:
         return None
 
-    match = re.search(r'Caught up (\d+) physics steps \(from ([\d.]+)s to ([\d.]+)s, target: ([\d.]+)s\)', line)
+    match = CATCHUP_PATTERN.search(record.message)
     if match:
         return (
             int(match.group(1)),    # iterations
@@ -171,67 +393,171 @@ def parse_catchup_line(line: str, line_number: int) -> Optional[Tuple[int, float
     return None
 
 
-def analyze_time_entries(entries: List[TimeEntry]) -> AnalysisResult:
-    """Analyze parsed time entries for issues"""
-
-    gonet_fixed_violations = []
-    gonet_std_violations = []
-    ping_pong_violations = []
-
-    gonet_fixed_deltas = []
-    gonet_std_deltas = []
-
-    prev_gonet_fixed = None
-    prev_gonet_std = None
+class PeerClockState:
+    """
+    Monotonicity / ping-pong state machine of ONE peer's clocks.
 
-    for entry in entries:
-        # Detect large backward jumps as session resets (> 1 second backward)
-        if prev_gonet_fixed is not None and entry.gonet_fixed > 0:
-            if entry.gonet_fixed < prev_gonet_fixed - 1.0:  # 1 second threshold
+    Every peer ("Server", "Client:N") gets its own instance, so a shared log's
+    interleaved server and client lines are only ever compared with lines of
+    the same peer. step() is the pure-Python path; with NumPy the same fields
+    are filled per peer by _check_peer_vectorized().
+    """
+    __slots__ = ('prev_gonet_fixed', 'prev_gonet_std', 'update_entries', 'fixed_update_entries', 'session_resets',
+                 'gonet_fixed_violations', 'gonet_std_violations', 'ping_pong_violations',
+                 'gonet_fixed_deltas', 'gonet_std_deltas')
+
+    def __init__(self):
+        self.prev_gonet_fixed: Optional[float] = None
+        self.prev_gonet_std: Optional[float] = None
+        self.update_entries = 0
+        self.fixed_update_entries = 0
+        self.session_resets = 0
+        self.gonet_fixed_violations = Violations()
+        self.gonet_std_violations = Violations()
+        self.ping_pong_violations = Violations()
+        self.gonet_fixed_deltas = StreamingStats()
+        self.gonet_std_deltas = StreamingStats()
+
+    def step(self, line_number: int, update_type: int, gonet_fixed: float, gonet_std: float,
+             reset_seconds: float, ping_pong_seconds: float):
+        if update_type == UPDATE_TYPE_CODES[UpdateType.UPDATE]:
+            self.update_entries += 1
+        else:
+            self.fixed_update_entries += 1
+
+        # Detect large backward jumps as session resets
+        if self.prev_gonet_fixed is not None and gonet_fixed > 0:
+            if gonet_fixed < self.prev_gonet_fixed - reset_seconds:
                 # This is a session reset, not a violation - reset baseline
-                prev_gonet_fixed = None
-                prev_gonet_std = None
+                self.prev_gonet_fixed = None
+                self.prev_gonet_std = None
+                self.session_resets += 1
 
-        if prev_gonet_std is not None and entry.gonet_std > 0:
-            if entry.gonet_std < prev_gonet_std - 1.0:  # 1 second threshold
+        if self.prev_gonet_std is not None and gonet_std > 0:
+            if gonet_std < self.prev_gonet_std - reset_seconds:
                 # This is a session reset, not a violation - reset baseline
-                prev_gonet_std = None
+                self.prev_gonet_std = None
+                self.session_resets += 1
 
         # Check monotonicity for gonet.fixed
-        if entry.gonet_fixed > 0:
-            if prev_gonet_fixed is not None and entry.gonet_fixed < prev_gonet_fixed:
-                gonet_fixed_violations.append((entry.line_number, prev_gonet_fixed, entry.gonet_fixed))
-            elif prev_gonet_fixed is not None:
-                gonet_fixed_deltas.append(entry.gonet_fixed - prev_gonet_fixed)
-            prev_gonet_fixed = entry.gonet_fixed
+        if gonet_fixed > 0:
+            if self.prev_gonet_fixed is not None and gonet_fixed < self.prev_gonet_fixed:
+                self.gonet_fixed_violations.append(line_number, self.prev_gonet_fixed, gonet_fixed)
+            elif self.prev_gonet_fixed is not None:
+                self.gonet_fixed_deltas.add(gonet_fixed - self.prev_gonet_fixed)
+            self.prev_gonet_fixed = gonet_fixed
 
         # Check monotonicity for gonet.std
-        if entry.gonet_std > 0:
-            if prev_gonet_std is not None and entry.gonet_std < prev_gonet_std:
-                gonet_std_violations.append((entry.line_number, prev_gonet_std, entry.gonet_std))
-            elif prev_gonet_std is not None:
-                gonet_std_deltas.append(entry.gonet_std - prev_gonet_std)
-            prev_gonet_std = entry.gonet_std
+        if gonet_std > 0:
+            if self.prev_gonet_std is not None and gonet_std < self.prev_gonet_std:
+                self.gonet_std_violations.append(line_number, self.prev_gonet_std, gonet_std)
+            elif self.prev_gonet_std is not None:
+                self.gonet_std_deltas.add(gonet_std - self.prev_gonet_std)
+            self.prev_gonet_std = gonet_std
 
         # Check for ping-pong (fixed < std with significant gap)
-        if entry.gonet_fixed > 0 and entry.gonet_std > 0:
-            gap = entry.gonet_std - entry.gonet_fixed
-            if gap > 0.005:  # 5ms threshold (allow small caching differences)
-                ping_pong_violations.append((entry.line_number, entry.gonet_fixed, entry.gonet_std))
-
-    # Calculate statistics
-    max_fixed_gap = max(gonet_fixed_deltas) if gonet_fixed_deltas else 0
-    max_std_gap = max(gonet_std_deltas) if gonet_std_deltas else 0
-    avg_fixed_delta = sum(gonet_fixed_deltas) / len(gonet_fixed_deltas) if gonet_fixed_deltas else 0
-    avg_std_delta = sum(gonet_std_deltas) / len(gonet_std_deltas) if gonet_std_deltas else 0
-
-    # Count entries by type
-    update_count = sum(1 for e in entries if e.update_type == UpdateType.UPDATE)
-    fixed_update_count = sum(1 for e in entries if e.update_type == UpdateType.FIXED_UPDATE)
+        if gonet_fixed > 0 and gonet_std > 0 and gonet_std - gonet_fixed > ping_pong_seconds:
+            self.ping_pong_violations.append(line_number, gonet_fixed, gonet_std)
+
+    def merge(self, other: 'PeerClockState'):
+        """Add other's counts, violations and deltas (for all-peer totals)."""
+        self.update_entries += other.update_entries
+        self.fixed_update_entries += other.fixed_update_entries
+        self.session_resets += other.session_resets
+        for name in ('gonet_fixed_violations', 'gonet_std_violations', 'ping_pong_violations'):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            mine.extend(theirs.lines, theirs.first, theirs.second)
+        self.gonet_fixed_deltas.merge(other.gonet_fixed_deltas)
+        self.gonet_std_deltas.merge(other.gonet_std_deltas)
+
+
+def _check_peers_python(series: PhysicsTimeSeries, reset_seconds: float,
+                        ping_pong_seconds: float) -> Dict[int, PeerClockState]:
+    """One pass over the rows, each row stepping its own peer's state machine (installs without NumPy)."""
+    states: Dict[int, PeerClockState] = {}
+    for peer_code, line_number, update_type, gonet_fixed, gonet_std in zip(
+            series.peer.codes, series.line_number, series.update_type, series.gonet_fixed, series.gonet_std):
+        state = states.get(peer_code)
+        if state is None:
+            state = states[peer_code] = PeerClockState()
+        state.step(line_number, update_type, gonet_fixed, gonet_std, reset_seconds, ping_pong_seconds)
+    return states
+
+
+def _peer_groups(series: PhysicsTimeSeries) -> Dict[int, object]:
+    """Rows of each peer code in line order: NumPy index arrays (one stable argsort), row lists without NumPy."""
+    if np is not None:
+        codes = _vector(series.peer.codes)
+        order = np.argsort(codes, kind='stable')
+        groups = np.split(order, np.flatnonzero(np.diff(codes[order])) + 1) if len(order) else []
+        return {int(codes[rows[0]]): rows for rows in groups}
+    groups: Dict[int, List[int]] = {}
+    for row, code in enumerate(series.peer.codes):
+        groups.setdefault(code, []).append(row)
+    return groups
+
+
+def _clock_steps(values):
+    """Rows holding a positive value (0 = not logged on that line), and each step's previous/current value."""
+    rows = np.flatnonzero(values > 0)
+    logged = values[rows]
+    return rows, logged[:-1], logged[1:]
+
+
+def _classify_steps(violations: Violations, deltas: StreamingStats, lines, rows, prev, curr, kept):
+    """Kept steps that went backward become violations, the other kept steps deltas."""
+    backward = kept & (curr < prev)
+    violations.extend(lines[rows[1:][backward]], prev[backward], curr[backward])
+    deltas.update((curr - prev)[kept & ~backward])
+
+
+def _check_peer_vectorized(lines, update_types, fixed, std, reset_seconds: float,
+                           ping_pong_seconds: float) -> PeerClockState:
+    """Diff/mask version of PeerClockState.step() over all rows of one peer."""
+    state = PeerClockState()
+    state.update_entries = int(np.count_nonzero(update_types == UPDATE_TYPE_CODES[UpdateType.UPDATE]))
+    state.fixed_update_entries = len(update_types) - state.update_entries
+
+    fixed_rows, fixed_prev, fixed_curr = _clock_steps(fixed)
+    fixed_reset = fixed_curr < fixed_prev - reset_seconds
+    _classify_steps(state.gonet_fixed_violations, state.gonet_fixed_deltas, lines, fixed_rows, fixed_prev, fixed_curr,
+                    ~fixed_reset)
+
+    # A gonet.fixed reset restarts gonet.std too: a std step spanning one (up to and
+    # including the step's own row) has no baseline
+    std_rows, std_prev, std_curr = _clock_steps(std)
+    fixed_resets_seen = np.searchsorted(fixed_rows[1:][fixed_reset], std_rows, side='right')
+    std_baseline = fixed_resets_seen[1:] == fixed_resets_seen[:-1]
+    std_reset = std_baseline & (std_curr < std_prev - reset_seconds)
+    _classify_steps(state.gonet_std_violations, state.gonet_std_deltas, lines, std_rows, std_prev, std_curr,
+                    std_baseline & ~std_reset)
+    state.session_resets = int(np.count_nonzero(fixed_reset)) + int(np.count_nonzero(std_reset))
+
+    ping_pong_rows = np.flatnonzero((fixed > 0) & (std > 0) & (std - fixed > ping_pong_seconds))
+    state.ping_pong_violations.extend(lines[ping_pong_rows], fixed[ping_pong_rows], std[ping_pong_rows])
+    return state
+
+
+def _check_peers_vectorized(series: PhysicsTimeSeries, reset_seconds: float,
+                            ping_pong_seconds: float) -> Dict[int, PeerClockState]:
+    """Check the columns of each peer's rows on their own."""
+    lines = _vector(series.line_number)
+    update_types = _vector(series.update_type)
+    fixed = _vector(series.gonet_fixed)
+    std = _vector(series.gonet_std)
+    return {code: _check_peer_vectorized(lines[rows], update_types[rows], fixed[rows], std[rows],
+                                         reset_seconds, ping_pong_seconds)
+            for code, rows in _peer_groups(series).items()}
+
+
+def _peer_result(state: PeerClockState, catchups: List[CatchupEvent]) -> AnalysisResult:
+    """AnalysisResult of one peer's (or all peers' merged) state machine and catchup events."""
+    gonet_fixed_deltas = state.gonet_fixed_deltas
+    gonet_std_deltas = state.gonet_std_deltas
 
     # Determine overall health
-    is_monotonic = len(gonet_fixed_violations) == 0 and len(gonet_std_violations) == 0
-    has_ping_pong = len(ping_pong_violations) > 0
+    is_monotonic = len(state.gonet_fixed_violations) == 0 and len(state.gonet_std_violations) == 0
+    has_ping_pong = len(state.ping_pong_violations) > 0
 
     if is_monotonic and not has_ping_pong:
         health = "GOOD"
@@ -240,69 +566,428 @@ def analyze_time_entries(entries: List[TimeEntry]) -> AnalysisResult:
     else:
         health = "FAILED"
 
+    catchup_iteration_stats = StreamingStats(catchup.iterations for catchup in catchups)
     return AnalysisResult(
-        total_entries=len(entries),
-        update_entries=update_count,
-        fixed_update_entries=fixed_update_count,
-        gonet_fixed_violations=gonet_fixed_violations,
-        gonet_std_violations=gonet_std_violations,
-        ping_pong_violations=ping_pong_violations,
-        max_gonet_fixed_gap=max_fixed_gap,
-        max_gonet_std_gap=max_std_gap,
-        avg_gonet_fixed_delta=avg_fixed_delta,
-        avg_gonet_std_delta=avg_std_delta,
-        total_catchups=0,  # Will be filled by parse_log
-        total_catchup_iterations=0,
-        max_catchup_iterations=0,
-        catchup_lines=[],
+        total_entries=state.update_entries + state.fixed_update_entries,
+        update_entries=state.update_entries,
+        fixed_update_entries=state.fixed_update_entries,
+        gonet_fixed_violations=state.gonet_fixed_violations,
+        gonet_std_violations=state.gonet_std_violations,
+        ping_pong_violations=state.ping_pong_violations,
+        max_gonet_fixed_gap=gonet_fixed_deltas.max if gonet_fixed_deltas.count else 0,
+        max_gonet_std_gap=gonet_std_deltas.max if gonet_std_deltas.count else 0,
+        avg_gonet_fixed_delta=gonet_fixed_deltas.mean,
+        avg_gonet_std_delta=gonet_std_deltas.mean,
+        gonet_fixed_delta_stats=gonet_fixed_deltas,
+        gonet_std_delta_stats=gonet_std_deltas,
+        total_catchups=len(catchups),
+        total_catchup_iterations=sum(catchup.iterations for catchup in catchups),
+        max_catchup_iterations=max((catchup.iterations for catchup in catchups), default=0),
+        catchup_iteration_stats=catchup_iteration_stats,
+        catchups=catchups,
         is_monotonic=is_monotonic,
         has_ping_pong=has_ping_pong,
-        overall_health=health
+        overall_health=health,
+        session_resets=state.session_resets,
     )
 
 
-def parse_log_file(file_path: str, server_only: bool = False) -> Tuple[List[TimeEntry], AnalysisResult]:
+def analyze_time_entries(series: PhysicsTimeSeries, catchups: Iterable[CatchupEvent] = (),
+                         reset_seconds: float = SESSION_RESET_SECONDS,
+                         ping_pong_seconds: float = PING_PONG_GAP_SECONDS) -> AnalysisResult:
+    """
+    Analyze parsed time entries for issues, each peer on its own
+
+    Each positive gonet.fixed/gonet.std is compared with the previous positive
+    value of the same clock OF THE SAME PEER: stepping back by more than
+    reset_seconds is a session reset (new baseline; a gonet.fixed reset also
+    restarts gonet.std), any smaller step back is a violation, anything else a
+    delta. gonet.std ahead of gonet.fixed by more than ping_pong_seconds is
+    ping-pong. Returns the all-peer totals with per-peer results in .peers.
+    """
+    check_peers = _check_peers_vectorized if np is not None else _check_peers_python
+    states = {series.peer.table[code] or UNKNOWN_PEER: state
+              for code, state in check_peers(series, reset_seconds, ping_pong_seconds).items()}
+
+    catchups = list(catchups)
+    catchups_by_peer: Dict[str, List[CatchupEvent]] = {}
+    for catchup in catchups:
+        catchups_by_peer.setdefault(catchup.peer or UNKNOWN_PEER, []).append(catchup)
+
+    total = PeerClockState()
+    peers = {}
+    for peer in sorted(states.keys() | catchups_by_peer.keys(), key=peer_sort_key):
+        state = states.get(peer) or PeerClockState()
+        total.merge(state)
+        peers[peer] = _peer_result(state, catchups_by_peer.get(peer, []))
+
+    result = _peer_result(total, catchups)
+    result.peers = peers
+    return result
+
+
+# --- Frame pacing: catch-up timeline, bursts, clock drift and stalls ---
+
+class PacingOptions(NamedTuple):
+    """Knobs of analyze_pacing() (--burst-frames, --burst-min, --stalls, --pacing-window)"""
+    burst_frames: int = BURST_FRAMES
+    burst_min: int = BURST_MIN_CATCHUPS
+    stalls: int = STALLS_SHOWN
+    window_seconds: Optional[float] = None  # None: PACING_WINDOWS windows over the catch-ups' time span
+
+
+class CatchupWindow(NamedTuple):
+    """Catch-ups logged in one wall-clock window"""
+    start: float  # timestamp_seconds() of the window start
+    catchups: int
+    steps: int
+    max_steps: int
+
+
+class CatchupBurst(NamedTuple):
+    """Catch-ups of one peer, each at most burst_frames frames after the previous one"""
+    peer: str
+    first: CatchupEvent
+    last: CatchupEvent
+    catchups: int
+    steps: int
+    max_steps: int
+
+
+class ClockDrift(NamedTuple):
+    """unity.realtimeSinceStartup - gonet.fixed on one peer's FixedUpdate lines, relative to each session's first line"""
+    samples: int
+    sessions: int
+    change: float    # Drift at the end of each session, summed (seconds)
+    min: float
+    max: float
+    realtime: float  # unity.realtimeSinceStartup covered by the sessions (seconds)
+
+    @property
+    def rate(self) -> float:
+        """Seconds of drift per second of real time"""
+        return self.change / self.realtime if self.realtime > 0 else 0.0
+
+
+class StallWindow(NamedTuple):
+    """unity.realtimeSinceStartup gap between two consecutive entries of one peer"""
+    peer: str
+    gap: float
+    start: TimeEntry
+    end: TimeEntry
+    catchup_steps: int  # Steps of the peer's catch-ups logged in (start, end]
+
+
+@dataclass
+class PacingAnalysis:
+    """Frame pacing of all peers (see analyze_pacing)"""
+    options: PacingOptions
+    window_seconds: float
+    windows: List[CatchupWindow]      # Windows holding at least one catch-up, in time order
+    burst_counts: Dict[str, int]      # Peer -> bursts of at least options.burst_min catch-ups
+    bursts: List[CatchupBurst]        # Most steps first, at most options.stalls
+    drift: Dict[str, ClockDrift]
+    stalls: List[StallWindow]         # Largest gap first, at most options.stalls
+
+
+def _catchup_windows(catchups: List[CatchupEvent],
+                     window_seconds: Optional[float]) -> Tuple[float, List[CatchupWindow]]:
+    """Catch-ups per wall-clock window; the width defaults to PACING_WINDOWS windows over their span."""
+    timed = [(seconds, catchup.iterations) for catchup in catchups
+             for seconds in (timestamp_seconds(catchup.timestamp),) if seconds is not None]
+    if not timed:
+        return window_seconds or 0.0, []
+    start = min(seconds for seconds, _ in timed)
+    if not window_seconds:
+        span = max(seconds for seconds, _ in timed) - start
+        window_seconds = max(1.0, math.ceil(span / PACING_WINDOWS))
+
+    windows: Dict[int, List[int]] = {}
+    for seconds, iterations in timed:
+        windows.setdefault(int((seconds - start) // window_seconds), []).append(iterations)
+    return window_seconds, [CatchupWindow(start + index * window_seconds, len(steps), sum(steps), max(steps))
+                            for index, steps in sorted(windows.items())]
+
+
+def _catchup_bursts(catchups_by_peer: Dict[str, List[CatchupEvent]], burst_frames: int,
+                    burst_min: int) -> Tuple[Dict[str, int], List[CatchupBurst]]:
+    """Runs of a peer's catch-ups at most burst_frames frames apart (a frame going back starts a new run)."""
+    counts: Dict[str, int] = {}
+    bursts: List[CatchupBurst] = []
+    for peer, catchups in catchups_by_peer.items():
+        run: List[CatchupEvent] = []
+        for catchup in catchups + [None]:
+            if catchup is not None and run and run[-1].frame >= 0 and \
+                    0 <= catchup.frame - run[-1].frame <= burst_frames:
+                run.append(catchup)
+                continue
+            if len(run) >= burst_min:
+                counts[peer] = counts.get(peer, 0) + 1
+                bursts.append(CatchupBurst(peer, run[0], run[-1], len(run), sum(c.iterations for c in run),
+                                           max(c.iterations for c in run)))
+            run = [catchup]
+    return counts, bursts
+
+
+def _clock_drift(realtime, fixed, reset_seconds: float) -> Optional[ClockDrift]:
+    """
+    Drift of one peer's FixedUpdate lines (both clocks logged), None below two lines.
+
+    A gonet.fixed step back larger than reset_seconds starts a new session,
+    whose drift is measured from its own first line.
+    """
+    if len(fixed) < 2:
+        return None
+    if np is not None:
+        drift = realtime - fixed
+        starts = np.flatnonzero(np.concatenate(([True], fixed[1:] < fixed[:-1] - reset_seconds)))
+        ends = np.append(starts[1:] - 1, len(fixed) - 1)
+        relative = drift - np.repeat(drift[starts], ends - starts + 1)
+        return ClockDrift(len(fixed), len(starts), float(relative[ends].sum()), float(relative.min()),
+                          float(relative.max()), float((realtime[ends] - realtime[starts]).sum()))
+
+    sessions = 0
+    change = covered = low = high = 0.0
+    base = base_realtime = prev_fixed = prev_realtime = prev_relative = None
+    for line_realtime, line_fixed in zip(realtime, fixed):
+        if base is None or line_fixed < prev_fixed - reset_seconds:
+            if base is not None:
+                change += prev_relative
+                covered += prev_realtime - base_realtime
+            base, base_realtime = line_realtime - line_fixed, line_realtime
+            sessions += 1
+        relative = line_realtime - line_fixed - base
+        low, high = min(low, relative), max(high, relative)
+        prev_fixed, prev_realtime, prev_relative = line_fixed, line_realtime, relative
+    change += prev_relative
+    covered += prev_realtime - base_realtime
+    return ClockDrift(len(fixed), sessions, change, low, high, covered)
+
+
+def _largest_gaps(rows, realtime, count: int) -> List[Tuple[float, int, int]]:
+    """(gap, row, next row) of the count largest unity.realtimeSinceStartup steps between consecutive rows."""
+    if np is not None:
+        rows = rows[realtime[rows] > 0]
+        gaps = np.diff(realtime[rows])
+        count = min(count, len(gaps))
+        if not count:
+            return []
+        # Gaps above the count-th largest, then the latest of the gaps tied with it (as heapq.nlargest picks)
+        threshold = gaps[np.argpartition(gaps, -count)[-count]]
+        above = np.flatnonzero(gaps > threshold)
+        top = np.concatenate((above, np.flatnonzero(gaps == threshold)[len(above) - count:]))
+        return [(float(gaps[index]), int(rows[index]), int(rows[index + 1])) for index in top if gaps[index] > 0]
+
+    rows = [row for row in rows if realtime[row] > 0]
+    steps = ((realtime[later] - realtime[row], row, later) for row, later in zip(rows, rows[1:]))
+    return [step for step in heapq.nlargest(count, steps) if step[0] > 0]
+
+
+def analyze_pacing(series: PhysicsTimeSeries, catchups: List[CatchupEvent],
+                   reset_seconds: float = SESSION_RESET_SECONDS,
+                   options: PacingOptions = PacingOptions()) -> PacingAnalysis:
+    """
+    Frame pacing from the PhysicsTime entries and catch-up lines
+
+    - catch-ups per wall-clock window (when the spikes happened)
+    - bursts: options.burst_min+ catch-ups of a peer, each at most
+      options.burst_frames frames after the previous one
+    - drift of unity.realtimeSinceStartup against gonet.fixed per peer
+      (growing = fixed time falling behind real time)
+    - the options.stalls largest unity.realtimeSinceStartup gaps between
+      consecutive entries of a peer, with the catch-up steps that followed
+    """
+    window_seconds, windows = _catchup_windows(catchups, options.window_seconds)
+
+    catchups_by_peer: Dict[str, List[CatchupEvent]] = {}
+    for catchup in catchups:
+        catchups_by_peer.setdefault(catchup.peer or UNKNOWN_PEER, []).append(catchup)
+    burst_counts, bursts = _catchup_bursts(catchups_by_peer, options.burst_frames, options.burst_min)
+    bursts = heapq.nlargest(options.stalls, bursts, key=lambda burst: (burst.steps, burst.catchups))
+
+    realtime = _vector(series.unity_realtime)
+    fixed = _vector(series.gonet_fixed)
+    update_types = _vector(series.update_type)
+    fixed_update = UPDATE_TYPE_CODES[UpdateType.FIXED_UPDATE]
+    drift: Dict[str, ClockDrift] = {}
+    gaps: List[Tuple[float, int, int]] = []
+    for code, rows in _peer_groups(series).items():
+        peer = series.peer.table[code] or UNKNOWN_PEER
+        if np is not None:
+            logged = rows[(update_types[rows] == fixed_update) & (realtime[rows] > 0) & (fixed[rows] > 0)]
+            peer_drift = _clock_drift(realtime[logged], fixed[logged], reset_seconds)
+        else:
+            logged = [row for row in rows if update_types[row] == fixed_update and realtime[row] > 0 and fixed[row] > 0]
+            peer_drift = _clock_drift([realtime[row] for row in logged], [fixed[row] for row in logged],
+                                      reset_seconds)
+        if peer_drift is not None:
+            drift[peer] = peer_drift
+        gaps.extend(_largest_gaps(rows, realtime, options.stalls))
+
+    stalls = []
+    for gap, row, later in heapq.nlargest(options.stalls, gaps):
+        start, end = series.entry(row), series.entry(later)
+        peer = start.peer or UNKNOWN_PEER
+        peer_catchups = catchups_by_peer.get(peer, [])
+        lines = [catchup.line_number for catchup in peer_catchups]
+        steps = sum(catchup.iterations for catchup in peer_catchups[bisect.bisect_right(lines, start.line_number):
+                                                                    bisect.bisect_right(lines, end.line_number)])
+        stalls.append(StallWindow(peer, gap, start, end, steps))
+
+    return PacingAnalysis(options, window_seconds, windows, burst_counts, bursts,
+                          {peer: drift[peer] for peer in sorted(drift, key=peer_sort_key)}, stalls)
+
+
+@register_analyzer('physics')
+class PhysicsTimeAnalyzer(LogAnalyzer):
+    """Collects [PhysicsTime] entries and catchup events, one log record at a time."""
+
+    markers = ('[PhysicsTime]',)
+    supports_chunks = True
+    cache_name = 'physics'
+
+    def __init__(self, server_only: bool = False, reset_seconds: float = SESSION_RESET_SECONDS,
+                 ping_pong_seconds: float = PING_PONG_GAP_SECONDS, pacing: Optional['PacingOptions'] = None):
+        self.server_only = server_only
+        self.reset_seconds = reset_seconds
+        self.ping_pong_seconds = ping_pong_seconds
+        self.pacing = pacing or PacingOptions()
+        self.series = PhysicsTimeSeries()
+        self.catchups: List[CatchupEvent] = []
+        self.max_catchup = 0
+        self.result: Optional[AnalysisResult] = None
+
+    @classmethod
+    def from_options(cls, options: dict) -> 'PhysicsTimeAnalyzer':
+        return cls(server_only=options.get('server_only', False),
+                   reset_seconds=options.get('reset_seconds', SESSION_RESET_SECONDS),
+                   ping_pong_seconds=options.get('ping_pong_seconds', PING_PONG_GAP_SECONDS),
+                   pacing=PacingOptions(burst_frames=options.get('burst_frames', BURST_FRAMES),
+                                        burst_min=options.get('burst_min', BURST_MIN_CATCHUPS),
+                                        stalls=options.get('stalls', STALLS_SHOWN),
+                                        window_seconds=options.get('pacing_window')))
+
+    def chunk_spec(self):
+        # Thresholds and pacing options only matter in finalize(), which runs in the parent process
+        return PhysicsTimeAnalyzer, (self.server_only,)
+
+    def get_state(self):
+        return self.series, self.catchups
+
+    def merge_state(self, state, line_offset: int):
+        series, catchups = state
+        self.series.extend(series, line_offset)
+        for catchup in catchups:
+            self._add_catchup(catchup._replace(line_number=catchup.line_number + line_offset))
+
+    def _accepts(self, peer: Optional[str]) -> bool:
+        return not self.server_only or peer == 'Server'
+
+    def _add_catchup(self, catchup: CatchupEvent):
+        if not self._accepts(catchup.peer):
+            return
+        self.catchups.append(catchup)
+        self.max_catchup = max(self.max_catchup, catchup.iterations)
+
+    def consume(self, line_number: int, record: LogRecord):
+        if record.tag != 'PhysicsTime':
+            return
+
+        # Filter by server/client if requested
+        if self.server_only and not is_server_log_line(record):
+            return
+
+        # Parse time entry
+        entry = parse_physics_time_line(record, line_number)
+        if entry:
+            self.series.append(entry)
+            return
+
+        # Parse catchup info
+        catchup_info = parse_catchup_line(record, line_number)
+        if catchup_info:
+            self._add_catchup(CatchupEvent(line_number, *catchup_info, record.peer,
+                                           record.frame if record.frame is not None else -1, record.timestamp))
+
+    def cache_builder(self):
+        return PhysicsTimeAnalyzer()
+
+    def to_columns(self):
+        columns = self.series.to_columns()
+        catchup_peers, catchup_peer_codes = encode_strings(c.peer for c in self.catchups)
+        catchup_timestamps, catchup_timestamp_codes = encode_strings(c.timestamp for c in self.catchups)
+        columns.update({
+            'catchup_line': array('q', (c.line_number for c in self.catchups)),
+            'catchup_iterations': array('q', (c.iterations for c in self.catchups)),
+            'catchup_from': array('d', (c.from_time for c in self.catchups)),
+            'catchup_to': array('d', (c.to_time for c in self.catchups)),
+            'catchup_target': array('d', (c.target_time for c in self.catchups)),
+            'catchup_peers': catchup_peers,
+            'catchup_peer': catchup_peer_codes,
+            'catchup_frame': array('q', (c.frame for c in self.catchups)),
+            'catchup_timestamps': catchup_timestamps,
+            'catchup_timestamp': catchup_timestamp_codes,
+        })
+        return columns
+
+    def load_columns(self, columns):
+        self.series.extend_from_columns(columns, peer='Server' if self.server_only else None)
+        for catchup in zip(
+                columns['catchup_line'],
+                columns['catchup_iterations'],
+                columns['catchup_from'],
+                columns['catchup_to'],
+                columns['catchup_target'],
+                decode_strings(columns['catchup_peers'], columns['catchup_peer'], empty_as_none=True),
+                columns['catchup_frame'],
+                decode_strings(columns['catchup_timestamps'], columns['catchup_timestamp'])):
+            self._add_catchup(CatchupEvent(*catchup))
+
+    def finalize(self):
+        self.result = analyze_time_entries(self.series, self.catchups, self.reset_seconds, self.ping_pong_seconds)
+        self.result.pacing = analyze_pacing(self.series, self.catchups, self.reset_seconds, self.pacing)
+
+    def live_summary(self):
+        series = self.series
+        if not series:
+            return "no [PhysicsTime] entries yet"
+        return (f"entries={len(series):,} peers={len(series.peer.table)} catchups={len(self.catchups):,} "
+                f"(max {self.max_catchup} steps) last gonet.fixed={series.gonet_fixed[-1]:.4f}s "
+                f"gonet.std={series.gonet_std[-1]:.4f}s")
+
+    def report(self):
+        if not self.series:
+            print("\nWARNING: No [PhysicsTime] entries found in log file!")
+            print("Make sure the log contains debug output with [PhysicsTime] tags.")
+            return
+
+        print(f"Found {len(self.series)} time entries\n")
+        print_report(self.result, self.series)
+
+
+def parse_log_file(file_path: str, server_only: bool = False, jobs: int = 1, use_cache: bool = False,
+                   since: Optional[str] = None, until: Optional[str] = None, time_index: bool = False,
+                   reset_seconds: float = SESSION_RESET_SECONDS, ping_pong_seconds: float = PING_PONG_GAP_SECONDS,
+                   pacing: Optional[PacingOptions] = None) -> Tuple[PhysicsTimeSeries, AnalysisResult]:
     """Parse log file and return entries + analysis
 
     Args:
         file_path: Path to log file
         server_only: If True, only parse server logs (ignores client logs)
+        jobs: Number of worker processes parsing newline-aligned chunks of the file
+        use_cache: Load/refresh decoded entries from <file_path>.physics.gonetcache
+        since/until: Only parse lines logged in this time window
+        time_index: Use/refresh the <file_path>.timeindex.gonetcache timestamp index
+        reset_seconds/ping_pong_seconds: Thresholds of analyze_time_entries()
+        pacing: Burst/stall/window options of analyze_pacing()
     """
 
-    entries = []
-    catchup_iterations_total = 0
-    catchup_count = 0
-    max_catchup = 0
-    catchup_lines = []
+    analyzer = PhysicsTimeAnalyzer(server_only=server_only, reset_seconds=reset_seconds,
+                                   ping_pong_seconds=ping_pong_seconds, pacing=pacing)
 
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            for line_number, line in enumerate(f, 1):
-                # Filter by server/client if requested
-                if server_only and not is_server_log_line(line):
-                    continue
-
-                # Parse time entry
-                entry = parse_physics_time_line(line, line_number)
-                if entry:
-                    entries.append(entry)
-
-                # Parse catchup info
-                catchup_info = parse_catchup_line(line, line_number)
-                if catchup_info:
-                    iterations, from_time, to_time, target = catchup_info
-                    catchup_count += 1
-                    catchup_iterations_total += iterations
-                    max_catchup = max(max_catchup, iterations)
-                    catchup_lines.append(line_number)
-
-                    # Attach catchup info to last FixedUpdate entry
-                    if entries and entries[-1].update_type == UpdateType.FIXED_UPDATE:
-                        entries[-1].catchup_iterations = iterations
-                        entries[-1].catchup_from = from_time
-                        entries[-1].catchup_to = to_time
-                        entries[-1].catchup_target = target
-
+        run_analyzers(file_path, [analyzer], progress=False, jobs=jobs, use_cache=use_cache,
+                      since=since, until=until, time_index=time_index)
     except FileNotFoundError:
         print(f"ERROR: Log file not found: {file_path}")
         sys.exit(1)
@@ -310,19 +995,110 @@ def parse_log_file(file_path: str, server_only: bool = False) -> Tuple[List[Time
         print(f"ERROR: Failed to read log file: {e}")
         sys.exit(1)
 
-    # Analyze entries
-    result = analyze_time_entries(entries)
+    return analyzer.series, analyzer.result
+
+
+HEALTH_LABELS = {
+    "GOOD": "[OK]",
+    "WARNING": "[WARN]",
+    "FAILED": "[FAIL]"
+}
+
+
+def print_peer_summary(peers: Dict[str, AnalysisResult]):
+    """One line per peer: entries, resets, violations, ping-pong, catchups and health"""
+    print("=" * 80)
+    print("Per-Peer Summary (each peer checked against its own previous values)")
+    print("=" * 80)
+    print(f"{'Peer':<12} {'Entries':>9} {'Resets':>6} {'Fixed<-':>7} {'Std<-':>6} {'PingPong':>8} "
+          f"{'Catchups':>8} {'MaxSteps':>8} {'AvgFixed':>9}  Health")
+    print("-" * 80)
+    for peer, result in peers.items():
+        print(f"{peer:<12} {result.total_entries:>9} {result.session_resets:>6} "
+              f"{len(result.gonet_fixed_violations):>7} {len(result.gonet_std_violations):>6} "
+              f"{len(result.ping_pong_violations):>8} {result.total_catchups:>8} {result.max_catchup_iterations:>8} "
+              f"{result.avg_gonet_fixed_delta * 1000:>7.2f}ms  "
+              f"{HEALTH_LABELS.get(result.overall_health, '?')} {result.overall_health}")
+    print()
+
+
+def print_delta_stats(result: AnalysisResult):
+    """gonet.fixed / gonet.std step statistics of one peer"""
+    print(f"gonet.fixed:")
+    print(f"  Average delta:  {result.avg_gonet_fixed_delta*1000:.2f}ms")
+    print(f"  Max delta:      {result.max_gonet_fixed_gap*1000:.2f}ms")
+    if result.gonet_fixed_delta_stats.count:
+        print(f"  Percentiles:    {result.gonet_fixed_delta_stats.format_percentiles('.2f', 'ms', 1000)}")
+        print(f"  Std deviation:  {result.gonet_fixed_delta_stats.stddev*1000:.2f}ms")
+    print()
+    print(f"gonet.std:")
+    print(f"  Average delta:  {result.avg_gonet_std_delta*1000:.2f}ms")
+    print(f"  Max delta:      {result.max_gonet_std_gap*1000:.2f}ms")
+    if result.gonet_std_delta_stats.count:
+        print(f"  Percentiles:    {result.gonet_std_delta_stats.format_percentiles('.2f', 'ms', 1000)}")
+        print(f"  Std deviation:  {result.gonet_std_delta_stats.stddev*1000:.2f}ms")
+    print()
+
+
+def _clock_time(seconds: float) -> str:
+    """HH:MM:SS of a timestamp_seconds() value"""
+    return time.strftime('%H:%M:%S', time.gmtime(seconds))
+
+
+def print_pacing_report(pacing: PacingAnalysis):
+    """Catch-up timeline, bursts, realtime/fixed drift and the worst stalls"""
+    options = pacing.options
+    print("=" * 80)
+    print("Frame Pacing")
+    print("=" * 80)
 
-    # Add catchup stats
-    result.total_catchups = catchup_count
-    result.total_catchup_iterations = catchup_iterations_total
-    result.max_catchup_iterations = max_catchup
-    result.catchup_lines = catchup_lines
+    if pacing.windows:
+        print(f"Catch-ups over time ({pacing.window_seconds:g}s windows, windows without catch-ups omitted):")
+        print(f"  {'Window':<9} {'Catchups':>8} {'Steps':>6} {'Max':>4}")
+        busiest = max(window.steps for window in pacing.windows)
+        for window in pacing.windows:
+            bar = '#' * max(1, round(PACING_BAR_WIDTH * window.steps / busiest)) if window.steps else ''
+            print(f"  {_clock_time(window.start):<9} {window.catchups:>8} {window.steps:>6} {window.max_steps:>4}  {bar}")
+    else:
+        print("Catch-ups over time: no timestamped catch-ups")
+    print()
 
-    return entries, result
+    print(f"Catch-up bursts ({options.burst_min}+ catch-ups, each at most {options.burst_frames} frames "
+          f"after the previous one):")
+    if not pacing.bursts:
+        print("  [OK] None")
+    else:
+        print("  " + ", ".join(f"{peer}: {pacing.burst_counts[peer]}"
+                               for peer in sorted(pacing.burst_counts, key=peer_sort_key)))
+        print(f"  Worst bursts (most steps first):")
+        for burst in pacing.bursts:
+            print(f"    [{burst.peer}] frames {burst.first.frame}-{burst.last.frame} "
+                  f"({burst.first.timestamp} -> {burst.last.timestamp}): {burst.catchups} catch-ups, "
+                  f"{burst.steps} steps (max {burst.max_steps}), "
+                  f"gonet.fixed {burst.first.from_time:.3f}s -> {burst.last.to_time:.3f}s")
+    print()
 
+    print("unity.realtimeSinceStartup - gonet.fixed drift (FixedUpdate lines, from each session's first line):")
+    if not pacing.drift:
+        print("  No FixedUpdate lines with both clocks")
+    for peer, drift in pacing.drift.items():
+        print(f"  {peer:<12} {drift.change * 1000:+9.2f}ms over {drift.realtime:.1f}s "
+              f"({drift.rate * 60000:+.2f}ms/min, range {drift.min * 1000:+.2f}..{drift.max * 1000:+.2f}ms, "
+              f"{drift.sessions} session{'s' if drift.sessions != 1 else ''})")
+    print()
 
-def print_report(result: AnalysisResult, entries: List[TimeEntry]):
+    print(f"Worst stall windows (largest unity.realtimeSinceStartup gaps between a peer's entries, top {options.stalls}):")
+    if not pacing.stalls:
+        print("  No unity.realtimeSinceStartup steps")
+    for stall in pacing.stalls:
+        steps = f"caught up {stall.catchup_steps} steps" if stall.catchup_steps else "no catch-up"
+        print(f"  {'[' + stall.peer + ']':<11} {stall.gap * 1000:8.2f}ms  lines {stall.start.line_number}-{stall.end.line_number} "
+              f"({stall.start.timestamp} -> {stall.end.timestamp}), "
+              f"realtime {stall.start.unity_realtime:.4f}s -> {stall.end.unity_realtime:.4f}s, {steps}")
+    print()
+
+
+def print_report(result: AnalysisResult, series: PhysicsTimeSeries):
     """Print analysis report"""
 
     print("=" * 80)
@@ -330,13 +1106,8 @@ def print_report(result: AnalysisResult, entries: List[TimeEntry]):
     print("=" * 80)
     print()
 
-    # Overall health
-    health_color = {
-        "GOOD": "[OK]",
-        "WARNING": "[WARN]",
-        "FAILED": "[FAIL]"
-    }
-    print(f"Overall Health: {health_color.get(result.overall_health, '?')} {result.overall_health}")
+    # Overall health (the worst peer's)
+    print(f"Overall Health: {HEALTH_LABELS.get(result.overall_health, '?')} {result.overall_health}")
     print()
 
     # Entry counts
@@ -346,8 +1117,11 @@ def print_report(result: AnalysisResult, entries: List[TimeEntry]):
     print(f"Total entries:       {result.total_entries}")
     print(f"Update() calls:      {result.update_entries}")
     print(f"FixedUpdate() calls: {result.fixed_update_entries}")
+    print(f"Peers:               {len(result.peers)}")
     print()
 
+    print_peer_summary(result.peers)
+
     # Monotonicity
     print("=" * 80)
     print("Monotonicity Check")
@@ -357,15 +1131,16 @@ def print_report(result: AnalysisResult, entries: List[TimeEntry]):
     else:
         print("[FAIL] FAILED: Time values jumped backward!")
 
-        if result.gonet_fixed_violations:
-            print(f"\ngonet.fixed violations ({len(result.gonet_fixed_violations)}):")
-            for line, prev, curr in result.gonet_fixed_violations[:10]:
-                print(f"  Line {line}: {prev:.7f}s -> {curr:.7f}s (BACKWARD!)")
+        for peer, peer_result in result.peers.items():
+            if peer_result.gonet_fixed_violations:
+                print(f"\n[{peer}] gonet.fixed violations ({len(peer_result.gonet_fixed_violations)}):")
+                for line, prev, curr in peer_result.gonet_fixed_violations[:VIOLATIONS_SHOWN]:
+                    print(f"  Line {line}: {prev:.7f}s -> {curr:.7f}s (BACKWARD!)")
 
-        if result.gonet_std_violations:
-            print(f"\ngonet.std violations ({len(result.gonet_std_violations)}):")
-            for line, prev, curr in result.gonet_std_violations[:10]:
-                print(f"  Line {line}: {prev:.7f}s -> {curr:.7f}s (BACKWARD!)")
+            if peer_result.gonet_std_violations:
+                print(f"\n[{peer}] gonet.std violations ({len(peer_result.gonet_std_violations)}):")
+                for line, prev, curr in peer_result.gonet_std_violations[:VIOLATIONS_SHOWN]:
+                    print(f"  Line {line}: {prev:.7f}s -> {curr:.7f}s (BACKWARD!)")
     print()
 
     # Ping-pong detection
@@ -376,24 +1151,22 @@ def print_report(result: AnalysisResult, entries: List[TimeEntry]):
         print("[OK] No ping-pong detected (fixed time never lags behind standard time)")
     else:
         print(f"[WARN] WARNING: Found {len(result.ping_pong_violations)} instances where fixed < std")
-        print("\nSample violations (first 10):")
-        for line, fixed, std in result.ping_pong_violations[:10]:
-            gap = std - fixed
-            print(f"  Line {line}: fixed={fixed:.7f}s, std={std:.7f}s (gap: {gap*1000:.2f}ms)")
+        for peer, peer_result in result.peers.items():
+            if peer_result.ping_pong_violations:
+                print(f"\n[{peer}] {len(peer_result.ping_pong_violations)} instances, "
+                      f"sample violations (first {VIOLATIONS_SHOWN}):")
+                for line, fixed, std in peer_result.ping_pong_violations[:VIOLATIONS_SHOWN]:
+                    gap = std - fixed
+                    print(f"  Line {line}: fixed={fixed:.7f}s, std={std:.7f}s (gap: {gap*1000:.2f}ms)")
     print()
 
     # Time progression statistics
     print("=" * 80)
     print("Time Progression Statistics")
     print("=" * 80)
-    print(f"gonet.fixed:")
-    print(f"  Average delta:  {result.avg_gonet_fixed_delta*1000:.2f}ms")
-    print(f"  Max delta:      {result.max_gonet_fixed_gap*1000:.2f}ms")
-    print()
-    print(f"gonet.std:")
-    print(f"  Average delta:  {result.avg_gonet_std_delta*1000:.2f}ms")
-    print(f"  Max delta:      {result.max_gonet_std_gap*1000:.2f}ms")
-    print()
+    for peer, peer_result in result.peers.items():
+        print(f"--- {peer} ---")
+        print_delta_stats(peer_result)
 
     # Catchup statistics
     if result.total_catchups > 0:
@@ -404,31 +1177,39 @@ def print_report(result: AnalysisResult, entries: List[TimeEntry]):
         print(f"Total iterations:         {result.total_catchup_iterations}")
         print(f"Max iterations (single):  {result.max_catchup_iterations}")
         print(f"Average iterations:       {result.total_catchup_iterations / result.total_catchups:.1f}")
+        print(f"Iteration percentiles:    {result.catchup_iteration_stats.format_percentiles('.0f')}")
+        print()
+
+        print("By peer:")
+        for peer, peer_result in result.peers.items():
+            if peer_result.total_catchups:
+                print(f"  {peer}: {peer_result.total_catchups} catchups, {peer_result.total_catchup_iterations} "
+                      f"iterations (max {peer_result.max_catchup_iterations}, "
+                      f"{peer_result.catchup_iteration_stats.format_percentiles('.0f')})")
         print()
 
         # Show catchup events
-        if result.catchup_lines:
-            print("Catchup events (first 5):")
-            for line_num in result.catchup_lines[:5]:
-                # Find corresponding entry
-                matching_entries = [e for e in entries if e.line_number == line_num and e.catchup_iterations]
-                if matching_entries:
-                    e = matching_entries[0]
-                    print(f"  Line {line_num}: {e.catchup_iterations} steps " +
-                          f"({e.catchup_from:.6f}s → {e.catchup_to:.6f}s, target: {e.catchup_target:.6f}s)")
+        print("Catchup events (first 5):")
+        for catchup in result.catchups[:5]:
+            print(f"  Line {catchup.line_number} [{catchup.peer or UNKNOWN_PEER}]: {catchup.iterations} steps " +
+                  f"({catchup.from_time:.6f}s → {catchup.to_time:.6f}s, target: {catchup.target_time:.6f}s)")
         print()
 
+    if result.pacing is not None:
+        print_pacing_report(result.pacing)
+
     # Sample time progression
     print("=" * 80)
     print("Sample Time Progression (first 10 entries)")
     print("=" * 80)
-    print(f"{'Line':<6} {'Type':<12} {'gonet.fixed':<14} {'gonet.std':<14} {'Gap (ms)':<10}")
+    print(f"{'Line':<6} {'Peer':<10} {'Type':<12} {'gonet.fixed':<14} {'gonet.std':<14} {'Gap (ms)':<10}")
     print("-" * 80)
-    for entry in entries[:10]:
+    for entry in map(series.entry, range(min(10, len(series)))):
         gap = (entry.gonet_std - entry.gonet_fixed) * 1000 if entry.gonet_fixed > 0 else 0
         fixed_str = f"{entry.gonet_fixed:.7f}" if entry.gonet_fixed > 0 else "N/A"
         std_str = f"{entry.gonet_std:.7f}" if entry.gonet_std > 0 else "N/A"
-        print(f"{entry.line_number:<6} {entry.update_type.value:<12} {fixed_str:<14} {std_str:<14} {gap:>8.2f}")
+        print(f"{entry.line_number:<6} {entry.peer or UNKNOWN_PEER:<10} {entry.update_type.value:<12} "
+              f"{fixed_str:<14} {std_str:<14} {gap:>8.2f}")
     print()
 
     # Final verdict
@@ -455,30 +1236,58 @@ def print_report(result: AnalysisResult, entries: List[TimeEntry]):
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python analyze_physics_time.py <log_file_path> [--server-only]")
+        print("Usage: python analyze_physics_time.py <log_file_path> [--server-only] [--jobs <N>] [--cache] [--follow]")
+        print("                                      [--since <time>] [--until <time>] [--time-index]")
+        print("                                      [--reset-seconds <s>] [--ping-pong-ms <ms>]")
+        print("                                      [--burst-frames <N>] [--burst-min <N>] [--stalls <N>] "
+              "[--pacing-window <s>]")
         print("\nExample:")
         print('  python analyze_physics_time.py "C:/Users/shash/AppData/LocalLow/Galore Interactive/GONetSandbox/logs/gonet-2025-10-16.log"')
         print('  python analyze_physics_time.py "gonet-2025-10-16.log" --server-only')
+        print('  python analyze_physics_time.py "gonet-2025-10-16.log" --jobs 16')
+        print('  python analyze_physics_time.py "gonet-2025-10-16.log" --cache')
+        print('  python analyze_physics_time.py "gonet-2025-10-16.log" --follow')
+        print('  python analyze_physics_time.py "gonet-2025-10-16.log" --since "2025-10-16 14:05" --until 14:10')
+        print('  python analyze_physics_time.py "gonet-2025-10-16.log" --reset-seconds 0.5 --ping-pong-ms 2')
+        print('  python analyze_physics_time.py "gonet-2025-10-16.log" --burst-frames 10 --stalls 25 --pacing-window 60')
         sys.exit(1)
 
     log_file = sys.argv[1]
     server_only = '--server-only' in sys.argv
+    jobs = parse_int_option(sys.argv, '--jobs', default=1)
+    use_cache = '--cache' in sys.argv
+    since = parse_str_option(sys.argv, '--since')
+    until = parse_str_option(sys.argv, '--until')
+    reset_seconds = parse_float_option(sys.argv, '--reset-seconds', default=SESSION_RESET_SECONDS)
+    ping_pong_seconds = parse_float_option(sys.argv, '--ping-pong-ms', default=PING_PONG_GAP_SECONDS * 1000) / 1000
+    pacing = PacingOptions(burst_frames=parse_int_option(sys.argv, '--burst-frames', default=BURST_FRAMES),
+                           burst_min=parse_int_option(sys.argv, '--burst-min', default=BURST_MIN_CATCHUPS),
+                           stalls=parse_int_option(sys.argv, '--stalls', default=STALLS_SHOWN),
+                           window_seconds=parse_float_option(sys.argv, '--pacing-window'))
 
     print(f"Analyzing log file: {log_file}")
     if server_only:
         print("Mode: SERVER ONLY (ignoring client logs)")
-    print("Parsing...")
-
-    entries, result = parse_log_file(log_file, server_only=server_only)
+    if '--follow' in sys.argv:
+        analyzer = PhysicsTimeAnalyzer(server_only=server_only, reset_seconds=reset_seconds,
+                                       ping_pong_seconds=ping_pong_seconds, pacing=pacing)
+        follow_log(log_file, [analyzer], signature=server_only)
+        series, result = analyzer.series, analyzer.result
+    else:
+        print("Parsing...")
+        series, result = parse_log_file(log_file, server_only=server_only, jobs=jobs, use_cache=use_cache,
+                                        since=since, until=until, time_index='--time-index' in sys.argv,
+                                        reset_seconds=reset_seconds, ping_pong_seconds=ping_pong_seconds,
+                                        pacing=pacing)
 
-    if not entries:
+    if not series:
         print("\nWARNING: No [PhysicsTime] entries found in log file!")
         print("Make sure the log contains debug output with [PhysicsTime] tags.")
         sys.exit(1)
 
-    print(f"Found {len(entries)} time entries\n")
+    print(f"Found {len(series)} time entries\n")
 
-    print_report(result, entries)
+    print_report(result, series)
 
 
 if __name__ == "__main__":
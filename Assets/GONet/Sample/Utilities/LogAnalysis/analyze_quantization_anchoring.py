@@ -3,7 +3,8 @@
 Analyze quantization-aware anchoring performance from GONet log files.
 
 Usage:
-    python analyze_quantization_anchoring.py <log_file_path> [--gonetid <id>]
+    python analyze_quantization_anchoring.py <log_file_path> [--gonetid <id>[,<id>...]] [--index] [--jobs <N>] [--cache] [--follow]
+                                          [--since <time>] [--until <time>] [--time-index]
 
 This script analyzes:
 1. VELOCITY bundle vs VALUE bundle ratios for position sync
@@ -11,21 +12,61 @@ This script analyzes:
 3. Time-based fallback anchor frequency
 4. Quantization error statistics
 5. Drift patterns and anchor effectiveness
+6. Per-GONetId breakdown (checks, allPass rate, anchor kinds, VELOCITY bundles)
+
+Events are kept in typed columns (array.array) rather than one object per
+line; when NumPy is installed the report statistics run vectorized on them.
 
 Arguments:
     log_file_path: Path to GONet log file (can be 1GB+)
-    --gonetid: Optional filter for specific GONetId (analyzes all if not specified)
+    --gonetid: Optional filter for specific GONetId(s), comma-separated (analyzes all if not specified)
+    --index: With --gonetid, read only the lines that mention those ids, using the GONetId
+             index kept in <log_file_path>.gonetid.gonetcache (built on first use in one
+             fast byte scan, extended as the log grows)
+    --jobs: Parse the file in N worker processes (default: 1)
+    --cache: Keep decoded events in <log_file_path>.quantization.gonetcache so later
+             runs (with any --gonetid) skip parsing; appended log lines are parsed incrementally
+    --follow: Keep tailing the live log (or newest gonet-YYYY-MM-DD.log of a logs folder),
+              printing anchor ratios every 10s; Ctrl+C prints the full report.
+              Progress is saved to <log_file_path>.follow.gonetcache (.gonet-follow.state
+              inside a followed folder) so a restart on the same log resumes.
+    --since/--until: Only analyze lines logged in this window, e.g. "2025-10-26 14:05" or
+                     "14:05:30" (date of the first log line); the window is found by binary
+                     search on the log timestamps, so the rest of the file is never read
+    --time-index: Keep a timestamp -> offset index in <log_file_path>.timeindex.gonetcache
+                  so repeated --since/--until queries need no probing at all
 
 Example:
     python analyze_quantization_anchoring.py gonet-2025-10-26.log
     python analyze_quantization_anchoring.py gonet-2025-10-26.log --gonetid 5119
+    python analyze_quantization_anchoring.py gonet-2025-10-26.log --gonetid 5119,5120,5121 --index
+    python analyze_quantization_anchoring.py gonet-2025-10-26.log --jobs 16
+    python analyze_quantization_anchoring.py gonet-2025-10-26.log --cache --gonetid 5119
+    python analyze_quantization_anchoring.py gonet-2025-10-26.log --follow
+    python analyze_quantization_anchoring.py gonet-2025-10-26.log --since 14:05 --until 14:10
 """
 
+import math
 import re
 import sys
-from collections import defaultdict
+from array import array
+from collections import Counter, defaultdict
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Union
+
+from gonet_log_cache import StringColumn
+from gonet_log_driver import (LogAnalyzer, parse_int_list_option, parse_int_option, parse_str_option,
+                              register_analyzer, run_analyzers)
+from gonet_log_follow import follow_log
+from gonet_log_parser import FieldTokenizer, LogRecord
+from gonet_log_stats import StreamingStats
+
+try:
+    import numpy as np
+except ImportError:  # Optional: statistics fall back to pure Python over the same columns
+    np = None
+
+NAN = math.nan
 
 
 @dataclass
@@ -65,14 +106,233 @@ class AnchorEvent:
     time_since_anchor: Optional[float] = None
 
 
-class QuantizationAnchoringAnalyzer:
-    def __init__(self, log_file: str, filter_gonetid: Optional[int] = None):
+class AnchorFallbackFields(NamedTuple):
+    """key:value fields of an [ANCHOR-FALLBACK] line (all required)."""
+    gonetid: int
+    idx: int
+    value_type: str
+    time_since_anchor: float
+
+
+ANCHOR_FALLBACK_FIELDS = FieldTokenizer(AnchorFallbackFields, {
+    'GONetId': 'gonetid',
+    'type': 'value_type',
+    'timeSinceAnchor': 'time_since_anchor',
+})
+
+VELOCITY_SYNC_TAG_LENGTH = len('[VelocitySync]')
+
+# Optional per-component fields of QuantCheckEvent, stored as NaN / -1 when None
+QUANT_CHECK_ERROR_FIELDS = ('error_x', 'error_y', 'error_z', 'error_w', 'error')
+QUANT_CHECK_FLAG_FIELDS = ('moving_x', 'moving_y', 'moving_z', 'moving_w', 'near_boundary')
+
+# GONetIds listed in the per-GONetId breakdown (most QUANT-CHECKs first)
+TOP_GONETIDS = 10
+
+
+class EventColumns:
+    """
+    Events stored as growable typed columns instead of one object per event.
+
+    Numeric fields are array.array columns (NaN / -1 stand in for None),
+    string fields are dictionary-encoded StringColumns. A multi-million event
+    session then costs a few bytes per field, and the report computes its
+    statistics on whole columns (NumPy views when NumPy is installed).
+    Subclasses list their fields and the cache column names they map to.
+    """
+    event_type: type = None
+    cache_prefix = ''
+    string_fields: Dict[str, str] = {}   # field -> cache column name
+    numeric_fields: Dict[str, str] = {}  # field -> array typecode
+    optional_floats: tuple = ()
+    optional_flags: tuple = ()
+
+    def __init__(self):
+        for field in self.string_fields:
+            setattr(self, field, StringColumn())
+        for field, typecode in self.numeric_fields.items():
+            setattr(self, field, array(typecode))
+
+    def __len__(self) -> int:
+        return len(getattr(self, 'gonetid'))
+
+    def event(self, row: int):
+        """Row as an event dataclass (None for missing optional values)."""
+        values = {field: getattr(self, field)[row] for field in self.string_fields}
+        for field in self.numeric_fields:
+            value = getattr(self, field)[row]
+            if field in self.optional_floats:
+                value = None if value != value else value
+            elif field in self.optional_flags:
+                value = None if value < 0 else value == 1
+            values[field] = value
+        return self.event_type(**values)
+
+    def __iter__(self):
+        return (self.event(row) for row in range(len(self)))
+
+    def extend(self, other: 'EventColumns'):
+        for field in self.string_fields:
+            getattr(self, field).extend(getattr(other, field))
+        for field in self.numeric_fields:
+            getattr(self, field).extend(getattr(other, field))
+
+    def to_columns(self) -> Dict[str, object]:
+        columns = {}
+        for field, name in self.string_fields.items():
+            column = getattr(self, field)
+            columns[f'{self.cache_prefix}{name}s'] = column.table
+            columns[f'{self.cache_prefix}{name}'] = column.codes
+        for field in self.numeric_fields:
+            columns[f'{self.cache_prefix}{field}'] = getattr(self, field)
+        return columns
+
+    def extend_from_columns(self, columns: Dict[str, object], rows=None):
+        """Append cached columns, optionally only the given rows (see _rows_in)."""
+        for field, name in self.string_fields.items():
+            codes = columns[f'{self.cache_prefix}{name}']
+            getattr(self, field).extend_codes(columns[f'{self.cache_prefix}{name}s'],
+                                              codes if rows is None else _take(codes, rows))
+        for field in self.numeric_fields:
+            values = columns[f'{self.cache_prefix}{field}']
+            getattr(self, field).extend(values if rows is None else _take(values, rows))
+
+
+class QuantCheckColumns(EventColumns):
+    """[QUANT-CHECK] events, one column per QuantCheckEvent field."""
+    event_type = QuantCheckEvent
+    cache_prefix = 'check_'
+    string_fields = {'timestamp': 'timestamp', 'value_type': 'type'}
+    numeric_fields = {
+        'gonetid': 'Q', 'idx': 'l', 'threshold': 'd', 'time_since_anchor': 'd', 'max_time': 'd', 'all_pass': 'b',
+        **{field: 'd' for field in QUANT_CHECK_ERROR_FIELDS},
+        **{field: 'b' for field in QUANT_CHECK_FLAG_FIELDS},
+    }
+    optional_floats = QUANT_CHECK_ERROR_FIELDS
+    optional_flags = QUANT_CHECK_FLAG_FIELDS
+
+    def append(self, timestamp: str, gonetid: int, idx: int, value_type: str, threshold: float,
+               time_since_anchor: float, max_time: float, all_pass: bool,
+               error_x: Optional[float] = None, error_y: Optional[float] = None,
+               error_z: Optional[float] = None, error_w: Optional[float] = None,
+               moving_x: Optional[bool] = None, moving_y: Optional[bool] = None,
+               moving_z: Optional[bool] = None, moving_w: Optional[bool] = None,
+               error: Optional[float] = None, near_boundary: Optional[bool] = None):
+        self.timestamp.append(timestamp)
+        self.gonetid.append(gonetid)
+        self.idx.append(idx)
+        self.value_type.append(value_type)
+        self.threshold.append(threshold)
+        self.time_since_anchor.append(time_since_anchor)
+        self.max_time.append(max_time)
+        self.all_pass.append(all_pass)
+        self.error_x.append(NAN if error_x is None else error_x)
+        self.error_y.append(NAN if error_y is None else error_y)
+        self.error_z.append(NAN if error_z is None else error_z)
+        self.error_w.append(NAN if error_w is None else error_w)
+        self.error.append(NAN if error is None else error)
+        self.moving_x.append(-1 if moving_x is None else moving_x)
+        self.moving_y.append(-1 if moving_y is None else moving_y)
+        self.moving_z.append(-1 if moving_z is None else moving_z)
+        self.moving_w.append(-1 if moving_w is None else moving_w)
+        self.near_boundary.append(-1 if near_boundary is None else near_boundary)
+
+
+class AnchorColumns(EventColumns):
+    """[ANCHOR-QUANTIZATION] / [ANCHOR-FALLBACK] events, one column per AnchorEvent field."""
+    event_type = AnchorEvent
+    cache_prefix = 'anchor_'
+    string_fields = {'timestamp': 'timestamp', 'value_type': 'type', 'anchor_type': 'kind'}
+    numeric_fields = {'gonetid': 'Q', 'idx': 'l', 'quant_error': 'd', 'time_since_anchor': 'd'}
+    optional_floats = ('quant_error', 'time_since_anchor')
+
+    def append(self, timestamp: str, gonetid: int, idx: int, value_type: str, anchor_type: str,
+               quant_error: Optional[float] = None, time_since_anchor: Optional[float] = None):
+        self.timestamp.append(timestamp)
+        self.gonetid.append(gonetid)
+        self.idx.append(idx)
+        self.value_type.append(value_type)
+        self.anchor_type.append(anchor_type)
+        self.quant_error.append(NAN if quant_error is None else quant_error)
+        self.time_since_anchor.append(NAN if time_since_anchor is None else time_since_anchor)
+
+    def count(self, anchor_type: str) -> int:
+        return _count_equal(_vector(self.anchor_type.codes), self.anchor_type.find(anchor_type))
+
+
+# --- Column statistics: vectorized with NumPy when installed, pure Python otherwise ---
+
+def _vector(column: array):
+    """Zero-copy NumPy view of an array.array column (the column itself without NumPy)."""
+    if np is None:
+        return column
+    if not column:
+        return np.empty(0, dtype=column.typecode)
+    return np.frombuffer(column, dtype=column.typecode)
+
+
+def _rows_where(values, value):
+    """Rows holding value: boolean mask with NumPy, list of row indexes otherwise."""
+    if np is not None:
+        return values == value if value is not None else np.zeros(len(values), dtype=bool)
+    return [row for row, item in enumerate(values) if item == value]
+
+
+def _rows_in(values, accepted):
+    if np is not None:
+        return np.isin(values, np.fromiter(accepted, dtype=values.dtype))
+    return [row for row, item in enumerate(values) if item in accepted]
+
+
+def _row_count(rows) -> int:
+    return int(rows.sum()) if np is not None else len(rows)
+
+
+def _select(values, rows):
+    return values[rows] if np is not None else [values[row] for row in rows]
+
+
+def _take(column: array, rows) -> array:
+    """New array.array holding the given rows of column."""
+    if np is not None:
+        return array(column.typecode, _vector(column)[rows].tobytes())
+    return array(column.typecode, (column[row] for row in rows))
+
+
+def _count_equal(values, value) -> int:
+    if value is None:
+        return 0
+    if np is not None:
+        return int(np.count_nonzero(values == value))
+    return sum(1 for item in values if item == value)
+
+
+def _group_counts(keys, rows=None) -> Dict[int, int]:
+    """Occurrences of each key (optionally only at rows) - a vectorized group-by with NumPy."""
+    if rows is not None:
+        keys = _select(keys, rows)
+    if np is not None:
+        unique, counts = np.unique(keys, return_counts=True)
+        return dict(zip(unique.tolist(), counts.tolist()))
+    return dict(Counter(keys))
+
+
+@register_analyzer('quantization')
+class QuantizationAnchoringAnalyzer(LogAnalyzer):
+    markers = ('[VelocitySync][', '[SERVER-SEND-VEL]')
+    supports_chunks = True
+    cache_name = 'quantization'
+
+    def __init__(self, log_file: str, filter_gonetids: Union[int, Iterable[int], None] = None):
         self.log_file = log_file
-        self.filter_gonetid = filter_gonetid
+        if isinstance(filter_gonetids, int):
+            filter_gonetids = (filter_gonetids,)
+        self.filter_gonetids: Optional[FrozenSet[int]] = \
+            frozenset(filter_gonetids) if filter_gonetids is not None else None
 
         # Statistics
-        self.quant_checks: List[QuantCheckEvent] = []
-        self.anchors: List[AnchorEvent] = []
+        self.quant_checks = QuantCheckColumns()
+        self.anchors = AnchorColumns()
         self.velocity_bundles_by_gonetid: Dict[int, int] = defaultdict(int)
         self.value_bundles_by_gonetid: Dict[int, int] = defaultdict(int)
 
@@ -121,174 +381,297 @@ class QuantizationAnchoringAnalyzer:
             r'type:(\w+) '
         )
 
-        # ANCHOR-FALLBACK
-        self.anchor_fallback_pattern = re.compile(
-            r'\[VelocitySync\]\[ANCHOR-FALLBACK\] GONetId:(\d+) idx:(\d+) '
-            r'type:(\w+) timeSinceAnchor:([\d.]+)s'
-        )
+        # ANCHOR-FALLBACK lines are plain key:value fields, decoded by ANCHOR_FALLBACK_FIELDS
 
         # VELOCITY bundles have GONetId in the log message
         self.velocity_bundle_pattern = re.compile(
             r'\[SERVER-SEND-VEL\] GONetId:(\d+)'
         )
 
-    def parse_log(self):
+        # Tag-indexed dispatch: each line is routed by its [VelocitySync][<sub-tag>]
+        # and then by its type: field, so only ONE pattern is ever tried per line
+        self._velocity_sync_decoders = {
+            'QUANT-CHECK': self._decode_quant_check,
+            'ANCHOR-QUANTIZATION': self._decode_anchor_quantization,
+            'ANCHOR-FALLBACK': self._decode_anchor_fallback,
+            'SERVER-SEND-VEL': self._decode_velocity_bundle,
+        }
+        self._quant_check_decoders = {
+            'Vector3': self._decode_quant_check_vector3,
+            'Vector2': self._decode_quant_check_vector2,
+            'Vector4': self._decode_quant_check_vector4,
+            'float': self._decode_quant_check_float,
+        }
+
+    @classmethod
+    def from_options(cls, options: dict) -> 'QuantizationAnchoringAnalyzer':
+        return cls(options.get('log_file'), options.get('gonetid'))
+
+    def chunk_spec(self):
+        return QuantizationAnchoringAnalyzer, (self.log_file, self.filter_gonetids)
+
+    def get_state(self):
+        return self.quant_checks, self.anchors, dict(self.velocity_bundles_by_gonetid)
+
+    def merge_state(self, state, line_offset: int):
+        quant_checks, anchors, velocity_bundles = state
+        self.quant_checks.extend(quant_checks)
+        self.anchors.extend(anchors)
+        for gonetid, count in velocity_bundles.items():
+            self.velocity_bundles_by_gonetid[gonetid] += count
+
+    def cache_builder(self):
+        return QuantizationAnchoringAnalyzer(self.log_file)
+
+    def to_columns(self):
+        columns = self.quant_checks.to_columns()
+        columns.update(self.anchors.to_columns())
+        columns['velocity_gonetid'] = array('Q', self.velocity_bundles_by_gonetid.keys())
+        columns['velocity_count'] = array('Q', self.velocity_bundles_by_gonetid.values())
+        return columns
+
+    def load_columns(self, columns):
+        check_rows = anchor_rows = None
+        if self.filter_gonetids is not None:
+            check_rows = _rows_in(_vector(columns['check_gonetid']), self.filter_gonetids)
+            anchor_rows = _rows_in(_vector(columns['anchor_gonetid']), self.filter_gonetids)
+        self.quant_checks.extend_from_columns(columns, check_rows)
+        self.anchors.extend_from_columns(columns, anchor_rows)
+
+        for gonetid, count in zip(columns['velocity_gonetid'], columns['velocity_count']):
+            if self._accepts(gonetid):
+                self.velocity_bundles_by_gonetid[gonetid] += count
+
+    def parse_log(self, jobs: int = 1, use_cache: bool = False, since: Optional[str] = None,
+                  until: Optional[str] = None, time_index: bool = False, use_index: bool = False):
         """Parse log file and extract relevant events."""
         print(f"[*] Parsing log file: {self.log_file}")
         print(f"    (This may take a while for large files...)")
+        if jobs > 1:
+            print(f"    (Parallel mode: {jobs} worker processes)")
 
-        line_count = 0
-        with open(self.log_file, 'r', encoding='utf-8', errors='ignore') as f:
-            for line in f:
-                line_count += 1
-                if line_count % 1_000_000 == 0:
-                    print(f"   Processed {line_count // 1_000_000}M lines...")
-
-                # Extract timestamp (first part of line)
-                timestamp_match = re.match(r'(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
-                timestamp = timestamp_match.group(1) if timestamp_match else "UNKNOWN"
-
-                # Parse QUANT-CHECK events (Vector3)
-                match = self.quant_check_vector3_pattern.search(line)
-                if match:
-                    gonetid = int(match.group(1))
-                    if self.filter_gonetid is None or gonetid == self.filter_gonetid:
-                        event = QuantCheckEvent(
-                            timestamp=timestamp,
-                            gonetid=gonetid,
-                            idx=int(match.group(2)),
-                            value_type="Vector3",
-                            error_x=float(match.group(3)),
-                            error_y=float(match.group(4)),
-                            error_z=float(match.group(5)),
-                            threshold=float(match.group(6)),
-                            moving_x=match.group(7) == "True",
-                            moving_y=match.group(8) == "True",
-                            moving_z=match.group(9) == "True",
-                            all_pass=match.group(10) == "True",
-                            time_since_anchor=float(match.group(11)),
-                            max_time=float(match.group(12))
-                        )
-                        self.quant_checks.append(event)
-                    continue
-
-                # Parse QUANT-CHECK events (Vector2)
-                match = self.quant_check_vector2_pattern.search(line)
-                if match:
-                    gonetid = int(match.group(1))
-                    if self.filter_gonetid is None or gonetid == self.filter_gonetid:
-                        event = QuantCheckEvent(
-                            timestamp=timestamp,
-                            gonetid=gonetid,
-                            idx=int(match.group(2)),
-                            value_type="Vector2",
-                            error_x=float(match.group(3)),
-                            error_y=float(match.group(4)),
-                            threshold=float(match.group(5)),
-                            moving_x=match.group(6) == "True",
-                            moving_y=match.group(7) == "True",
-                            all_pass=match.group(8) == "True",
-                            time_since_anchor=float(match.group(9)),
-                            max_time=float(match.group(10))
-                        )
-                        self.quant_checks.append(event)
-                    continue
-
-                # Parse QUANT-CHECK events (Vector4)
-                match = self.quant_check_vector4_pattern.search(line)
-                if match:
-                    gonetid = int(match.group(1))
-                    if self.filter_gonetid is None or gonetid == self.filter_gonetid:
-                        event = QuantCheckEvent(
-                            timestamp=timestamp,
-                            gonetid=gonetid,
-                            idx=int(match.group(2)),
-                            value_type="Vector4",
-                            error_x=float(match.group(3)),
-                            error_y=float(match.group(4)),
-                            error_z=float(match.group(5)),
-                            error_w=float(match.group(6)),
-                            threshold=float(match.group(7)),
-                            moving_x=match.group(8) == "True",
-                            moving_y=match.group(9) == "True",
-                            moving_z=match.group(10) == "True",
-                            moving_w=match.group(11) == "True",
-                            all_pass=match.group(12) == "True",
-                            time_since_anchor=float(match.group(13)),
-                            max_time=float(match.group(14))
-                        )
-                        self.quant_checks.append(event)
-                    continue
-
-                # Parse QUANT-CHECK events (float)
-                match = self.quant_check_float_pattern.search(line)
-                if match:
-                    gonetid = int(match.group(1))
-                    if self.filter_gonetid is None or gonetid == self.filter_gonetid:
-                        event = QuantCheckEvent(
-                            timestamp=timestamp,
-                            gonetid=gonetid,
-                            idx=int(match.group(2)),
-                            value_type="float",
-                            error=float(match.group(3)),
-                            threshold=float(match.group(4)),
-                            near_boundary=match.group(5) == "True",
-                            time_since_anchor=float(match.group(6)),
-                            max_time=float(match.group(7)),
-                            all_pass=match.group(5) == "True"  # nearBoundary is equivalent to allPass for float
-                        )
-                        self.quant_checks.append(event)
-                    continue
-
-                # Parse ANCHOR-QUANTIZATION events
-                match = self.anchor_quant_pattern.search(line)
-                if match:
-                    gonetid = int(match.group(1))
-                    if self.filter_gonetid is None or gonetid == self.filter_gonetid:
-                        event = AnchorEvent(
-                            timestamp=timestamp,
-                            gonetid=gonetid,
-                            idx=int(match.group(2)),
-                            value_type=match.group(3),
-                            anchor_type="QUANTIZATION"
-                        )
-                        self.anchors.append(event)
-                    continue
-
-                # Parse ANCHOR-FALLBACK events
-                match = self.anchor_fallback_pattern.search(line)
-                if match:
-                    gonetid = int(match.group(1))
-                    if self.filter_gonetid is None or gonetid == self.filter_gonetid:
-                        event = AnchorEvent(
-                            timestamp=timestamp,
-                            gonetid=gonetid,
-                            idx=int(match.group(2)),
-                            value_type=match.group(3),
-                            anchor_type="FALLBACK",
-                            time_since_anchor=float(match.group(4))
-                        )
-                        self.anchors.append(event)
-                    continue
-
-                # Parse VELOCITY bundle events (with GONetId filtering)
-                match = self.velocity_bundle_pattern.search(line)
-                if match:
-                    gonetid = int(match.group(1))
-                    if self.filter_gonetid is None or gonetid == self.filter_gonetid:
-                        self.velocity_bundles_by_gonetid[gonetid] += 1
-                    continue
+        line_count = run_analyzers(self.log_file, [self], jobs=jobs, use_cache=use_cache,
+                                   since=since, until=until, time_index=time_index, use_index=use_index)
 
         print(f"[OK] Parsing complete! Processed {line_count:,} lines")
 
+    def consume(self, line_number: int, record: LogRecord):
+        """Route one log record to the decoder for its tag (no regex work for unrelated lines)."""
+        tag = record.tag
+        if tag == 'VelocitySync':
+            # "[VelocitySync][QUANT-CHECK] ..." -> sub-tag starts right after the first tag
+            message = record.message
+            if not message.startswith('[', VELOCITY_SYNC_TAG_LENGTH):
+                return
+            end = message.find(']', VELOCITY_SYNC_TAG_LENGTH)
+            decoder = self._velocity_sync_decoders.get(message[VELOCITY_SYNC_TAG_LENGTH + 1:end])
+        elif tag == 'SERVER-SEND-VEL':
+            decoder = self._decode_velocity_bundle
+        else:
+            return
+
+        if decoder is not None:
+            decoder(record)
+
+    def _accepts(self, gonetid: int) -> bool:
+        return self.filter_gonetids is None or gonetid in self.filter_gonetids
+
+    def gonetid_filter(self):
+        return self.filter_gonetids
+
+    def _decode_quant_check(self, record: LogRecord):
+        """Read the type: field once and hand the line to the matching QUANT-CHECK decoder."""
+        message = record.message
+        start = message.find(' type:')
+        if start < 0:
+            return
+        start += 6
+        end = message.find(' ', start)
+        decoder = self._quant_check_decoders.get(message[start:end] if end >= 0 else message[start:])
+        if decoder is not None:
+            decoder(record)
+
+    def _decode_quant_check_vector3(self, record: LogRecord):
+        match = self.quant_check_vector3_pattern.match(record.message)
+        if match:
+            gonetid = int(match.group(1))
+            if self._accepts(gonetid):
+                self.quant_checks.append(
+                    timestamp=record.timestamp or "UNKNOWN",
+                    gonetid=gonetid,
+                    idx=int(match.group(2)),
+                    value_type="Vector3",
+                    error_x=float(match.group(3)),
+                    error_y=float(match.group(4)),
+                    error_z=float(match.group(5)),
+                    threshold=float(match.group(6)),
+                    moving_x=match.group(7) == "True",
+                    moving_y=match.group(8) == "True",
+                    moving_z=match.group(9) == "True",
+                    all_pass=match.group(10) == "True",
+                    time_since_anchor=float(match.group(11)),
+                    max_time=float(match.group(12))
+                )
+
+    def _decode_quant_check_vector2(self, record: LogRecord):
+        match = self.quant_check_vector2_pattern.match(record.message)
+        if match:
+            gonetid = int(match.group(1))
+            if self._accepts(gonetid):
+                self.quant_checks.append(
+                    timestamp=record.timestamp or "UNKNOWN",
+                    gonetid=gonetid,
+                    idx=int(match.group(2)),
+                    value_type="Vector2",
+                    error_x=float(match.group(3)),
+                    error_y=float(match.group(4)),
+                    threshold=float(match.group(5)),
+                    moving_x=match.group(6) == "True",
+                    moving_y=match.group(7) == "True",
+                    all_pass=match.group(8) == "True",
+                    time_since_anchor=float(match.group(9)),
+                    max_time=float(match.group(10))
+                )
+
+    def _decode_quant_check_vector4(self, record: LogRecord):
+        match = self.quant_check_vector4_pattern.match(record.message)
+        if match:
+            gonetid = int(match.group(1))
+            if self._accepts(gonetid):
+                self.quant_checks.append(
+                    timestamp=record.timestamp or "UNKNOWN",
+                    gonetid=gonetid,
+                    idx=int(match.group(2)),
+                    value_type="Vector4",
+                    error_x=float(match.group(3)),
+                    error_y=float(match.group(4)),
+                    error_z=float(match.group(5)),
+                    error_w=float(match.group(6)),
+                    threshold=float(match.group(7)),
+                    moving_x=match.group(8) == "True",
+                    moving_y=match.group(9) == "True",
+                    moving_z=match.group(10) == "True",
+                    moving_w=match.group(11) == "True",
+                    all_pass=match.group(12) == "True",
+                    time_since_anchor=float(match.group(13)),
+                    max_time=float(match.group(14))
+                )
+
+    def _decode_quant_check_float(self, record: LogRecord):
+        match = self.quant_check_float_pattern.match(record.message)
+        if match:
+            gonetid = int(match.group(1))
+            if self._accepts(gonetid):
+                self.quant_checks.append(
+                    timestamp=record.timestamp or "UNKNOWN",
+                    gonetid=gonetid,
+                    idx=int(match.group(2)),
+                    value_type="float",
+                    error=float(match.group(3)),
+                    threshold=float(match.group(4)),
+                    near_boundary=match.group(5) == "True",
+                    time_since_anchor=float(match.group(6)),
+                    max_time=float(match.group(7)),
+                    all_pass=match.group(5) == "True"  # nearBoundary is equivalent to allPass for float
+                )
+
+    def _decode_anchor_quantization(self, record: LogRecord):
+        match = self.anchor_quant_pattern.match(record.message)
+        if match:
+            gonetid = int(match.group(1))
+            if self._accepts(gonetid):
+                self.anchors.append(
+                    timestamp=record.timestamp or "UNKNOWN",
+                    gonetid=gonetid,
+                    idx=int(match.group(2)),
+                    value_type=match.group(3),
+                    anchor_type="QUANTIZATION"
+                )
+
+    def _decode_anchor_fallback(self, record: LogRecord):
+        fields = ANCHOR_FALLBACK_FIELDS.parse(record.message)
+        if fields and self._accepts(fields.gonetid):
+            self.anchors.append(
+                timestamp=record.timestamp or "UNKNOWN",
+                gonetid=fields.gonetid,
+                idx=fields.idx,
+                value_type=fields.value_type,
+                anchor_type="FALLBACK",
+                time_since_anchor=fields.time_since_anchor
+            )
+
+    def _decode_velocity_bundle(self, record: LogRecord):
+        match = self.velocity_bundle_pattern.search(record.message)
+        if match:
+            gonetid = int(match.group(1))
+            if self._accepts(gonetid):
+                self.velocity_bundles_by_gonetid[gonetid] += 1
+
+    def live_summary(self):
+        quant_anchors = self.anchors.count("QUANTIZATION")
+        total_anchors = len(self.anchors)
+        # Only accepted GONetIds are counted, so this is the filtered total
+        velocity_count = sum(self.velocity_bundles_by_gonetid.values())
+        return (f"checks={len(self.quant_checks):,} anchors={total_anchors:,} "
+                f"(quant {quant_anchors / max(1, total_anchors) * 100:.1f}% / "
+                f"fallback {(total_anchors - quant_anchors) / max(1, total_anchors) * 100:.1f}%) "
+                f"VELOCITY bundles={velocity_count / max(1, velocity_count + total_anchors) * 100:.1f}%")
+
+    def report(self):
+        self.generate_report()
+
+    def _phase2_would_pass(self, vector3_rows, component_errors, component_moving) -> int:
+        """Vector3 checks whose MOVING components are all under threshold (and at least one moves)."""
+        thresholds = _select(_vector(self.quant_checks.threshold), vector3_rows)
+        if np is not None:
+            any_moving = np.zeros(len(thresholds), dtype=bool)
+            all_moving_pass = np.ones(len(thresholds), dtype=bool)
+            for axis, moving in component_moving.items():
+                is_moving = moving == 1
+                any_moving |= is_moving
+                all_moving_pass &= ~is_moving | (component_errors[axis] < thresholds)
+            return int(np.count_nonzero(any_moving & all_moving_pass))
+
+        would_pass = 0
+        axes = [(component_moving[axis], component_errors[axis]) for axis in component_moving]
+        for row, threshold in enumerate(thresholds):
+            moving_axes = [errors[row] for moving, errors in axes if moving[row] == 1]
+            if moving_axes and all(error < threshold for error in moving_axes):
+                would_pass += 1
+        return would_pass
+
+    def _print_gonetid_breakdown(self):
+        checks = self.quant_checks
+        if not checks:
+            print("  No quantization checks found.")
+            return
+
+        gonetids = _vector(checks.gonetid)
+        check_counts = _group_counts(gonetids)
+        pass_counts = _group_counts(gonetids, _rows_where(_vector(checks.all_pass), 1))
+        anchor_gonetids = _vector(self.anchors.gonetid)
+        kinds = _vector(self.anchors.anchor_type.codes)
+        quant_counts = _group_counts(anchor_gonetids, _rows_where(kinds, self.anchors.anchor_type.find("QUANTIZATION")))
+        fallback_counts = _group_counts(anchor_gonetids, _rows_where(kinds, self.anchors.anchor_type.find("FALLBACK")))
+
+        top = sorted(check_counts.items(), key=lambda item: (-item[1], item[0]))[:TOP_GONETIDS]
+        print(f"  {'GONetId':>10} {'Checks':>10} {'allPass':>8} {'Quant':>8} {'Fallback':>9} {'VELOCITY':>10}")
+        for gonetid, count in top:
+            print(f"  {gonetid:>10} {count:>10,} {pass_counts.get(gonetid, 0) / count * 100:>7.1f}% "
+                  f"{quant_counts.get(gonetid, 0):>8,} {fallback_counts.get(gonetid, 0):>9,} "
+                  f"{self.velocity_bundles_by_gonetid.get(gonetid, 0):>10,}")
+        if len(check_counts) > len(top):
+            print(f"  ... {len(check_counts) - len(top):,} more GONetIds")
+
     def generate_report(self):
         """Generate comprehensive analysis report."""
         print("\n" + "="*80)
         print("[REPORT] QUANTIZATION-AWARE ANCHORING ANALYSIS")
         print("="*80)
 
-        if self.filter_gonetid:
-            print(f"\n[FILTER] GONetId: {self.filter_gonetid}")
+        if self.filter_gonetids is not None:
+            label = "GONetId" if len(self.filter_gonetids) == 1 else "GONetIds"
+            print(f"\n[FILTER] {label}: {', '.join(map(str, sorted(self.filter_gonetids)))}")
         else:
             print(f"\n[FILTER] All GONetIds")
 
@@ -297,10 +680,12 @@ class QuantizationAnchoringAnalyzer:
         print("1. OVERALL STATISTICS")
         print("-"*80)
 
-        total_quant_checks = len(self.quant_checks)
-        total_quant_anchors = sum(1 for a in self.anchors if a.anchor_type == "QUANTIZATION")
-        total_fallback_anchors = sum(1 for a in self.anchors if a.anchor_type == "FALLBACK")
-        total_anchors = len(self.anchors)
+        checks = self.quant_checks
+        anchors = self.anchors
+        total_quant_checks = len(checks)
+        total_quant_anchors = anchors.count("QUANTIZATION")
+        total_fallback_anchors = anchors.count("FALLBACK")
+        total_anchors = len(anchors)
 
         print(f"  Quantization checks:        {total_quant_checks:,}")
         print(f"  Quantization-aware anchors: {total_quant_anchors:,} ({total_quant_anchors/max(1,total_anchors)*100:.1f}% of anchors)")
@@ -312,11 +697,8 @@ class QuantizationAnchoringAnalyzer:
         print("2. VELOCITY vs VALUE BUNDLE STATISTICS")
         print("-"*80)
 
-        # Calculate VELOCITY bundle count (sum all GONetIds or specific filtered one)
-        if self.filter_gonetid:
-            velocity_count = self.velocity_bundles_by_gonetid.get(self.filter_gonetid, 0)
-        else:
-            velocity_count = sum(self.velocity_bundles_by_gonetid.values())
+        # Calculate VELOCITY bundle count (only accepted GONetIds were counted)
+        velocity_count = sum(self.velocity_bundles_by_gonetid.values())
 
         # VALUE bundles = anchors (QUANTIZATION + FALLBACK)
         value_count = total_anchors
@@ -336,65 +718,72 @@ class QuantizationAnchoringAnalyzer:
         print("3. QUANTIZATION ERROR DISTRIBUTION (PHASE 2: PER-COMPONENT)")
         print("-"*80)
 
-        if self.quant_checks:
-            thresholds = [c.threshold for c in self.quant_checks]
-            print(f"  Mean threshold:  {sum(thresholds)/len(thresholds):.6f}")
+        # Vector3 rows as a NumPy mask (or row list); reused by sections 6 and 7
+        vector3_rows = _rows_where(_vector(checks.value_type.codes), checks.value_type.find("Vector3"))
+        vector3_count = _row_count(vector3_rows)
+        component_errors = {}
+        component_moving = {}
+        if vector3_count:
+            for axis in ('x', 'y', 'z'):
+                component_errors[axis] = _select(_vector(getattr(checks, f'error_{axis}')), vector3_rows)
+                component_moving[axis] = _select(_vector(getattr(checks, f'moving_{axis}')), vector3_rows)
 
-            # Vector3 per-component stats
-            vector3_checks = [c for c in self.quant_checks if c.value_type == "Vector3"]
-            if vector3_checks:
-                errors_x = [c.error_x for c in vector3_checks]
-                errors_y = [c.error_y for c in vector3_checks]
-                errors_z = [c.error_z for c in vector3_checks]
+        if checks:
+            print(f"  Mean threshold:  {StreamingStats(_vector(checks.threshold)).mean:.6f}")
 
+            # Vector3 per-component stats
+            if vector3_count:
                 print(f"\n  Vector3 Component Errors:")
-                print(f"    X: min={min(errors_x):.6f} max={max(errors_x):.6f} mean={sum(errors_x)/len(errors_x):.6f}")
-                print(f"    Y: min={min(errors_y):.6f} max={max(errors_y):.6f} mean={sum(errors_y)/len(errors_y):.6f}")
-                print(f"    Z: min={min(errors_z):.6f} max={max(errors_z):.6f} mean={sum(errors_z)/len(errors_z):.6f}")
+                error_stats = {axis: StreamingStats(errors) for axis, errors in component_errors.items()}
+                for axis, stats in error_stats.items():
+                    print(f"    {axis.upper()}: min={stats.min:.6f} max={stats.max:.6f} mean={stats.mean:.6f}")
 
-                # Motion detection stats
-                moving_x_count = sum(1 for c in vector3_checks if c.moving_x)
-                moving_y_count = sum(1 for c in vector3_checks if c.moving_y)
-                moving_z_count = sum(1 for c in vector3_checks if c.moving_z)
+                print(f"\n  Vector3 Component Error Percentiles:")
+                for axis, stats in error_stats.items():
+                    print(f"    {axis.upper()}: {stats.format_percentiles('.6f')}")
 
+                # Motion detection stats
                 print(f"\n  Vector3 Motion Detection:")
-                print(f"    X moving: {moving_x_count:,} ({moving_x_count/len(vector3_checks)*100:.1f}%)")
-                print(f"    Y moving: {moving_y_count:,} ({moving_y_count/len(vector3_checks)*100:.1f}%)")
-                print(f"    Z moving: {moving_z_count:,} ({moving_z_count/len(vector3_checks)*100:.1f}%)")
+                for axis, moving in component_moving.items():
+                    moving_count = _count_equal(moving, 1)
+                    print(f"    {axis.upper()} moving: {moving_count:,} ({moving_count/vector3_count*100:.1f}%)")
 
             # Phase 1 logic: All components must pass
-            all_pass_count = sum(1 for c in self.quant_checks if c.all_pass)
+            all_pass_count = _count_equal(_vector(checks.all_pass), 1)
             print(f"\n  Phase 1 Logic (ALL components must pass):")
-            print(f"    Checks with allPass=True: {all_pass_count:,} ({all_pass_count/len(self.quant_checks)*100:.1f}%)")
+            print(f"    Checks with allPass=True: {all_pass_count:,} ({all_pass_count/len(checks)*100:.1f}%)")
 
         # Section 4: Anchor Timing Analysis
         print("\n" + "-"*80)
         print("4. ANCHOR TIMING ANALYSIS")
         print("-"*80)
 
-        if self.quant_checks:
-            times = [c.time_since_anchor for c in self.quant_checks]
-            print(f"  Min time since last anchor: {min(times):.3f}s")
-            print(f"  Max time since last anchor: {max(times):.3f}s")
-            print(f"  Mean time since anchor:     {sum(times)/len(times):.3f}s")
-
-            # Fallback anchor timing
-            fallback_times = [a.time_since_anchor for a in self.anchors if a.anchor_type == "FALLBACK" and a.time_since_anchor]
-            if fallback_times:
+        if checks:
+            anchor_times = StreamingStats(_vector(checks.time_since_anchor))
+            print(f"  Min time since last anchor: {anchor_times.min:.3f}s")
+            print(f"  Max time since last anchor: {anchor_times.max:.3f}s")
+            print(f"  Mean time since anchor:     {anchor_times.mean:.3f}s")
+            print(f"  Time since anchor:          {anchor_times.format_percentiles('.3f', 's')}")
+
+            # Fallback anchor timing (missing = NaN and 0s triggers are skipped)
+            fallback_times = _select(_vector(anchors.time_since_anchor),
+                                     _rows_where(_vector(anchors.anchor_type.codes), anchors.anchor_type.find("FALLBACK")))
+            fallback_times = fallback_times[fallback_times > 0] if np is not None else \
+                [value for value in fallback_times if value > 0]
+            if len(fallback_times):
+                fallback_stats = StreamingStats(fallback_times)
                 print(f"\n  Fallback anchor trigger times:")
-                print(f"    Min: {min(fallback_times):.3f}s")
-                print(f"    Max: {max(fallback_times):.3f}s")
-                print(f"    Mean: {sum(fallback_times)/len(fallback_times):.3f}s")
+                print(f"    Min: {fallback_stats.min:.3f}s")
+                print(f"    Max: {fallback_stats.max:.3f}s")
+                print(f"    Mean: {fallback_stats.mean:.3f}s")
 
         # Section 5: Value Type Breakdown
         print("\n" + "-"*80)
         print("5. VALUE TYPE BREAKDOWN")
         print("-"*80)
 
-        type_counts = defaultdict(int)
-        for check in self.quant_checks:
-            type_counts[check.value_type] += 1
-
+        type_counts = {checks.value_type.table[code]: count
+                       for code, count in _group_counts(_vector(checks.value_type.codes)).items()}
         for value_type, count in sorted(type_counts.items()):
             print(f"  {value_type}: {count:,} checks")
 
@@ -403,44 +792,23 @@ class QuantizationAnchoringAnalyzer:
         print("6. PHASE 2 MOVING-COMPONENT LOGIC ANALYSIS")
         print("-"*80)
 
-        if self.quant_checks:
+        if checks:
             # Simulate Phase 2 logic for Vector3
-            vector3_checks = [c for c in self.quant_checks if c.value_type == "Vector3"]
-            if vector3_checks:
-                phase2_would_pass = 0
-                for c in vector3_checks:
-                    # Phase 2 logic: Only check moving components
-                    all_moving_pass = True
-                    any_moving = False
-
-                    if c.moving_x:
-                        any_moving = True
-                        if c.error_x >= c.threshold:
-                            all_moving_pass = False
-                    if c.moving_y:
-                        any_moving = True
-                        if c.error_y >= c.threshold:
-                            all_moving_pass = False
-                    if c.moving_z:
-                        any_moving = True
-                        if c.error_z >= c.threshold:
-                            all_moving_pass = False
-
-                    if all_moving_pass and any_moving:
-                        phase2_would_pass += 1
+            if vector3_count:
+                phase2_would_pass = self._phase2_would_pass(vector3_rows, component_errors, component_moving)
 
                 print(f"  Vector3 Phase 2 Simulation:")
                 print(f"    Checks that WOULD trigger quant anchor (moving-component logic):")
-                print(f"      {phase2_would_pass:,} / {len(vector3_checks):,} ({phase2_would_pass/len(vector3_checks)*100:.1f}%)")
-                print(f"    vs Phase 1 (all-component logic): {all_pass_count:,} ({all_pass_count/len(self.quant_checks)*100:.1f}%)")
-                print(f"    Improvement: +{phase2_would_pass - all_pass_count:,} opportunities ({(phase2_would_pass - all_pass_count)/len(vector3_checks)*100:.1f}% increase)")
+                print(f"      {phase2_would_pass:,} / {vector3_count:,} ({phase2_would_pass/vector3_count*100:.1f}%)")
+                print(f"    vs Phase 1 (all-component logic): {all_pass_count:,} ({all_pass_count/len(checks)*100:.1f}%)")
+                print(f"    Improvement: +{phase2_would_pass - all_pass_count:,} opportunities ({(phase2_would_pass - all_pass_count)/vector3_count*100:.1f}% increase)")
 
         # Section 7: Recommendations (Phase 2)
         print("\n" + "-"*80)
         print("7. ANALYSIS & RECOMMENDATIONS (PHASE 2)")
         print("-"*80)
 
-        if self.quant_checks:
+        if checks:
             total_bundles = velocity_count + value_count
             velocity_ratio = velocity_count / max(1, total_bundles)
             quant_anchor_ratio = total_quant_anchors / max(1, total_anchors)
@@ -469,12 +837,18 @@ class QuantizationAnchoringAnalyzer:
                 print(f"     [NOTE] Many fallback anchors - motion patterns may not align with quantization grid")
 
             # Phase 2 specific analysis
-            if vector3_checks:
-                moving_y_rate = sum(1 for c in vector3_checks if c.moving_y) / len(vector3_checks)
+            if vector3_count:
+                moving_y_rate = _count_equal(component_moving['y'], 1) / vector3_count
                 if moving_y_rate < 0.1:
                     print(f"\n  [PHASE 2 INSIGHT] Y component mostly stationary ({(1-moving_y_rate)*100:.0f}% not moving)")
                     print(f"     This is why Phase 2 helps - excludes stationary Y from boundary checks!")
 
+        # Section 8: Per-GONetId breakdown
+        print("\n" + "-"*80)
+        print(f"8. PER-GONETID BREAKDOWN (top {TOP_GONETIDS} by quantization checks)")
+        print("-"*80)
+        self._print_gonetid_breakdown()
+
         print("\n" + "="*80)
         print("[DONE] ANALYSIS COMPLETE")
         print("="*80 + "\n")
@@ -486,19 +860,21 @@ def main():
         sys.exit(1)
 
     log_file = sys.argv[1]
-    filter_gonetid = None
 
-    # Parse optional --gonetid argument
-    if len(sys.argv) >= 4 and sys.argv[2] == '--gonetid':
-        try:
-            filter_gonetid = int(sys.argv[3])
-        except ValueError:
-            print(f"[ERROR] Invalid GONetId '{sys.argv[3]}' (must be integer)")
-            sys.exit(1)
+    # Parse optional --gonetid / --jobs / --since / --until arguments
+    filter_gonetids = parse_int_list_option(sys.argv, '--gonetid')
+    jobs = parse_int_option(sys.argv, '--jobs', default=1)
+    use_cache = '--cache' in sys.argv
+    since = parse_str_option(sys.argv, '--since')
+    until = parse_str_option(sys.argv, '--until')
 
     # Run analysis
-    analyzer = QuantizationAnchoringAnalyzer(log_file, filter_gonetid)
-    analyzer.parse_log()
+    analyzer = QuantizationAnchoringAnalyzer(log_file, filter_gonetids)
+    if '--follow' in sys.argv:
+        follow_log(log_file, [analyzer], signature=analyzer.filter_gonetids)
+    else:
+        analyzer.parse_log(jobs=jobs, use_cache=use_cache, since=since, until=until,
+                           time_index='--time-index' in sys.argv, use_index='--index' in sys.argv)
     analyzer.generate_report()
 
 
@@ -27,6 +27,9 @@ import re
 from collections import defaultdict
 from datetime import datetime
 
+from gonet_log_io import is_compressed, iter_marked_lines
+from gonet_log_parser import parse_log_line
+
 
 class RpcTestResult:
     """Parsed RPC test result from logs."""
@@ -69,9 +72,10 @@ class RpcTestAnalyzer:
             print(f"ERROR: Directory not found: {self.log_directory}")
             sys.exit(1)
 
+        # Archived logs (.log.gz, .log.bz2, .log.zst) are read without unpacking them
         log_files = [
             f for f in os.listdir(self.log_directory)
-            if f.endswith('.log') or f.endswith('.txt')
+            if (os.path.splitext(f)[0] if is_compressed(f) else f).endswith(('.log', '.txt'))
         ]
 
         if not log_files:
@@ -92,10 +96,11 @@ class RpcTestAnalyzer:
     def _parse_log_file(self, file_path):
         """Parse a single log file for test results."""
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    if '[RPC-TEST-RESULT]' in line:
-                        self._parse_test_result(line, file_path, line_num)
+            # Memory-mapped byte scan: only [RPC-TEST-RESULT] lines get decoded
+            for line_num, line in iter_marked_lines(file_path, ['[RPC-TEST-RESULT]']):
+                # Only the message part can hold the JSON payload
+                record = parse_log_line(line)
+                self._parse_test_result(record.message if record else line, file_path, line_num)
         except Exception as e:
             self.parse_errors.append(f"Error reading {file_path}: {e}")
 
@@ -4,360 +4,521 @@ Comprehensive RPC validation analysis script.
 Analyzes GONet logs to validate all RPC functionality.
 
 Usage:
-    python analyze_rpc_validation.py <log_file_path>
+    python analyze_rpc_validation.py <log_file_path> [--jobs <N>] [--since <time>] [--until <time>] [--time-index]
     python analyze_rpc_validation.py "C:/Users/shash/AppData/LocalLow/Galore Interactive/GONetSandbox/logs/gonet-2025-11-10.log"
+    python analyze_rpc_validation.py gonet-2025-11-10.log --since "2025-11-10 14:05" --until 14:10
 """
 
 import sys
-import re
-from collections import defaultdict, Counter
-from datetime import datetime
-
-def parse_log_line(line):
-    """Parse a GONet log line into components."""
-    # Format: [Level][Machine] (Thread:N) timestamp message
-    pattern = r'\[(\w+)\]\[([^\]]+)\].*?\(frame:\d+/[\d.]+s\)\s+(.+)'
-    match = re.match(pattern, line)
-    if match:
-        return {
-            'level': match.group(1),
-            'machine': match.group(2),
-            'message': match.group(3)
-        }
-    return None
-
-def analyze_runlocally_behavior(lines):
-    """Analyze RunLocally=true behavior (server calling ServerRpc locally)."""
-    print("\n" + "="*80)
-    print("PHASE 1: ServerRpc RunLocally Validation")
-    print("="*80)
+from collections import Counter
+
+from gonet_log_driver import LogAnalyzer, parse_int_option, parse_str_option, register_analyzer, run_analyzers
+
+# Lines kept per machine for the "RPC EXECUTION SUMMARIES" section
+SUMMARY_LINES_SHOWN = 20
+
+# (peer, message) samples kept for each failure/late-joiner count; the rest are only counted
+FAILURE_SAMPLES_SHOWN = 10
+
+
+def print_samples(samples, count: int, prefix: str = ''):
+    """Print the kept (peer, message) samples, noting when they are only the first of count."""
+    if count > len(samples):
+        print(f"  (first {len(samples)} of {count})")
+    for machine, msg in samples:
+        print(f"  {prefix}[{machine}] {msg}...")
+
+
+class ValidationPhase:
+    """
+    One validation phase, fed peer-tagged log lines as the single pass reads them.
+
+    A phase keeps only counters and the sample lines its report prints, so
+    memory stays flat however large the log is. merge() folds in the phase
+    state of the NEXT chunk in file order (--jobs).
+    """
+
+    name = "phase"
 
-    server_serverrpc_local = []
-    server_serverrpc_remote = []
-    client_serverrpc = []
+    def consume(self, peer: str, level: str, message: str):
+        raise NotImplementedError
 
-    for line in lines:
-        parsed = parse_log_line(line)
-        if not parsed:
-            continue
+    def merge(self, other: 'ValidationPhase'):
+        raise NotImplementedError
 
-        msg = parsed['message']
-        machine = parsed['machine']
+    def report(self) -> bool:
+        """Print the phase report; True if the validation passed."""
+        raise NotImplementedError
 
+
+class RunLocallyPhase(ValidationPhase):
+    """Analyze RunLocally=true behavior (server calling ServerRpc locally)."""
+
+    name = 'RunLocally (ServerRpc)'
+
+    def __init__(self):
+        self.local_count = 0
+        self.local_sample = None
+        self.remote_count = 0
+        self.remote_sample = None
+        self.client_count = 0
+
+    def consume(self, peer, level, message):
         # Look for ServerRpc executions with Remote flag
-        if 'ServerRpc' in msg and 'executed' in msg.lower():
-            if machine == 'Server':
-                if 'Remote: False' in msg:
-                    server_serverrpc_local.append(msg)
-                elif 'Remote: True' in msg:
-                    server_serverrpc_remote.append(msg)
-            elif 'Client:' in machine:
-                client_serverrpc.append(msg)
-
-    print(f"\n[OK] Server ServerRpc (RunLocally, Remote: False): {len(server_serverrpc_local)} executions")
-    if server_serverrpc_local:
-        print("  Sample:", server_serverrpc_local[0][:120] + "...")
-
-    print(f"\n[OK] Server ServerRpc (from clients, Remote: True): {len(server_serverrpc_remote)} executions")
-    if server_serverrpc_remote:
-        print("  Sample:", server_serverrpc_remote[0][:120] + "...")
-
-    print(f"\n[OK] Client ServerRpc initiated: {len(client_serverrpc)} executions")
-
-    # Validation
-    validation_pass = True
-    if len(server_serverrpc_local) == 0:
-        print("\n[WARN]  WARNING: No server-side ServerRpc with Remote: False found!")
-        print("   Expected: Server pressing Shift+C should show Remote: False")
-        validation_pass = False
-
-    if len(server_serverrpc_remote) == 0:
-        print("\n[WARN]  WARNING: No server-side ServerRpc with Remote: True found!")
-        print("   Expected: Clients pressing Shift+C should show Remote: True on server")
-        validation_pass = False
-
-    if validation_pass:
-        print("\n[PASS] PASS: RunLocally behavior validated correctly")
-    else:
-        print("\n[FAIL] FAIL: RunLocally behavior validation failed")
+        if 'ServerRpc' in message and 'executed' in message.lower():
+            if peer == 'Server':
+                if 'Remote: False' in message:
+                    self.local_count += 1
+                    self.local_sample = self.local_sample or message[:120]
+                elif 'Remote: True' in message:
+                    self.remote_count += 1
+                    self.remote_sample = self.remote_sample or message[:120]
+            elif 'Client:' in peer:
+                self.client_count += 1
+
+    def merge(self, other):
+        self.local_count += other.local_count
+        self.local_sample = self.local_sample or other.local_sample
+        self.remote_count += other.remote_count
+        self.remote_sample = self.remote_sample or other.remote_sample
+        self.client_count += other.client_count
+
+    def report(self):
+        print("\n" + "="*80)
+        print("PHASE 1: ServerRpc RunLocally Validation")
+        print("="*80)
+
+        print(f"\n[OK] Server ServerRpc (RunLocally, Remote: False): {self.local_count} executions")
+        if self.local_count:
+            print("  Sample:", self.local_sample + "...")
+
+        print(f"\n[OK] Server ServerRpc (from clients, Remote: True): {self.remote_count} executions")
+        if self.remote_count:
+            print("  Sample:", self.remote_sample + "...")
+
+        print(f"\n[OK] Client ServerRpc initiated: {self.client_count} executions")
+
+        # Validation
+        validation_pass = True
+        if self.local_count == 0:
+            print("\n[WARN]  WARNING: No server-side ServerRpc with Remote: False found!")
+            print("   Expected: Server pressing Shift+C should show Remote: False")
+            validation_pass = False
 
-    return validation_pass
+        if self.remote_count == 0:
+            print("\n[WARN]  WARNING: No server-side ServerRpc with Remote: True found!")
+            print("   Expected: Clients pressing Shift+C should show Remote: True on server")
+            validation_pass = False
 
-def analyze_clientrpc_broadcast(lines):
+        if validation_pass:
+            print("\n[PASS] PASS: RunLocally behavior validated correctly")
+        else:
+            print("\n[FAIL] FAIL: RunLocally behavior validation failed")
+
+        return validation_pass
+
+
+class ClientRpcBroadcastPhase(ValidationPhase):
     """Analyze ClientRpc broadcast behavior."""
-    print("\n" + "="*80)
-    print("PHASE 2: ClientRpc Broadcast Validation")
-    print("="*80)
 
-    server_clientrpc = []
-    client1_clientrpc = []
-    client2_clientrpc = []
-    client3_clientrpc = []
-
-    for line in lines:
-        parsed = parse_log_line(line)
-        if not parsed:
-            continue
-
-        msg = parsed['message']
-        machine = parsed['machine']
-
-        if 'ClientRpc' in msg and 'executed' in msg.lower():
-            if machine == 'Server':
-                server_clientrpc.append(msg)
-            elif machine == 'Client:1':
-                client1_clientrpc.append(msg)
-            elif machine == 'Client:2':
-                client2_clientrpc.append(msg)
-            elif machine == 'Client:3':
-                client3_clientrpc.append(msg)
-
-    print(f"\n[OK] Server ClientRpc executed: {len(server_clientrpc)} (should be 0 in dedicated mode)")
-    print(f"[OK] Client 1 ClientRpc received: {len(client1_clientrpc)}")
-    print(f"[OK] Client 2 ClientRpc received: {len(client2_clientrpc)}")
-    print(f"[OK] Client 3 ClientRpc received: {len(client3_clientrpc)}")
-
-    # Expected: 9 ClientRpc executions per client (0-8 params)
-    expected_per_client = 9
-
-    validation_pass = True
-    if len(client1_clientrpc) > 0 and len(client1_clientrpc) < expected_per_client:
-        print(f"\n[WARN]  WARNING: Client 1 received {len(client1_clientrpc)} ClientRpcs, expected ~{expected_per_client}")
-        validation_pass = False
-
-    if len(client2_clientrpc) > 0 and len(client2_clientrpc) < expected_per_client:
-        print(f"\n[WARN]  WARNING: Client 2 received {len(client2_clientrpc)} ClientRpcs, expected ~{expected_per_client}")
-        validation_pass = False
-
-    if len(server_clientrpc) > 0:
-        print(f"\n[WARN]  INFO: Server executed {len(server_clientrpc)} ClientRpcs locally (host mode, not dedicated)")
-
-    if validation_pass and (len(client1_clientrpc) > 0 or len(client2_clientrpc) > 0):
-        print("\n[PASS] PASS: ClientRpc broadcast validated")
-    elif len(client1_clientrpc) == 0 and len(client2_clientrpc) == 0:
-        print("\n[WARN]  SKIP: No ClientRpc broadcasts detected (Shift+S not pressed?)")
-    else:
-        print("\n[FAIL] FAIL: ClientRpc broadcast validation failed")
+    name = 'ClientRpc Broadcast'
 
-    return validation_pass
+    def __init__(self):
+        self.executions = Counter()  # peer -> ClientRpc executions
 
-def analyze_targetrpc_targeting(lines):
-    """Analyze TargetRpc targeting modes."""
-    print("\n" + "="*80)
-    print("PHASE 3: TargetRpc Targeting Validation")
-    print("="*80)
+    def consume(self, peer, level, message):
+        if 'ClientRpc' in message and 'executed' in message.lower():
+            self.executions[peer] += 1
 
-    targetrpc_executions = defaultdict(list)
+    def merge(self, other):
+        self.executions.update(other.executions)
 
-    for line in lines:
-        parsed = parse_log_line(line)
-        if not parsed:
-            continue
+    def report(self):
+        print("\n" + "="*80)
+        print("PHASE 2: ClientRpc Broadcast Validation")
+        print("="*80)
 
-        msg = parsed['message']
-        machine = parsed['machine']
+        server_clientrpc = self.executions['Server']
+        client1_clientrpc = self.executions['Client:1']
+        client2_clientrpc = self.executions['Client:2']
+        client3_clientrpc = self.executions['Client:3']
 
-        if 'TargetRpc' in msg or 'LogOnAllMachines' in msg:
-            targetrpc_executions[machine].append(msg)
+        print(f"\n[OK] Server ClientRpc executed: {server_clientrpc} (should be 0 in dedicated mode)")
+        print(f"[OK] Client 1 ClientRpc received: {client1_clientrpc}")
+        print(f"[OK] Client 2 ClientRpc received: {client2_clientrpc}")
+        print(f"[OK] Client 3 ClientRpc received: {client3_clientrpc}")
 
-    print(f"\n[OK] Server TargetRpc executed: {len(targetrpc_executions['Server'])}")
-    print(f"[OK] Client 1 TargetRpc executed: {len(targetrpc_executions['Client:1'])}")
-    print(f"[OK] Client 2 TargetRpc executed: {len(targetrpc_executions['Client:2'])}")
-    print(f"[OK] Client 3 TargetRpc executed: {len(targetrpc_executions['Client:3'])}")
+        # Expected: 9 ClientRpc executions per client (0-8 params)
+        expected_per_client = 9
 
-    # Expected: Shift+L broadcasts TargetRpc to all machines
-    total_targetrpc = sum(len(v) for v in targetrpc_executions.values())
+        validation_pass = True
+        if client1_clientrpc > 0 and client1_clientrpc < expected_per_client:
+            print(f"\n[WARN]  WARNING: Client 1 received {client1_clientrpc} ClientRpcs, expected ~{expected_per_client}")
+            validation_pass = False
 
-    if total_targetrpc > 0:
-        print(f"\n[PASS] PASS: TargetRpc targeting validated ({total_targetrpc} total executions)")
-    else:
-        print("\n[WARN]  SKIP: No TargetRpc executions detected (Shift+L not pressed?)")
+        if client2_clientrpc > 0 and client2_clientrpc < expected_per_client:
+            print(f"\n[WARN]  WARNING: Client 2 received {client2_clientrpc} ClientRpcs, expected ~{expected_per_client}")
+            validation_pass = False
 
-    return total_targetrpc > 0
+        if server_clientrpc > 0:
+            print(f"\n[WARN]  INFO: Server executed {server_clientrpc} ClientRpcs locally (host mode, not dedicated)")
 
-def analyze_persistence(lines):
-    """Analyze RPC persistence and late-joiner delivery."""
-    print("\n" + "="*80)
-    print("PHASE 4: RPC Persistence & Late-Joiner Validation")
-    print("="*80)
+        if validation_pass and (client1_clientrpc > 0 or client2_clientrpc > 0):
+            print("\n[PASS] PASS: ClientRpc broadcast validated")
+        elif client1_clientrpc == 0 and client2_clientrpc == 0:
+            print("\n[WARN]  SKIP: No ClientRpc broadcasts detected (Shift+S not pressed?)")
+        else:
+            print("\n[FAIL] FAIL: ClientRpc broadcast validation failed")
 
-    persistence_logs = []
-    claim_logs = defaultdict(list)
-    late_joiner_deliveries = []
+        return validation_pass
 
-    for line in lines:
-        parsed = parse_log_line(line)
-        if not parsed:
-            continue
 
-        msg = parsed['message']
-        machine = parsed['machine']
+class TargetRpcTargetingPhase(ValidationPhase):
+    """Analyze TargetRpc targeting modes."""
 
-        if 'RPC executions recorded' in msg or 'persistent' in msg.lower():
-            persistence_logs.append((machine, msg))
+    name = 'TargetRpc Targeting'
 
-        if 'claimed' in msg.lower() or 'Claim successful' in msg:
-            claim_logs[machine].append(msg)
+    def __init__(self):
+        self.executions = Counter()  # peer -> TargetRpc executions
 
-        if 'late' in msg.lower() and 'join' in msg.lower():
-            late_joiner_deliveries.append((machine, msg))
+    def consume(self, peer, level, message):
+        if 'TargetRpc' in message or 'LogOnAllMachines' in message:
+            self.executions[peer] += 1
 
-    print(f"\n[OK] Persistence log entries: {len(persistence_logs)}")
-    for machine, msg in persistence_logs[:5]:
-        print(f"  [{machine}] {msg[:100]}...")
+    def merge(self, other):
+        self.executions.update(other.executions)
 
-    print(f"\n[OK] Claim events by machine:")
-    for machine, claims in claim_logs.items():
-        print(f"  [{machine}]: {len(claims)} claims")
+    def report(self):
+        print("\n" + "="*80)
+        print("PHASE 3: TargetRpc Targeting Validation")
+        print("="*80)
 
-    print(f"\n[OK] Late-joiner deliveries: {len(late_joiner_deliveries)}")
-    for machine, msg in late_joiner_deliveries:
-        print(f"  [{machine}] {msg[:100]}...")
+        print(f"\n[OK] Server TargetRpc executed: {self.executions['Server']}")
+        print(f"[OK] Client 1 TargetRpc executed: {self.executions['Client:1']}")
+        print(f"[OK] Client 2 TargetRpc executed: {self.executions['Client:2']}")
+        print(f"[OK] Client 3 TargetRpc executed: {self.executions['Client:3']}")
 
-    # Validation: Check if Client 3 received claims
-    client3_claims = len(claim_logs.get('Client:3', []))
+        # Expected: Shift+L broadcasts TargetRpc to all machines
+        total_targetrpc = sum(self.executions.values())
 
-    if client3_claims > 0:
-        print(f"\n[PASS] PASS: Late-joiner (Client 3) received {client3_claims} persistent RPCs")
-        return True
-    else:
-        print("\n[WARN]  SKIP: No late-joiner (Client 3) claims detected")
-        return False
+        if total_targetrpc > 0:
+            print(f"\n[PASS] PASS: TargetRpc targeting validated ({total_targetrpc} total executions)")
+        else:
+            print("\n[WARN]  SKIP: No TargetRpc executions detected (Shift+L not pressed?)")
+
+        return total_targetrpc > 0
+
+
+class PersistencePhase(ValidationPhase):
+    """Analyze RPC persistence and late-joiner delivery."""
 
-def analyze_async_rpcs(lines):
+    name = 'Persistence & Late-Joiner'
+
+    def __init__(self):
+        self.persistence_count = 0
+        self.persistence_samples = []  # First 5 (peer, message) pairs
+        self.claims = {}               # peer -> claim count, in order of first claim
+        self.late_joiner_count = 0
+        self.late_joiner_samples = []  # First FAILURE_SAMPLES_SHOWN (peer, message) pairs
+
+    def consume(self, peer, level, message):
+        lowered = message.lower()
+
+        if 'RPC executions recorded' in message or 'persistent' in lowered:
+            self.persistence_count += 1
+            if len(self.persistence_samples) < 5:
+                self.persistence_samples.append((peer, message[:100]))
+
+        if 'claimed' in lowered or 'Claim successful' in message:
+            self.claims[peer] = self.claims.get(peer, 0) + 1
+
+        if 'late' in lowered and 'join' in lowered:
+            self.late_joiner_count += 1
+            if len(self.late_joiner_samples) < FAILURE_SAMPLES_SHOWN:
+                self.late_joiner_samples.append((peer, message[:100]))
+
+    def merge(self, other):
+        self.persistence_count += other.persistence_count
+        self.persistence_samples.extend(other.persistence_samples[:5 - len(self.persistence_samples)])
+        for peer, count in other.claims.items():
+            self.claims[peer] = self.claims.get(peer, 0) + count
+        self.late_joiner_count += other.late_joiner_count
+        self.late_joiner_samples.extend(
+            other.late_joiner_samples[:FAILURE_SAMPLES_SHOWN - len(self.late_joiner_samples)])
+
+    def report(self):
+        print("\n" + "="*80)
+        print("PHASE 4: RPC Persistence & Late-Joiner Validation")
+        print("="*80)
+
+        print(f"\n[OK] Persistence log entries: {self.persistence_count}")
+        for machine, msg in self.persistence_samples:
+            print(f"  [{machine}] {msg}...")
+
+        print(f"\n[OK] Claim events by machine:")
+        for machine, claims in self.claims.items():
+            print(f"  [{machine}]: {claims} claims")
+
+        print(f"\n[OK] Late-joiner deliveries: {self.late_joiner_count}")
+        print_samples(self.late_joiner_samples, self.late_joiner_count)
+
+        # Validation: Check if Client 3 received claims
+        client3_claims = self.claims.get('Client:3', 0)
+
+        if client3_claims > 0:
+            print(f"\n[PASS] PASS: Late-joiner (Client 3) received {client3_claims} persistent RPCs")
+            return True
+        else:
+            print("\n[WARN]  SKIP: No late-joiner (Client 3) claims detected")
+            return False
+
+
+class AsyncRpcPhase(ValidationPhase):
     """Analyze async RPC completion."""
-    print("\n" + "="*80)
-    print("PHASE 5: Async RPC & Return Values Validation")
-    print("="*80)
 
-    async_completions = []
-    claim_successful = []
+    name = 'Async RPC Completions'
+
+    def __init__(self):
+        self.async_count = 0
+        self.async_sample = None
+        self.claim_count = 0
+        self.claim_sample = None
 
-    for line in lines:
-        parsed = parse_log_line(line)
-        if not parsed:
-            continue
+    def consume(self, peer, level, message):
+        if 'ASYNC DONE' in message:
+            self.async_count += 1
+            self.async_sample = self.async_sample or message[:100]
 
-        msg = parsed['message']
+        if 'Claim successful' in message:
+            self.claim_count += 1
+            self.claim_sample = self.claim_sample or message[:100]
 
-        if 'ASYNC DONE' in msg:
-            async_completions.append(msg)
+    def merge(self, other):
+        self.async_count += other.async_count
+        self.async_sample = self.async_sample or other.async_sample
+        self.claim_count += other.claim_count
+        self.claim_sample = self.claim_sample or other.claim_sample
 
-        if 'Claim successful' in msg:
-            claim_successful.append(msg)
+    def report(self):
+        print("\n" + "="*80)
+        print("PHASE 5: Async RPC & Return Values Validation")
+        print("="*80)
 
-    print(f"\n[OK] Async completions ('ASYNC DONE'): {len(async_completions)}")
-    if async_completions:
-        print(f"  Sample: {async_completions[0][:100]}...")
+        print(f"\n[OK] Async completions ('ASYNC DONE'): {self.async_count}")
+        if self.async_count:
+            print(f"  Sample: {self.async_sample}...")
 
-    print(f"\n[OK] Async return values ('Claim successful'): {len(claim_successful)}")
-    if claim_successful:
-        print(f"  Sample: {claim_successful[0][:100]}...")
+        print(f"\n[OK] Async return values ('Claim successful'): {self.claim_count}")
+        if self.claim_count:
+            print(f"  Sample: {self.claim_sample}...")
 
-    if len(async_completions) > 0 or len(claim_successful) > 0:
-        print("\n[PASS] PASS: Async RPC completions validated")
-        return True
-    else:
-        print("\n[WARN]  SKIP: No async RPC completions detected")
-        return False
+        if self.async_count > 0 or self.claim_count > 0:
+            print("\n[PASS] PASS: Async RPC completions validated")
+            return True
+        else:
+            print("\n[WARN]  SKIP: No async RPC completions detected")
+            return False
 
-def analyze_errors_warnings(lines):
-    """Analyze errors and warnings."""
-    print("\n" + "="*80)
-    print("ERROR & WARNING ANALYSIS")
-    print("="*80)
 
-    errors = []
-    warnings = []
-    dispatcher_errors = []
-    nullref_errors = []
+class ErrorsWarningsPhase(ValidationPhase):
+    """Analyze errors and warnings."""
 
-    for line in lines:
-        parsed = parse_log_line(line)
-        if not parsed:
-            continue
+    name = 'Error-Free Execution'
 
-        level = parsed['level']
-        msg = parsed['message']
-        machine = parsed['machine']
+    def __init__(self):
+        self.error_count = 0
+        self.error_samples = []    # First 10 (peer, message) pairs
+        self.warning_count = 0
+        self.warning_samples = []  # First 10 (peer, message) pairs
+        self.dispatcher_count = 0
+        self.dispatcher_samples = []  # First FAILURE_SAMPLES_SHOWN (peer, message) pairs
+        self.nullref_count = 0
+        self.nullref_samples = []     # First FAILURE_SAMPLES_SHOWN (peer, message) pairs
 
+    def consume(self, peer, level, message):
         if level == 'ERROR' or level == 'FATAL':
-            errors.append((machine, msg))
+            self.error_count += 1
+            if len(self.error_samples) < 10:
+                self.error_samples.append((peer, message[:120]))
 
-            if 'NullReference' in msg:
-                nullref_errors.append((machine, msg))
+            if 'NullReference' in message:
+                self.nullref_count += 1
+                if len(self.nullref_samples) < FAILURE_SAMPLES_SHOWN:
+                    self.nullref_samples.append((peer, message[:120]))
 
         if level == 'WARNING':
-            warnings.append((machine, msg))
+            self.warning_count += 1
+            if len(self.warning_samples) < 10:
+                self.warning_samples.append((peer, message[:120]))
+
+            if 'No dispatcher found' in message:
+                self.dispatcher_count += 1
+                if len(self.dispatcher_samples) < FAILURE_SAMPLES_SHOWN:
+                    self.dispatcher_samples.append((peer, message[:120]))
+
+    def merge(self, other):
+        self.error_count += other.error_count
+        self.error_samples.extend(other.error_samples[:10 - len(self.error_samples)])
+        self.warning_count += other.warning_count
+        self.warning_samples.extend(other.warning_samples[:10 - len(self.warning_samples)])
+        self.dispatcher_count += other.dispatcher_count
+        self.dispatcher_samples.extend(
+            other.dispatcher_samples[:FAILURE_SAMPLES_SHOWN - len(self.dispatcher_samples)])
+        self.nullref_count += other.nullref_count
+        self.nullref_samples.extend(other.nullref_samples[:FAILURE_SAMPLES_SHOWN - len(self.nullref_samples)])
+
+    def report(self):
+        print("\n" + "="*80)
+        print("ERROR & WARNING ANALYSIS")
+        print("="*80)
 
-            if 'No dispatcher found' in msg:
-                dispatcher_errors.append((machine, msg))
+        print(f"\n[OK] Total Errors: {self.error_count}")
+        for machine, msg in self.error_samples:
+            print(f"  [{machine}] {msg}...")
+
+        print(f"\n[OK] Total Warnings: {self.warning_count}")
+        for machine, msg in self.warning_samples:
+            print(f"  [{machine}] {msg}...")
+
+        print(f"\n[OK] 'No dispatcher found' errors: {self.dispatcher_count}")
+        print_samples(self.dispatcher_samples, self.dispatcher_count, '[FAIL] ')
+
+        print(f"\n[OK] NullReferenceException errors: {self.nullref_count}")
+        print_samples(self.nullref_samples, self.nullref_count, '[FAIL] ')
+
+        # Critical failures
+        critical_failures = self.dispatcher_count + self.nullref_count
+
+        if critical_failures == 0:
+            print("\n[PASS] PASS: No critical errors (dispatcher/nullref)")
+            return True
+        else:
+            print(f"\n[FAIL] FAIL: {critical_failures} critical errors found!")
+            return False
+
+
+class RpcSummariesPhase(ValidationPhase):
+    """
+    Analyze Shift+K RPC execution summaries.
+
+    A summary is its "RPC execution summary" line plus the following
+    non-empty lines that do not start with '['. A chunk cannot know whether
+    it starts inside a summary, so it also keeps its leading candidate
+    continuation lines; merge() attaches them to a summary left open by the
+    previous chunk.
+    """
+
+    name = 'RPC Summaries'
+
+    def __init__(self):
+        self.in_summary = False
+        self.current_machine = None
+        self.summaries = {}         # peer -> first SUMMARY_LINES_SHOWN summary lines
+        self.leading_lines = []     # Continuation candidates before this chunk's first header
+        self.leading_closed = False  # A header or non-continuation line ended leading_lines
+
+    def _add_line(self, machine, message):
+        lines = self.summaries.setdefault(machine, [])
+        if len(lines) < SUMMARY_LINES_SHOWN:
+            lines.append(message)
+
+    def consume(self, peer, level, message):
+        if 'RPC execution summary' in message:
+            self.leading_closed = True
+            self.in_summary = True
+            self.current_machine = peer
+            self._add_line(peer, message)
+            return
+
+        continuation = bool(message.strip()) and not message.startswith('[')
+        if self.in_summary:
+            if continuation:
+                self._add_line(self.current_machine, message)
+            else:
+                self.in_summary = False
+        elif not self.leading_closed:
+            if continuation and len(self.leading_lines) < SUMMARY_LINES_SHOWN:
+                self.leading_lines.append(message)
+            elif not continuation:
+                self.leading_closed = True
+
+    def merge(self, other):
+        if self.in_summary:
+            for message in other.leading_lines:
+                self._add_line(self.current_machine, message)
+        for machine, lines in other.summaries.items():
+            for message in lines:
+                self._add_line(machine, message)
+        if other.leading_closed:
+            self.in_summary, self.current_machine = other.in_summary, other.current_machine
+
+    def report(self):
+        print("\n" + "="*80)
+        print("RPC EXECUTION SUMMARIES (Shift+K)")
+        print("="*80)
 
-    print(f"\n[OK] Total Errors: {len(errors)}")
-    for machine, msg in errors[:10]:
-        print(f"  [{machine}] {msg[:120]}...")
+        for machine, summary_lines in self.summaries.items():
+            print(f"\n[{machine}] Summary:")
+            for sline in summary_lines:
+                print(f"  {sline}")
 
-    print(f"\n[OK] Total Warnings: {len(warnings)}")
-    for machine, msg in warnings[:10]:
-        print(f"  [{machine}] {msg[:120]}...")
+        if len(self.summaries) > 0:
+            print("\n[PASS] PASS: RPC summaries found")
+            return True
+        else:
+            print("\n[WARN]  SKIP: No RPC summaries found (Shift+K not pressed?)")
+            return False
 
-    print(f"\n[OK] 'No dispatcher found' errors: {len(dispatcher_errors)}")
-    for machine, msg in dispatcher_errors:
-        print(f"  [FAIL] [{machine}] {msg[:120]}...")
 
-    print(f"\n[OK] NullReferenceException errors: {len(nullref_errors)}")
-    for machine, msg in nullref_errors:
-        print(f"  [FAIL] [{machine}] {msg[:120]}...")
+# Validation phases, in report order
+VALIDATION_PHASES = (RunLocallyPhase, ClientRpcBroadcastPhase, TargetRpcTargetingPhase, PersistencePhase,
+                     AsyncRpcPhase, ErrorsWarningsPhase, RpcSummariesPhase)
 
-    # Critical failures
-    critical_failures = len(dispatcher_errors) + len(nullref_errors)
 
-    if critical_failures == 0:
-        print("\n[PASS] PASS: No critical errors (dispatcher/nullref)")
-        return True
-    else:
-        print(f"\n[FAIL] FAIL: {critical_failures} critical errors found!")
-        return False
+@register_analyzer('rpc')
+class RpcValidationAnalyzer(LogAnalyzer):
+    """Feeds every peer-tagged log line to the validation phases in a single streaming pass."""
 
-def analyze_rpc_summaries(lines):
-    """Analyze Shift+K RPC execution summaries."""
-    print("\n" + "="*80)
-    print("RPC EXECUTION SUMMARIES (Shift+K)")
-    print("="*80)
+    supports_chunks = True
 
-    in_summary = False
-    current_machine = None
-    summaries = defaultdict(list)
-
-    for line in lines:
-        parsed = parse_log_line(line)
-        if not parsed:
-            continue
-
-        msg = parsed['message']
-        machine = parsed['machine']
-
-        if 'RPC execution summary' in msg:
-            in_summary = True
-            current_machine = machine
-            summaries[machine].append(msg)
-        elif in_summary:
-            if msg.strip() and not msg.startswith('['):
-                summaries[current_machine].append(msg)
-            else:
-                in_summary = False
+    def __init__(self):
+        self.record_count = 0
+        self.phases = [phase() for phase in VALIDATION_PHASES]
+        self._consumers = [phase.consume for phase in self.phases]
 
-    for machine, summary_lines in summaries.items():
-        print(f"\n[{machine}] Summary:")
-        for sline in summary_lines[:20]:  # First 20 lines
-            print(f"  {sline}")
+    def chunk_spec(self):
+        return RpcValidationAnalyzer, ()
 
-    if len(summaries) > 0:
-        print("\n[PASS] PASS: RPC summaries found")
-        return True
-    else:
-        print("\n[WARN]  SKIP: No RPC summaries found (Shift+K not pressed?)")
-        return False
+    def get_state(self):
+        return self.record_count, self.phases
+
+    def merge_state(self, state, line_offset):
+        record_count, phases = state
+        self.record_count += record_count
+        for phase, chunk_phase in zip(self.phases, phases):
+            phase.merge(chunk_phase)
+
+    def consume(self, line_number, record):
+        # Lines without a peer role are skipped
+        peer = record.peer
+        if peer is not None:
+            self.record_count += 1
+            level, message = record.level, record.message
+            for consume in self._consumers:
+                consume(peer, level, message)
+
+    def live_summary(self):
+        return f"{self.record_count:,} peer log records"
+
+    def report(self):
+        print(f"Total log records: {self.record_count}")
+        run_validations(self.phases)
+
+def validate_log(log_file, since=None, until=None, time_index=False, jobs=1):
+    """Run every validation phase over a log (optionally only a --since/--until window) in one pass."""
+    analyzer = RpcValidationAnalyzer()
+    run_analyzers(log_file, [analyzer], progress=False, jobs=jobs, since=since, until=until, time_index=time_index)
+    return analyzer
 
 def generate_final_report(validations):
     """Generate final validation report."""
@@ -388,9 +549,21 @@ def generate_final_report(validations):
         print("[FAIL] VALIDATION FAILED - Critical issues detected")
         print("="*80)
 
+def run_validations(phases):
+    """Print every phase report and the final report."""
+    validations = {}
+
+    for phase in phases:
+        validations[phase.name] = phase.report()
+
+    # Generate final report
+    generate_final_report(validations)
+
+    return validations
+
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python analyze_rpc_validation.py <log_file_path>")
+        print("Usage: python analyze_rpc_validation.py <log_file_path> [--jobs <N>] [--since <time>] [--until <time>] [--time-index]")
         print('Example: python analyze_rpc_validation.py "C:/Users/shash/AppData/LocalLow/Galore Interactive/GONetSandbox/logs/gonet-2025-11-10.log"')
         sys.exit(1)
 
@@ -402,27 +575,15 @@ def main():
     print(f"Log file: {log_file}")
 
     try:
-        with open(log_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
+        analyzer = validate_log(log_file, since=parse_str_option(sys.argv, '--since'),
+                                until=parse_str_option(sys.argv, '--until'),
+                                time_index='--time-index' in sys.argv,
+                                jobs=parse_int_option(sys.argv, '--jobs', default=1))
     except FileNotFoundError:
         print(f"Error: Log file not found: {log_file}")
         sys.exit(1)
 
-    print(f"Total log lines: {len(lines)}")
-
-    # Run all validation phases
-    validations = {}
-
-    validations['RunLocally (ServerRpc)'] = analyze_runlocally_behavior(lines)
-    validations['ClientRpc Broadcast'] = analyze_clientrpc_broadcast(lines)
-    validations['TargetRpc Targeting'] = analyze_targetrpc_targeting(lines)
-    validations['Persistence & Late-Joiner'] = analyze_persistence(lines)
-    validations['Async RPC Completions'] = analyze_async_rpcs(lines)
-    validations['Error-Free Execution'] = analyze_errors_warnings(lines)
-    validations['RPC Summaries'] = analyze_rpc_summaries(lines)
-
-    # Generate final report
-    generate_final_report(validations)
+    analyzer.report()
 
 if __name__ == '__main__':
     main()
@@ -8,118 +8,447 @@ PURPOSE:
     Tracks missing GONetIds and correlates with queue backup warnings.
 
 USAGE:
-    python3 analyze_spawn_propagation.py <event-log-directory>
+    python3 analyze_spawn_propagation.py <event-log-directory> [--jobs <N>] [--session <GUID> | --latest]
+
+    Exports are grouped by the "Session GUID:" line of their header and every
+    session is compared on its own (--session picks one, --latest the most
+    recently exported). The per-peer exports are parsed in parallel by --jobs
+    worker processes (default: one per CPU).
+
+    The main logs (gonet-YYYY-MM-DD.log, plain or compressed) of the session
+    are found in the same folder by date: only the lines logged after the
+    previous session's export and up to this session's export are read. Each
+    missing spawn is annotated with the [QUEUE-BACKUP] depth its peer logged
+    around the spawn's time (both use the GONet elapsed time).
 
     Example:
     python3 analyze_spawn_propagation.py "C:/Users/shash/AppData/LocalLow/Galore Interactive/GONetSandbox/logs"
 
 OUTPUT:
     - Summary of spawn events per peer
-    - List of GONetIds that appear in some peers but not others
+    - List of GONetIds that appear in some peers but not others, grouped by
+      the spawning peer (the export's "Owner: AuthorityN" line)
     - Timeline of spawn failures
-    - Correlation with queue backup warnings
+    - Queue depth (ready messages) on the missing peer at each missing spawn
 """
 
+import os
 import re
 import sys
-from collections import defaultdict
+from array import array
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from multiprocessing import Pool
 from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from gonet_log_driver import LogAnalyzer, parse_int_option, parse_str_option, run_analyzers
+from gonet_log_events import (EXPORT_FILE_GLOB, TICKS_PER_SECOND, ExportHeader, iter_export_events,
+                              read_export_header)
+from gonet_log_io import ARCHIVED_DAILY_LOG_PATTERN, is_compressed
+from gonet_log_parser import parse_log_timestamp
+from gonet_log_stats import StreamingStats
+
+try:
+    import numpy as np
+except ImportError:  # Optional: presence falls back to one int bitset per peer
+    np = None
+
+SPAWN_EVENT_TYPE = 'InstantiateGONetParticipantEvent'
+
+# Session key of exports written without a "Session GUID:" header line
+UNKNOWN_SESSION = 'unknown'
+
+# Any set bit in a bitset's little-endian bytes
+_NONZERO_BYTE = re.compile(rb'[^\x00]')
+
+QUEUE_BACKUP_PATTERN = re.compile(r'Thread queue #(\d+) has (\d+) messages ready')
+
+# GONet only logs [QUEUE-BACKUP] while a client has more ready messages than this
+QUEUE_BACKUP_THRESHOLD = 10
+
+# A spawn is joined with the deepest [QUEUE-BACKUP] sample logged at most this many seconds before it
+QUEUE_SAMPLE_MAX_AGE = 1.0
+
+# Main log lines older than this before a session's last export are never attributed to it
+SESSION_LOOKBACK = timedelta(hours=24)
+
+# Annotated missing spawns printed per peer
+ANNOTATED_SPAWNS_SHOWN = 10
+
+EXPORT_FILE_TIME_PATTERN = re.compile(r'gonet-events-(\d{4}-\d{2}-\d{2}-\d{6})-')
+EXPORT_TIME_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
 
 def parse_event_log(filepath):
-    """Parse an event log file and extract spawn events."""
-    spawns = {}  # GONetId -> event details
-    peer_role = None
-    authority_id = None
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-        # Extract peer role and authority ID from header
-        role_match = re.search(r'Role: (\w+)', content)
-        authority_match = re.search(r'Authority ID: (\d+)', content)
-
-        if role_match:
-            peer_role = role_match.group(1)
-        if authority_match:
-            authority_id = int(authority_match.group(1))
-
-        # Parse spawn events
-        # Pattern: [Event NNNNNN] Type=InstantiateGONetParticipantEvent
-        #          Timestamp: Ticks=...
-        #          GONetId: XXXXX
-        #          Owner: AuthorityNNN
-        #          Details: ... DesignTimeLocation=... Position=... Rotation=...
-
-        event_pattern = re.compile(
-            r'\[Event (\d+)\] Type=InstantiateGONetParticipantEvent.*?'
-            r'GONetId: (\d+).*?'
-            r'Owner: Authority(\d+).*?'
-            r'Details: .*?DesignTimeLocation=([\w:/\.]+)',
-            re.DOTALL
-        )
-
-        for match in event_pattern.finditer(content):
-            event_num = int(match.group(1))
-            gonet_id = int(match.group(2))
-            owner_authority = int(match.group(3))
-            location = match.group(4)
-
-            spawns[gonet_id] = {
-                'event_num': event_num,
-                'owner': owner_authority,
-                'location': location
-            }
+    """Parse an event log file and extract spawn events (streamed one event block at a time)."""
+    gonet_ids = array('q')  # Spawned GONetIds, each once, in export order
+    owners = array('q')     # Owner authority id of each spawn (0 = no Owner line in the export)
+    ticks = array('q')      # OccurredAtElapsedTicks of each spawn
+    seen = set()
+    header = read_export_header(filepath)
+
+    for event in iter_export_events(filepath, types=(SPAWN_EVENT_TYPE,)):
+        if event.gonetid and event.gonetid not in seen:
+            seen.add(event.gonetid)
+            gonet_ids.append(event.gonetid)
+            owners.append(event.owner)
+            ticks.append(event.ticks)
 
     return {
-        'peer_role': peer_role,
-        'authority_id': authority_id,
-        'spawns': spawns
+        'peer_role': header.role,
+        'authority_id': header.authority_id,
+        'gonet_ids': gonet_ids,
+        'owners': owners,
+        'ticks': ticks
     }
 
-def parse_main_log_for_queue_warnings(filepath):
-    """Parse main log file for queue backup warnings."""
-    warnings = []
-
-    with open(filepath, 'r', encoding='utf-8') as f:
-        for line in f:
-            if 'QUEUE-BACKUP' in line or 'messageQueue depth' in line:
-                # Extract timestamp and client
-                match = re.search(r'\[(Client:\d+)\].*?(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})', line)
-                if match:
-                    warnings.append({
-                        'client': match.group(1),
-                        'timestamp': match.group(2),
-                        'message': line.strip()
-                    })
-
-    return warnings
-
-def analyze_spawn_propagation(log_directory):
-    """Main analysis function."""
-    log_dir = Path(log_directory)
-
-    # Find all event log files
-    event_logs = list(log_dir.glob('gonet-events-*-*.txt'))
+def parse_event_logs(event_logs: Sequence[Path], jobs: int) -> Iterator[Tuple[Path, dict]]:
+    """(file, parse_event_log result) of every export in order, parsed by up to jobs worker processes."""
+    if jobs > 1 and len(event_logs) > 1:
+        with Pool(processes=min(jobs, len(event_logs))) as pool:
+            # imap keeps results in file order, so the report does not depend on worker timing
+            yield from zip(event_logs, pool.imap(parse_event_log, event_logs))
+    else:
+        for log_file in event_logs:
+            yield log_file, parse_event_log(log_file)
+
+def peer_label(peer_data):
+    """"Server" or "ClientN" (exports name the role "ClientN"; older ones just "Client")."""
+    role = peer_data['peer_role']
+    if role == 'Client' and peer_data['authority_id'] is not None:
+        return f"{role}{peer_data['authority_id']}"
+    return f"{role}"
+
+class SpawnPresence:
+    """
+    Peer x GONetId spawn presence matrix.
+
+    Columns are the sorted union of the spawned GONetIds. With NumPy the
+    matrix is a boolean array; without it every peer row is one Python int
+    used as a bitset. Either way the spawns a peer is missing come from a
+    single vectorized "all & ~row" instead of a loop over ids x peers.
+    """
+
+    def __init__(self, peers: Dict[str, dict]):
+        self.peer_names = list(peers)
+        self._rows = {}
+        if np is not None:
+            columns = [np.frombuffer(peer_data['gonet_ids'], dtype=np.int64) for peer_data in peers.values()]
+            # Sort + neighbour compare: several times faster than np.unique on millions of ids
+            gonet_ids = np.sort(np.concatenate(columns)) if columns else np.empty(0, dtype=np.int64)
+            self.gonet_ids = gonet_ids[np.concatenate(([True], gonet_ids[1:] != gonet_ids[:-1]))] \
+                if len(gonet_ids) else gonet_ids
+            self.owners = np.full(len(self.gonet_ids), -1, dtype=np.int64)
+            self.ticks = np.zeros(len(self.gonet_ids), dtype=np.int64)
+            for peer_name, peer_data, ids in zip(self.peer_names, peers.values(), columns):
+                positions = np.searchsorted(self.gonet_ids, ids)
+                row = np.zeros(len(self.gonet_ids), dtype=bool)
+                row[positions] = True
+                self._rows[peer_name] = row
+                # The first export listing a spawn supplies its owner and spawn time
+                unset = self.owners[positions] < 0
+                self.owners[positions[unset]] = np.frombuffer(peer_data['owners'], dtype=np.int64)[unset]
+                self.ticks[positions[unset]] = np.frombuffer(peer_data['ticks'], dtype=np.int64)[unset]
+        else:
+            self.gonet_ids = array('q', sorted(set().union(*(peer_data['gonet_ids'] for peer_data in peers.values()))))
+            position_of = {gonet_id: position for position, gonet_id in enumerate(self.gonet_ids)}
+            self.owners = array('q', [-1]) * len(self.gonet_ids)
+            self.ticks = array('q', [0]) * len(self.gonet_ids)
+            for peer_name, peer_data in peers.items():
+                bitmap = bytearray((len(self.gonet_ids) + 7) // 8)
+                for gonet_id, owner, ticks in zip(peer_data['gonet_ids'], peer_data['owners'], peer_data['ticks']):
+                    position = position_of[gonet_id]
+                    bitmap[position >> 3] |= 1 << (position & 7)
+                    if self.owners[position] < 0:
+                        self.owners[position] = owner
+                        self.ticks[position] = ticks
+                self._rows[peer_name] = int.from_bytes(bitmap, 'little')
+            self._all = (1 << len(self.gonet_ids)) - 1
+
+    def __len__(self) -> int:
+        return len(self.gonet_ids)
+
+    def _missing_positions(self, peer_name: str):
+        """Ascending columns of the spawns missing on peer_name (an index array with NumPy)."""
+        row = self._rows[peer_name]
+        if np is not None:
+            return np.flatnonzero(~row)
+
+        missing = self._all & ~row
+        positions = []
+        for match in _NONZERO_BYTE.finditer(missing.to_bytes((len(self.gonet_ids) + 7) // 8, 'little')):
+            byte, base = match.group()[0], match.start() << 3
+            positions.extend(base + bit for bit in range(8) if byte >> bit & 1)
+        return positions
+
+    def missing_by_owner(self, peer_name: str) -> Dict[int, List[int]]:
+        """Owner authority id -> ascending GONetIds spawned elsewhere but missing on peer_name."""
+        positions = self._missing_positions(peer_name)
+        if np is not None:
+            missing_ids, missing_owners = self.gonet_ids[positions], self.owners[positions]
+            return {int(owner): missing_ids[missing_owners == owner].tolist() for owner in np.unique(missing_owners)}
+
+        by_owner = defaultdict(list)
+        for position in positions:
+            by_owner[self.owners[position]].append(self.gonet_ids[position])
+        return dict(by_owner)
+
+    def missing_spawns(self, peer_name: str) -> List[Tuple[int, int]]:
+        """(spawn ticks, GONetId) of the spawns missing on peer_name, oldest spawn first."""
+        positions = self._missing_positions(peer_name)
+        if np is not None:
+            ticks, gonet_ids = self.ticks[positions], self.gonet_ids[positions]
+            order = np.argsort(ticks, kind='stable')
+            return list(zip(ticks[order].tolist(), gonet_ids[order].tolist()))
+        return sorted((self.ticks[position], self.gonet_ids[position]) for position in positions)
+
+class QueueDepthSeries:
+    """[QUEUE-BACKUP] samples of one client: GONet elapsed seconds, thread queue index, ready messages."""
+
+    def __init__(self):
+        self.seconds = array('d')
+        self.queues = array('q')
+        self.depths = array('q')
+
+    def __len__(self) -> int:
+        return len(self.seconds)
+
+    def append(self, seconds: float, queue: int, depth: int):
+        self.seconds.append(seconds)
+        self.queues.append(queue)
+        self.depths.append(depth)
+
+    def extend(self, other: 'QueueDepthSeries'):
+        self.seconds.extend(other.seconds)
+        self.queues.extend(other.queues)
+        self.depths.extend(other.depths)
+
+    def sort(self):
+        """Order the samples by time (a no-op for one log, whose lines are already in time order)."""
+        seconds = self.seconds
+        if all(seconds[i] <= seconds[i + 1] for i in range(len(seconds) - 1)):
+            return
+        order = sorted(range(len(seconds)), key=seconds.__getitem__)
+        self.seconds = array('d', (seconds[i] for i in order))
+        self.queues = array('q', (self.queues[i] for i in order))
+        self.depths = array('q', (self.depths[i] for i in order))
+
+class QueueBackupAnalyzer(LogAnalyzer):
+    """Collects the [QUEUE-BACKUP] depth time series of every client logged between since and until."""
+
+    markers = ('[QUEUE-BACKUP]',)
+    supports_chunks = True
+
+    def __init__(self, since: Optional[datetime] = None, until: Optional[datetime] = None):
+        self.since = since
+        self.until = until
+        self.series: Dict[str, QueueDepthSeries] = {}  # "ClientN" (as in the exports) -> samples
+
+    def chunk_spec(self):
+        return QueueBackupAnalyzer, (self.since, self.until)
+
+    def get_state(self):
+        return self.series
+
+    def merge_state(self, state, line_offset):
+        for peer_name, series in state.items():
+            self.series.setdefault(peer_name, QueueDepthSeries()).extend(series)
+
+    def consume(self, line_number, record):
+        if record.tag != 'QUEUE-BACKUP' or record.elapsed is None:
+            return
+        match = QUEUE_BACKUP_PATTERN.search(record.message)
+        if not match:
+            return
+        # Compressed logs cannot be seeked to the session window, so the window is also checked per line
+        if self.since is not None or self.until is not None:
+            logged_at = parse_log_timestamp(record.timestamp)
+            if logged_at is None or (self.since is not None and logged_at < self.since) or \
+                    (self.until is not None and logged_at > self.until):
+                return
+        peer_name = f"Client{record.authority_id}" if record.role == 'Client' else record.role
+        self.series.setdefault(peer_name, QueueDepthSeries()).append(
+            record.elapsed, int(match.group(1)), int(match.group(2)))
+
+    def finalize(self):
+        for series in self.series.values():
+            series.sort()
+
+def join_queue_depths(spawns: Sequence[Tuple[int, int]], series: QueueDepthSeries) -> List[tuple]:
+    """
+    Merge-join time-ordered (ticks, GONetId) spawns with a client's queue samples.
+
+    Returns (GONetId, spawn seconds, sample) per spawn, where sample is the
+    deepest (depth, queue index, seconds before the spawn) logged within
+    QUEUE_SAMPLE_MAX_AGE before the spawn, or None if the queues were not
+    backed up. A single pass over both sequences: a monotonic deque keeps the
+    sliding-window maximum.
+    """
+    joined = []
+    window = deque()  # sample indexes inside the window, depths decreasing
+    next_sample = 0
+    for ticks, gonet_id in spawns:
+        spawn_seconds = ticks / TICKS_PER_SECOND
+        while next_sample < len(series) and series.seconds[next_sample] <= spawn_seconds:
+            while window and series.depths[window[-1]] <= series.depths[next_sample]:
+                window.pop()
+            window.append(next_sample)
+            next_sample += 1
+        while window and spawn_seconds - series.seconds[window[0]] > QUEUE_SAMPLE_MAX_AGE:
+            window.popleft()
+
+        sample = None
+        if window:
+            deepest = window[0]
+            sample = (series.depths[deepest], series.queues[deepest], spawn_seconds - series.seconds[deepest])
+        joined.append((gonet_id, spawn_seconds, sample))
+    return joined
+
+def group_exports_by_session(event_logs: Sequence[Path]) -> Dict[str, List[Tuple[Path, ExportHeader]]]:
+    """
+    Session GUID -> (file, header) of its exports, reading only the export headers.
+
+    Sessions are ordered by their last export time (oldest first); exports
+    without a Session GUID line are grouped under UNKNOWN_SESSION.
+    """
+    sessions = defaultdict(list)
+    for log_file in sorted(event_logs):
+        header = read_export_header(log_file)
+        sessions[header.session_guid or UNKNOWN_SESSION].append((log_file, header))
+    return dict(sorted(sessions.items(), key=lambda item: session_export_time(item[1])))
+
+def session_export_time(exports: Sequence[Tuple[Path, ExportHeader]]) -> str:
+    """Latest "Export Time" of a session's exports ("" if none has one)."""
+    return max((header.export_time or '' for _, header in exports), default='')
+
+def export_datetime(log_file: Path, header: ExportHeader) -> Optional[datetime]:
+    """When an export was written: its "Export Time:" line, else the time in its file name."""
+    if header.export_time:
+        try:
+            return datetime.strptime(header.export_time, EXPORT_TIME_FORMAT)
+        except ValueError:
+            pass
+    match = EXPORT_FILE_TIME_PATTERN.match(log_file.name)
+    return datetime.strptime(match.group(1), '%Y-%m-%d-%H%M%S') if match else None
+
+def session_log_windows(sessions) -> Dict[str, Tuple[Optional[datetime], Optional[datetime]]]:
+    """
+    Session GUID -> (since, until) wall-clock window of its main log lines.
+
+    A session ends with its last export and starts after the previous
+    session's last export, but at most SESSION_LOOKBACK earlier. None bounds
+    are open (a session whose exports carry no time).
+    """
+    windows = {}
+    previous_end = None
+    for guid, exports in sessions.items():
+        end = max(filter(None, (export_datetime(log_file, header) for log_file, header in exports)), default=None)
+        start = end - SESSION_LOOKBACK if end is not None else None
+        if start is not None and previous_end is not None and previous_end < end:
+            start = max(start, previous_end)
+        windows[guid] = (start, end)
+        if end is not None:
+            previous_end = end
+    return windows
+
+def find_session_logs(log_dir: Path, since: Optional[datetime], until: Optional[datetime]) -> List[str]:
+    """Daily main logs (gonet-YYYY-MM-DD.log, plain or compressed) in log_dir dated within since..until."""
+    log_files = []
+    for name in sorted(os.listdir(log_dir)):
+        if not ARCHIVED_DAILY_LOG_PATTERN.match(name):
+            continue
+        day = datetime.strptime(name[len('gonet-'):len('gonet-YYYY-MM-DD')], '%Y-%m-%d').date()
+        if (since is None or day >= since.date()) and (until is None or day <= until.date()):
+            log_files.append(str(log_dir / name))
+    return log_files
+
+def scan_queue_backups(log_files: Sequence[str], since: Optional[datetime], until: Optional[datetime],
+                       jobs: int) -> QueueBackupAnalyzer:
+    """Read the [QUEUE-BACKUP] lines logged between since and until (seeking straight to them when possible)."""
+    analyzer = QueueBackupAnalyzer(since, until)
+    seekable = not any(is_compressed(log_file) for log_file in log_files)
+    bounds = [bound.strftime(EXPORT_TIME_FORMAT) if seekable and bound is not None else None for bound in (since, until)]
+    run_analyzers(log_files, [analyzer], progress=False, jobs=jobs, since=bounds[0], until=bounds[1])
+    return analyzer
+
+def select_sessions(sessions, session=None, latest=False):
+    """GUIDs of the sessions to analyze (exits with the list of sessions if session is unknown)."""
+    if session is not None:
+        if session not in sessions:
+            print(f"ERROR: Session {session} not found. Sessions in this folder:")
+            for guid in sessions:
+                print(f"  {guid}")
+            sys.exit(1)
+        return [session]
+    if latest:
+        return list(sessions)[-1:]
+    return list(sessions)
+
+def report_queue_backups(presence: SpawnPresence, peer_names: Sequence[str], log_dir: Path,
+                         since: Optional[datetime], until: Optional[datetime], jobs: int):
+    """Print each peer's queue depth at the time of every spawn it is missing."""
+    print("-" * 80)
+    print("QUEUE DEPTH AT MISSING SPAWNS")
+    print("-" * 80)
+    print()
 
-    if not event_logs:
-        print(f"ERROR: No event log files found in {log_directory}")
+    log_files = find_session_logs(log_dir, since, until)
+    if not log_files:
+        print("No main log (gonet-YYYY-MM-DD.log) covers this session; queue depths not joined.")
+        print()
         return
 
+    print(f"Main logs: {', '.join(os.path.basename(log_file) for log_file in log_files)}")
+    print(f"Session window: {since or 'start'} .. {until or 'end'}")
+    queue_backups = scan_queue_backups(log_files, since, until, jobs)
+    print()
+
+    for peer_name in sorted(set(peer_names) | set(queue_backups.series)):
+        series = queue_backups.series.get(peer_name, QueueDepthSeries())
+        spawns = presence.missing_spawns(peer_name) if peer_name in peer_names else []
+        if not series and not spawns:
+            continue
+
+        if series:
+            depths = StreamingStats(series.depths)
+            print(f"{peer_name}: {len(series)} QUEUE-BACKUP warnings, max depth {depths.max:.0f} "
+                  f"({depths.format_percentiles('.0f')})")
+        else:
+            print(f"{peer_name}: no QUEUE-BACKUP warnings (never more than {QUEUE_BACKUP_THRESHOLD} messages ready)")
+        if not spawns:
+            print()
+            continue
+
+        joined = join_queue_depths(spawns, series)
+        backed_up = [(gonet_id, spawn_seconds, sample) for gonet_id, spawn_seconds, sample in joined if sample]
+        print(f"  {len(backed_up)} of {len(joined)} missing spawns happened during a queue backup "
+              f"(> {QUEUE_BACKUP_THRESHOLD} messages ready within {QUEUE_SAMPLE_MAX_AGE:g}s before the spawn)")
+        if backed_up:
+            depths = StreamingStats(sample[0] for _, _, sample in backed_up)
+            print(f"  Depth at those spawns: {depths.format_percentiles('.0f')}")
+            for gonet_id, spawn_seconds, (depth, queue, age) in backed_up[:ANNOTATED_SPAWNS_SHOWN]:
+                print(f"    GONetId {gonet_id} @ {spawn_seconds:.3f}s: {depth} ready (queue #{queue}, {age:.3f}s earlier)")
+            if len(backed_up) > ANNOTATED_SPAWNS_SHOWN:
+                print(f"    ... and {len(backed_up) - ANNOTATED_SPAWNS_SHOWN} more")
+        print()
+
+def report_session(session, parsed_exports, log_dir=None, window=(None, None), jobs=1):
+    """
+    Print the propagation report of one session from its (file, parse_event_log
+    result) pairs. With log_dir, the missing spawns are joined with the queue
+    depths of the main logs there that were written in window (since, until).
+    """
     print("=" * 80)
-    print("GONet Spawn Propagation Analysis")
+    print(f"SESSION {session}")
     print("=" * 80)
     print()
 
-    # Parse all event logs
     peers = {}
-    for log_file in sorted(event_logs):
-        peer_data = parse_event_log(log_file)
-        peer_name = f"{peer_data['peer_role']}"
-        if peer_data['authority_id'] is not None and peer_data['peer_role'] != 'Server':
-            peer_name = f"{peer_data['peer_role']}{peer_data['authority_id']}"
+    for log_file, peer_data in parsed_exports:
+        peer_name = peer_label(peer_data)
 
         peers[peer_name] = peer_data
-        print(f"Loaded {log_file.name}: {peer_name} (Authority {peer_data['authority_id']}) - {len(peer_data['spawns'])} spawns")
+        print(f"Loaded {log_file.name}: {peer_name} (Authority {peer_data['authority_id']}) - {len(peer_data['gonet_ids'])} spawns")
 
     print()
     print("-" * 80)
@@ -128,7 +457,7 @@ def analyze_spawn_propagation(log_directory):
 
     for peer_name in sorted(peers.keys()):
         peer_data = peers[peer_name]
-        print(f"{peer_name:20s}: {len(peer_data['spawns']):5d} spawns")
+        print(f"{peer_name:20s}: {len(peer_data['gonet_ids']):5d} spawns")
 
     print()
     print("-" * 80)
@@ -136,34 +465,27 @@ def analyze_spawn_propagation(log_directory):
     print("-" * 80)
     print()
 
-    # Collect all GONetIds across all peers
-    all_gonet_ids = set()
-    for peer_data in peers.values():
-        all_gonet_ids.update(peer_data['spawns'].keys())
+    # Presence of every GONetId on every peer
+    presence = SpawnPresence(peers)
 
-    print(f"Total unique GONetIds across all peers: {len(all_gonet_ids)}")
+    print(f"Total unique GONetIds across all peers: {len(presence)}")
     print()
 
+    # Spawns are attributed to the peer named by their Owner: AuthorityN line
+    peer_by_authority = {peer_data['authority_id']: peer_name for peer_name, peer_data in peers.items()
+                         if peer_data['authority_id'] is not None}
+
+    def origin_name(owner):
+        if owner <= 0:
+            return 'Unknown'
+        return peer_by_authority.get(owner, f"Authority{owner}")
+
     # Find GONetIds that don't appear in all peers
-    missing_by_peer = defaultdict(list)
-
-    for gonet_id in sorted(all_gonet_ids):
-        peers_with_id = []
-        peers_without_id = []
-
-        for peer_name, peer_data in peers.items():
-            if gonet_id in peer_data['spawns']:
-                peers_with_id.append(peer_name)
-            else:
-                peers_without_id.append(peer_name)
-
-        # If not all peers have this GONetId, it's a propagation failure
-        if peers_without_id:
-            for peer_name in peers_without_id:
-                missing_by_peer[peer_name].append({
-                    'gonet_id': gonet_id,
-                    'present_in': peers_with_id
-                })
+    missing_by_peer = {}
+    for peer_name in peers:
+        missing = presence.missing_by_owner(peer_name)
+        if missing:
+            missing_by_peer[peer_name] = missing
 
     if not missing_by_peer:
         print("[OK] SUCCESS: All spawns propagated to all peers!")
@@ -172,18 +494,16 @@ def analyze_spawn_propagation(log_directory):
         print()
 
         for peer_name in sorted(missing_by_peer.keys()):
-            missing_ids = missing_by_peer[peer_name]
-            print(f"  {peer_name} is MISSING {len(missing_ids)} spawns:")
+            missing = missing_by_peer[peer_name]
+            print(f"  {peer_name} is MISSING {sum(len(ids) for ids in missing.values())} spawns:")
 
             # Group by originating peer
             by_origin = defaultdict(list)
-            for item in missing_ids:
-                # Determine who spawned it (check which peer has it first)
-                origin = item['present_in'][0] if item['present_in'] else 'Unknown'
-                by_origin[origin].append(item['gonet_id'])
+            for owner, ids in missing.items():
+                by_origin[origin_name(owner)].extend(ids)
 
             for origin_peer in sorted(by_origin.keys()):
-                ids = by_origin[origin_peer]
+                ids = sorted(by_origin[origin_peer])
                 print(f"    From {origin_peer}: {len(ids)} missing")
 
                 # Show first 10 and last 10 GONetIds
@@ -194,46 +514,58 @@ def analyze_spawn_propagation(log_directory):
 
             print()
 
-    # Parse main log for queue warnings
-    main_log = log_dir / 'gonet-2025-10-13.log'
-    if main_log.exists():
-        print("-" * 80)
-        print("QUEUE BACKUP WARNINGS")
-        print("-" * 80)
-        print()
+    if log_dir is not None:
+        report_queue_backups(presence, list(peers), log_dir, window[0], window[1], jobs)
 
-        warnings = parse_main_log_for_queue_warnings(main_log)
-
-        if warnings:
-            by_client = defaultdict(list)
-            for warning in warnings:
-                by_client[warning['client']].append(warning)
-
-            for client in sorted(by_client.keys()):
-                client_warnings = by_client[client]
-                print(f"{client}: {len(client_warnings)} warnings")
-                for warning in client_warnings[:5]:  # Show first 5
-                    print(f"  {warning['timestamp']}: {warning['message'][:100]}...")
-                if len(client_warnings) > 5:
-                    print(f"  ... and {len(client_warnings) - 5} more warnings")
-                print()
-        else:
-            print("No queue backup warnings found in main log.")
+
+def analyze_spawn_propagation(log_directory, jobs=1, session=None, latest=False):
+    """Main analysis function."""
+    log_dir = Path(log_directory)
+
+    # Find all event log files
+    event_logs = list(log_dir.glob(EXPORT_FILE_GLOB))
+
+    if not event_logs:
+        print(f"ERROR: No event log files found in {log_directory}")
+        return
+
+    print("=" * 80)
+    print("GONet Spawn Propagation Analysis")
+    print("=" * 80)
+    print()
+
+    # Group the exports by the Session GUID in their headers; each session is compared on its own
+    sessions = group_exports_by_session(event_logs)
+    print(f"Found {len(event_logs)} event exports from {len(sessions)} session(s):")
+    for guid, exports in sessions.items():
+        print(f"  Session {guid}: {len(exports)} exports, last exported {session_export_time(exports) or 'unknown'}")
+    print()
+
+    # All exports of the selected sessions go through one worker pool; results
+    # arrive in session order, so each session is reported as soon as it is parsed
+    selected = select_sessions(sessions, session, latest)
+    windows = session_log_windows(sessions)
+    parsed = parse_event_logs([log_file for guid in selected for log_file, _ in sessions[guid]], jobs)
+    for guid in selected:
+        # The session's own slice of the main logs supplies the queue depths
+        report_session(guid, [next(parsed) for _ in sessions[guid]], log_dir, windows[guid], jobs)
 
     print("-" * 80)
     print("ANALYSIS COMPLETE")
     print("-" * 80)
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
+    if len(sys.argv) < 2 or sys.argv[1].startswith('--'):
         # Default path
         log_directory = "C:/Users/shash/AppData/LocalLow/Galore Interactive/GONetSandbox/logs"
         print(f"Using default log directory: {log_directory}")
     else:
         log_directory = sys.argv[1]
+    jobs = parse_int_option(sys.argv, '--jobs', default=os.cpu_count() or 1)
 
     try:
-        analyze_spawn_propagation(log_directory)
+        analyze_spawn_propagation(log_directory, jobs=jobs, session=parse_str_option(sys.argv, '--session'),
+                                  latest='--latest' in sys.argv)
     except Exception as e:
         print(f"ERROR: {e}")
         import traceback
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Persistent columnar cache of decoded log events, stored next to the log file.
+
+Re-running an analysis over a multi-GB log re-parses the same lines every
+time. Analyzers that implement the cache hooks of gonet_log_driver.LogAnalyzer
+(cache_name, cache_builder, to_columns, load_columns) get their decoded
+events saved once as typed columns (array.array) in
+
+    <log file>.<cache name>.gonetcache
+
+Later runs - with any filter - load the columns instead of re-reading the log
+(see run_analyzers(..., use_cache=True)). Events are always cached
+unfiltered; each analyzer applies its own filters when loading them.
+
+The cache is keyed by the log's size and modification time. When a live log
+has only been appended to (its cached prefix still hashes the same), the
+cached events are kept and only the appended bytes are parsed. Any other
+change (truncation, daily rollover reusing the name, edits) rebuilds the cache.
+
+Cache files are never unpickled: logs folders (and their caches) are zipped
+and passed around, so a cache only holds data. The layout is
+
+    CACHE_MAGIC, 8-byte little-endian header length, UTF-8 JSON header,
+    then the raw bytes of every array column in header order
+
+where the header carries the metadata and, per column, either its array
+typecode/itemsize/length or (for dictionary tables) the list of strings.
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Bump whenever the column layout of any analyzer changes
+CACHE_FORMAT_VERSION = 3
+
+CACHE_FILE_SUFFIX = '.gonetcache'
+CACHE_MAGIC = b'GONETCACHE\n'
+CACHE_HEADER_LENGTH = struct.Struct('<Q')
+
+# array.array typecodes a column may use
+ARRAY_TYPECODES = frozenset('bBhHiIlLqQfd')
+
+# Bytes hashed at the start and at the end of the cached prefix of the log
+DIGEST_SAMPLE_BYTES = 64 * 1024
+
+
+class CachedEvents(NamedTuple):
+    """Columns loaded from a cache file plus the part of the log they cover."""
+    columns: Dict[str, Any]
+    end_offset: int        # Log bytes [0, end_offset) are covered by the columns
+    line_count: int        # Number of lines in those bytes
+    last_record_line: int  # Last line that produced an event
+    is_current: bool       # True if the log has not changed since the cache was written
+
+
+def cache_file_path(log_file: str, cache_name: str) -> str:
+    return f"{log_file}.{cache_name}{CACHE_FILE_SUFFIX}"
+
+
+def prefix_digest(log_file: str, end_offset: int) -> str:
+    """Hash of the first and last DIGEST_SAMPLE_BYTES of the [0, end_offset) prefix."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(log_file, 'rb') as f:
+        digest.update(f.read(min(end_offset, DIGEST_SAMPLE_BYTES)))
+        tail_start = max(0, end_offset - DIGEST_SAMPLE_BYTES)
+        f.seek(tail_start)
+        digest.update(f.read(end_offset - tail_start))
+    return digest.hexdigest()
+
+
+def write_columns_file(path: str, header: Dict[str, Any], columns: Dict[str, Any], trailer: bytes = b''):
+    """
+    Atomically write header (JSON-serializable) and columns (array.array or
+    list of str) to path, followed by trailer bytes.
+    """
+    layout = []
+    blobs = []
+    for name, column in columns.items():
+        if isinstance(column, array):
+            layout.append({'name': name, 'typecode': column.typecode, 'itemsize': column.itemsize,
+                           'length': len(column)})
+            blobs.append(column)
+        elif isinstance(column, list) and all(isinstance(value, str) for value in column):
+            layout.append({'name': name, 'strings': column})
+        else:
+            raise TypeError(f"Column {name} is neither an array.array nor a list of str")
+    encoded = json.dumps(dict(header, byteorder=sys.byteorder, columns=layout)).encode('utf-8')
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(CACHE_MAGIC)
+        f.write(CACHE_HEADER_LENGTH.pack(len(encoded)))
+        f.write(encoded)
+        for column in blobs:
+            column.tofile(f)
+        f.write(trailer)
+    os.replace(temp_path, path)
+
+
+def read_columns_file(path: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], bytes]]:
+    """
+    (header, columns, trailer) of a file written by write_columns_file, or
+    None if it is in another (e.g. older) format. Raises on corrupt files.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(CACHE_MAGIC)) != CACHE_MAGIC:
+            return None
+        (header_length,) = CACHE_HEADER_LENGTH.unpack(f.read(CACHE_HEADER_LENGTH.size))
+        header = json.loads(f.read(header_length).decode('utf-8'))
+        if not isinstance(header, dict) or not isinstance(header.get('columns'), list):
+            raise ValueError("malformed header")
+
+        columns: Dict[str, Any] = {}
+        for entry in header.pop('columns'):
+            if 'strings' in entry:
+                strings = entry['strings']
+                if not isinstance(strings, list) or not all(isinstance(value, str) for value in strings):
+                    raise ValueError(f"malformed string column {entry.get('name')}")
+                columns[entry['name']] = strings
+                continue
+            typecode = entry['typecode']
+            if typecode not in ARRAY_TYPECODES:
+                raise ValueError(f"unsupported typecode {typecode!r}")
+            column = array(typecode)
+            if column.itemsize != entry['itemsize']:
+                # e.g. 'l' is 8 bytes on Linux/macOS but 4 on Windows
+                raise ValueError(f"column {entry['name']} was written with {entry['itemsize']}-byte items")
+            column.fromfile(f, entry['length'])
+            if header.get('byteorder') != sys.byteorder:
+                column.byteswap()
+            columns[entry['name']] = column
+        trailer = f.read()
+    return header, columns, trailer
+
+
+def load_event_cache(log_file: str, cache_name: str) -> Optional[CachedEvents]:
+    """
+    Load the cached columns for log_file, or None if there is no usable cache.
+
+    A cache is usable if the log is unchanged (same size and mtime) or if the
+    log has only grown since the cache was written.
+    """
+    path = cache_file_path(log_file, cache_name)
+    try:
+        loaded = read_columns_file(path)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[WARN] Ignoring unreadable cache {path}: {e}")
+        return None
+    if loaded is None:
+        return None
+
+    payload, columns, _ = loaded
+    if payload.get('version') != CACHE_FORMAT_VERSION or payload.get('name') != cache_name:
+        return None
+
+    stat = os.stat(log_file)
+    end_offset = payload['end_offset']
+    if stat.st_size == payload['size'] and stat.st_mtime_ns == payload['mtime_ns']:
+        is_current = True
+    elif stat.st_size >= end_offset and prefix_digest(log_file, end_offset) == payload['prefix_digest']:
+        is_current = False
+    else:
+        return None
+
+    return CachedEvents(columns, end_offset, payload['line_count'], payload['last_record_line'], is_current)
+
+
+def save_event_cache(log_file: str, cache_name: str, columns: Dict[str, Any],
+                     end_offset: int, line_count: int, last_record_line: int, size: int, mtime_ns: int):
+    """
+    Write columns covering log bytes [0, end_offset) to the cache file.
+
+    size/mtime_ns are the log's stat values when parsing started. The file is
+    replaced atomically; failures (e.g. read-only log folder) only warn.
+    """
+    path = cache_file_path(log_file, cache_name)
+    header = {
+        'version': CACHE_FORMAT_VERSION,
+        'name': cache_name,
+        'size': size,
+        'mtime_ns': mtime_ns,
+        'end_offset': end_offset,
+        'prefix_digest': prefix_digest(log_file, end_offset),
+        'line_count': line_count,
+        'last_record_line': last_record_line,
+    }
+    try:
+        write_columns_file(path, header, columns)
+    except OSError as e:
+        print(f"[WARN] Could not write cache {path}: {e}")
+
+
+# --- Column encoding helpers ---
+
+class StringColumn:
+    """
+    Growable dictionary-encoded string column.
+
+    Each distinct value (peer name, value type, timestamp...) is stored once
+    in `table`; rows are 'I' codes into it. Exposes the same (table, codes)
+    pair that encode_strings() produces for the cache.
+    """
+    __slots__ = ('table', 'codes', '_index')
+
+    def __init__(self, table: Sequence[str] = (), codes: Optional[array] = None):
+        self.table: List[str] = list(table)
+        self.codes = codes if codes is not None else array('I')
+        self._index: Dict[str, int] = {value: code for code, value in enumerate(self.table)}
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, row: int) -> str:
+        return self.table[self.codes[row]]
+
+    def code(self, value: str) -> int:
+        """Code of value, adding it to the table if it is new."""
+        code = self._index.get(value)
+        if code is None:
+            code = self._index[value] = len(self.table)
+            self.table.append(value)
+        return code
+
+    def find(self, value: str) -> Optional[int]:
+        """Code of value, or None if no row holds it."""
+        return self._index.get(value)
+
+    def append(self, value: str):
+        self.codes.append(self.code(value))
+
+    def extend_codes(self, table: Sequence[str], codes: Iterable[int]):
+        """Append rows given as codes into another table."""
+        remap = [self.code(value) for value in table]
+        if remap == list(range(len(remap))):
+            self.codes.extend(codes if isinstance(codes, array) and codes.typecode == 'I' else array('I', codes))
+        else:
+            self.codes.extend(array('I', (remap[code] for code in codes)))
+
+    def extend(self, other: 'StringColumn'):
+        self.extend_codes(other.table, other.codes)
+
+
+def encode_strings(values: Iterable[Optional[str]]) -> Tuple[List[str], array]:
+    """Dictionary-encode a string column: (distinct values, 'I' array of indices). None is stored as ''."""
+    table: List[str] = []
+    index: Dict[str, int] = {}
+    codes = array('I')
+    for value in values:
+        value = value or ''
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(table)
+            table.append(value)
+        codes.append(code)
+    return table, codes
+
+
+def decode_strings(table: Sequence[str], codes: Iterable[int], empty_as_none: bool = False) -> List[Optional[str]]:
+    if empty_as_none:
+        table = [value or None for value in table]
+    return [table[code] for code in codes]
+
+
+def encode_optional_floats(values: Iterable[Optional[float]]) -> array:
+    """'d' array with NaN standing in for None."""
+    return array('d', (math.nan if value is None else value for value in values))
+
+
+def decode_optional_floats(column: Iterable[float]) -> List[Optional[float]]:
+    return [None if value != value else value for value in column]
+
+
+def encode_optional_bools(values: Iterable[Optional[bool]]) -> array:
+    """'b' array of 1/0 with -1 standing in for None."""
+    return array('b', (-1 if value is None else int(value) for value in values))
+
+
+def decode_optional_bools(column: Iterable[int]) -> List[Optional[bool]]:
+    return [None if value < 0 else value == 1 for value in column]
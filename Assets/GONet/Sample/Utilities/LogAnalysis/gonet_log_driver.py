@@ -0,0 +1,487 @@
+#!/usr/bin/env python3
+"""
+One-pass driver that feeds a single read of a GONet log to many analyzers.
+
+Each analyzer plugs in as a visitor:
+    consume(line_number, record)  - called for every tokenized log line
+    finalize()                    - called once after the last line
+    report()                      - prints the analyzer's report
+
+Analyzers register themselves with @register_analyzer('<name>') so that
+analyze_all.py (and any future tool) can discover them by name.
+
+Analyzers that also implement chunk_spec()/get_state()/merge_state() can be
+run with jobs > 1: the log is split into newline-aligned byte ranges, each
+range is parsed in a worker process, and the partial states are merged back
+in file order so the result is identical to a single-threaded pass.
+
+Any analyzer can also consume the merged multi-peer timeline of
+gonet_log_timeline (consume_timeline(entry) - log lines and export events
+of every peer on one aligned clock).
+
+Analyzers that also implement the cache hooks (cache_name, cache_builder(),
+to_columns(), load_columns()) can be served from a persistent columnar event
+cache next to the log (run_analyzers(..., use_cache=True), see gonet_log_cache).
+"""
+
+import os
+import sys
+from multiprocessing import Pool
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple, Union
+
+from gonet_log_cache import cache_file_path, load_event_cache, save_event_cache
+from gonet_log_io import LogLineScan, complete_lines_end, expand_log_inputs, is_compressed, split_byte_ranges
+from gonet_log_index import iter_gonetid_lines, load_gonetid_index
+from gonet_log_parser import LogRecord, parse_log_line
+from gonet_log_seek import find_time_window, resolve_time_window
+
+# Byte ranges handed out per worker process (more ranges = better load balancing)
+CHUNKS_PER_JOB = 4
+
+
+class LogAnalyzer:
+    """Base class for analyzers that can share a single pass over a log."""
+
+    name = "analyzer"
+
+    # Literal substrings of the lines this analyzer cares about (None = every line).
+    # When every analyzer in a pass declares markers, other lines are never tokenized.
+    markers: Optional[Tuple[str, ...]] = None
+
+    def consume(self, line_number: int, record: LogRecord):
+        """Process one tokenized log line."""
+        raise NotImplementedError
+
+    def consume_timeline(self, entry):
+        """Process one entry of a merged cross-peer timeline (see gonet_log_timeline).
+
+        By default log lines go to consume() in timeline order and export
+        events are skipped; override to use entry.time or export events.
+        """
+        if isinstance(entry.record, LogRecord):
+            self.consume(entry.position, entry.record)
+
+    def finalize(self):
+        """Called once after the last line has been consumed."""
+
+    def report(self):
+        """Print the analysis report."""
+        raise NotImplementedError
+
+    def live_summary(self) -> Optional[str]:
+        """One-line status printed periodically in --follow mode (None = nothing to show)."""
+        return None
+
+    def gonetid_filter(self) -> Optional[FrozenSet[int]]:
+        """GONetIds this analyzer is restricted to (None = it needs every line).
+
+        When every analyzer of a pass is restricted, --index reads only the
+        lines the GONetId index lists for those ids.
+        """
+        return None
+
+    # --- Parallel chunk support (optional) ---
+
+    supports_chunks = False
+
+    def chunk_spec(self) -> Tuple[Callable[..., 'LogAnalyzer'], tuple]:
+        """Picklable (factory, args) that builds an empty copy of this analyzer in a worker."""
+        raise NotImplementedError
+
+    def get_state(self) -> Any:
+        """Picklable partial result of the lines consumed so far (worker side)."""
+        raise NotImplementedError
+
+    def merge_state(self, state: Any, line_offset: int):
+        """Merge the partial result of the NEXT chunk in file order.
+
+        Line numbers inside state are relative to the chunk; add line_offset.
+        """
+        raise NotImplementedError
+
+    # --- Persistent event cache support (optional) ---
+
+    # File name part of "<log>.<cache_name>.gonetcache" (None = not cacheable)
+    cache_name: Optional[str] = None
+
+    def cache_builder(self) -> 'LogAnalyzer':
+        """Empty, unfiltered copy of this analyzer that collects every cacheable event."""
+        raise NotImplementedError
+
+    def to_columns(self) -> Dict[str, Any]:
+        """Picklable typed columns holding every event collected so far."""
+        raise NotImplementedError
+
+    def load_columns(self, columns: Dict[str, Any]):
+        """Append cached (unfiltered) events as if consumed, applying this analyzer's filters."""
+        raise NotImplementedError
+
+
+# name -> factory(options) returning a LogAnalyzer
+ANALYZER_REGISTRY: Dict[str, Callable[[dict], LogAnalyzer]] = {}
+
+
+def register_analyzer(name: str):
+    """Class decorator registering an analyzer under a short name.
+
+    The decorated class must accept keyword options via from_options(options)
+    or a no-argument constructor.
+    """
+    def decorator(cls):
+        factory = getattr(cls, 'from_options', None)
+        ANALYZER_REGISTRY[name] = factory if factory is not None else (lambda options: cls())
+        cls.name = name
+        return cls
+    return decorator
+
+
+def dispatch_records(records: Iterable, analyzers: Sequence[LogAnalyzer], progress: bool = False) -> int:
+    """Send every (line_number, record) pair to every analyzer.
+
+    Returns the last line number seen.
+    """
+    consumers = [analyzer.consume for analyzer in analyzers]
+    line_number = 0
+    next_progress = 1_000_000
+    for line_number, record in records:
+        if progress and line_number >= next_progress:
+            print(f"   Processed {next_progress // 1_000_000}M lines...")
+            next_progress += 1_000_000
+        for consume in consumers:
+            consume(line_number, record)
+    return line_number
+
+
+def combined_markers(analyzers: Sequence[LogAnalyzer]) -> Optional[Tuple[str, ...]]:
+    """Union of the analyzers' markers, or None if any analyzer needs every line."""
+    markers = []
+    for analyzer in analyzers:
+        if analyzer.markers is None:
+            return None
+        markers.extend(marker for marker in analyzer.markers if marker not in markers)
+    return tuple(markers)
+
+
+def consume_range(log_file: str, analyzers: Sequence[LogAnalyzer], markers: Optional[Tuple[str, ...]],
+                  start: int = 0, end: Optional[int] = None, line_offset: int = 0,
+                  progress: bool = False) -> Tuple[int, int]:
+    """Feed the [start, end) byte range of log_file (default: all of it) to the analyzers.
+
+    Line numbers are shifted by line_offset. Returns (lines in range, last dispatched line).
+    """
+    consumers = [analyzer.consume for analyzer in analyzers]
+    scan = LogLineScan(log_file, markers, start, end)
+
+    last_record_line = 0
+    next_progress = (line_offset // 1_000_000 + 1) * 1_000_000
+    for line_number, line in scan:
+        record = parse_log_line(line)
+        if record is not None:
+            last_record_line = line_offset + line_number
+            if progress and last_record_line >= next_progress:
+                print(f"   Processed {next_progress // 1_000_000}M lines...")
+                next_progress += 1_000_000
+            for consume in consumers:
+                consume(last_record_line, record)
+
+    return scan.line_count, last_record_line
+
+
+def _consume_chunk(task) -> Tuple[int, int, List[Any]]:
+    """Worker: parse one byte range with fresh analyzers and return their partial states."""
+    specs, markers, log_file, start, end = task
+    analyzers = [factory(*args) for factory, args in specs]
+    line_count, last_record_line = consume_range(log_file, analyzers, markers, start, end)
+    return line_count, last_record_line, [analyzer.get_state() for analyzer in analyzers]
+
+
+def _plan_chunks(ranges: Sequence[Tuple[str, int, Optional[int]]], chunk_count: int) -> List[Tuple[str, int, Optional[int]]]:
+    """Newline-aligned (file, start, end) work items covering ranges, about chunk_count in total.
+
+    Plain files get chunks in proportion to their size; a compressed file
+    cannot be entered mid-stream, so it is always a single work item.
+    """
+    plain_sizes = {(path, start): (end if end is not None else os.path.getsize(path)) - start
+                   for path, start, end in ranges if not is_compressed(path)}
+    total_size = sum(plain_sizes.values()) or 1
+    chunks = []
+    for path, start, end in ranges:
+        if (path, start) not in plain_sizes:
+            chunks.append((path, start, end))
+            continue
+        count = max(1, round(chunk_count * plain_sizes[(path, start)] / total_size))
+        chunks.extend((path, chunk_start, chunk_end)
+                      for chunk_start, chunk_end in split_byte_ranges(path, count, start, end))
+    return chunks
+
+
+def _run_analyzers_chunked(chunks: Sequence[Tuple[str, int, Optional[int]]], analyzers: Sequence[LogAnalyzer],
+                           jobs: int, progress: bool, line_offset: int = 0) -> Tuple[int, int]:
+    """Parse (file, start, end) chunks in a process pool; returns (lines parsed, last dispatched line)."""
+    specs = [analyzer.chunk_spec() for analyzer in analyzers]
+    markers = combined_markers(analyzers)
+    tasks = [(specs, markers, log_file, start, end) for log_file, start, end in chunks]
+
+    line_count = 0
+    last_record_line = 0
+    with Pool(processes=jobs) as pool:
+        # imap keeps results in file order, so merging is deterministic
+        for index, (chunk_lines, chunk_last_line, states) in enumerate(pool.imap(_consume_chunk, tasks), 1):
+            for analyzer, state in zip(analyzers, states):
+                analyzer.merge_state(state, line_offset + line_count)
+            if chunk_last_line:
+                last_record_line = line_offset + line_count + chunk_last_line
+            line_count += chunk_lines
+            if progress:
+                print(f"   Merged chunk {index}/{len(tasks)}...")
+
+    return line_count, last_record_line
+
+
+def _run_range(log_file: str, analyzers: Sequence[LogAnalyzer], start: int, end: Optional[int], line_offset: int,
+               jobs: int, progress: bool) -> Tuple[int, int]:
+    """Parse [start, end) serially or in a process pool; returns (lines in range, last dispatched line)."""
+    if jobs > 1 and not is_compressed(log_file) and all(analyzer.supports_chunks for analyzer in analyzers):
+        ranges = split_byte_ranges(log_file, jobs * CHUNKS_PER_JOB, start, end)
+        chunks = [(log_file, chunk_start, chunk_end) for chunk_start, chunk_end in ranges]
+        return _run_analyzers_chunked(chunks, analyzers, jobs, progress, line_offset)
+    return consume_range(log_file, analyzers, combined_markers(analyzers), start, end, line_offset)
+
+
+def _serve_from_cache(log_file: str, analyzers: Sequence[LogAnalyzer], jobs: int, progress: bool) -> int:
+    """Fill cacheable analyzers from their event caches, parsing only what is not cached yet.
+
+    Builders that must start at the same byte offset (all of them on a cold
+    cache) share one pass over the log. Returns the number of log lines covered.
+    """
+    stat = os.stat(log_file)
+    # Archives are read whole; a live log only up to its last complete line
+    compressed = is_compressed(log_file)
+    end = None if compressed else complete_lines_end(log_file, stat.st_size)
+    end_offset = stat.st_size if compressed else end
+
+    total_lines = 0
+    # (start offset, line offset, last cached event line) -> [(analyzer, builder)]
+    pending: Dict[Tuple[int, int, int], List[Tuple[LogAnalyzer, LogAnalyzer]]] = {}
+    for analyzer in analyzers:
+        path = cache_file_path(log_file, analyzer.cache_name)
+        cached = load_event_cache(log_file, analyzer.cache_name)
+        if cached is not None and compressed and not cached.is_current:
+            cached = None  # A changed archive cannot be resumed mid-stream
+        if cached is not None and (cached.is_current or cached.end_offset >= end_offset):
+            print(f"[CACHE] {analyzer.name}: loaded {path}")
+            analyzer.load_columns(cached.columns)
+            total_lines = max(total_lines, cached.line_count)
+            continue
+
+        builder = analyzer.cache_builder()
+        if cached is None:
+            print(f"[CACHE] {analyzer.name}: building {path}")
+            key = (0, 0, 0)
+        else:
+            print(f"[CACHE] {analyzer.name}: parsing {end_offset - cached.end_offset:,} appended bytes into {path}")
+            builder.load_columns(cached.columns)
+            key = (cached.end_offset, cached.line_count, cached.last_record_line)
+        pending.setdefault(key, []).append((analyzer, builder))
+
+    for (start, line_offset, cached_last_line), pairs in pending.items():
+        builders = [builder for _, builder in pairs]
+        line_count, pass_last_line = _run_range(log_file, builders, start, end, line_offset, jobs, progress)
+        pass_last_line = pass_last_line or cached_last_line
+        total_lines = max(total_lines, line_offset + line_count)
+
+        for analyzer, builder in pairs:
+            columns = builder.to_columns()
+            save_event_cache(log_file, analyzer.cache_name, columns, end_offset, line_offset + line_count,
+                             pass_last_line, stat.st_size, stat.st_mtime_ns)
+            analyzer.load_columns(columns)
+
+    return total_lines
+
+
+def _run_full_pass(ranges: Sequence[Tuple[str, int, Optional[int]]], analyzers: Sequence[LogAnalyzer], jobs: int,
+                   progress: bool) -> int:
+    """Parse every range, serially or in a process pool; returns the number of lines read."""
+    if jobs > 1 and all(analyzer.supports_chunks for analyzer in analyzers):
+        return _run_analyzers_chunked(_plan_chunks(ranges, jobs * CHUNKS_PER_JOB), analyzers, jobs, progress)[0]
+
+    if jobs > 1:
+        unsupported = [analyzer.name for analyzer in analyzers if not analyzer.supports_chunks]
+        print(f"[WARN] --jobs ignored: no parallel support in {', '.join(unsupported)}")
+
+    markers = combined_markers(analyzers)
+    line_offset = 0
+    for log_file, start, end in ranges:
+        if progress and len(ranges) > 1:
+            print(f"   Reading {os.path.basename(log_file)}...")
+        line_count, _ = consume_range(log_file, analyzers, markers, start, end, line_offset, progress=progress)
+        line_offset += line_count
+    return line_offset
+
+
+def _run_indexed_pass(log_files: Sequence[str], analyzers: Sequence[LogAnalyzer], gonetids: FrozenSet[int],
+                      progress: bool) -> int:
+    """Dispatch only the lines the GONetId index lists for gonetids; returns the lines the index covers."""
+    consumers = [analyzer.consume for analyzer in analyzers]
+    line_offset = 0
+    for log_file in log_files:
+        index = load_gonetid_index(log_file)
+        if progress:
+            print(f"[INDEX] {os.path.basename(log_file)}: {index.line_total(gonetids):,} of "
+                  f"{index.line_count:,} lines mention GONetId {', '.join(map(str, sorted(gonetids)))}")
+        for line_number, line in iter_gonetid_lines(log_file, index, gonetids):
+            record = parse_log_line(line)
+            if record is not None:
+                for consume in consumers:
+                    consume(line_offset + line_number, record)
+        line_offset += index.line_count
+    return line_offset
+
+
+def _index_filter(log_files: Sequence[str], analyzers: Sequence[LogAnalyzer]) -> Optional[FrozenSet[int]]:
+    """Union of the analyzers' GONetId filters, or None (with a warning) if --index cannot be used."""
+    unfiltered = [analyzer.name for analyzer in analyzers if analyzer.gonetid_filter() is None]
+    if unfiltered:
+        print(f"[WARN] --index ignored: {', '.join(unfiltered)} need every line (no GONetId filter)")
+        return None
+    if any(is_compressed(log_file) for log_file in log_files):
+        print("[WARN] --index ignored: the GONetId index needs seekable (uncompressed) logs")
+        return None
+    return frozenset().union(*(analyzer.gonetid_filter() for analyzer in analyzers))
+
+
+def _time_window_ranges(log_files: Sequence[str], since: Optional[str], until: Optional[str],
+                        use_index: bool) -> List[Tuple[str, int, Optional[int]]]:
+    """(file, start, end) byte ranges of the --since/--until window, empty files dropped."""
+    since_time, until_time = resolve_time_window(log_files, since, until)
+    ranges = []
+    for path in log_files:
+        start, end = find_time_window(path, since_time, until_time, use_index)
+        if end > start:
+            ranges.append((path, start, end))
+    window_bytes = sum(end - start for _, start, end in ranges)
+    print(f"[WINDOW] {since_time or 'start'} .. {until_time or 'end'}: {window_bytes:,} bytes "
+          f"in {len(ranges)} file(s); line numbers count from the window start")
+    return ranges
+
+
+def run_analyzers(log_file: Union[str, Sequence[str]], analyzers: Sequence[LogAnalyzer], progress: bool = True,
+                  jobs: int = 1, use_cache: bool = False, since: Optional[str] = None, until: Optional[str] = None,
+                  time_index: bool = False, use_index: bool = False) -> int:
+    """Stream the log once, dispatching each line to all analyzers, then finalize them.
+
+    log_file may also be a folder, a glob pattern or a list of them; the
+    matching logs (plain or .gz/.bz2/.zst) are read oldest day first as one
+    stream, with line numbers continuing across files.
+
+    With jobs > 1 (and analyzers that support chunks) the file is parsed by a
+    process pool instead. With use_cache, analyzers that support the event
+    cache are served from (and refresh) their cache files and only the other
+    analyzers read the log.
+
+    since/until ("2025-10-13 12:34:56" or a time of day) restrict parsing to
+    the lines logged in that window; the window is located by binary search
+    on the header timestamps (with time_index, via a sidecar index).
+
+    With use_index, analyzers that are all restricted to some GONetIds (see
+    LogAnalyzer.gonetid_filter) read only the lines listed for those ids in
+    the GONetId index next to each log. Returns the number of log lines
+    processed (of the --since/--until window, if one is given).
+    """
+    log_files = expand_log_inputs(log_file)
+    if progress and len(log_files) > 1:
+        print(f"   {len(log_files)} log files: {os.path.basename(log_files[0])} .. {os.path.basename(log_files[-1])}")
+    if use_cache and len(log_files) > 1:
+        print("[WARN] --cache ignored: the event cache needs a single log file")
+        use_cache = False
+
+    ranges = [(path, 0, None) for path in log_files]
+    if since or until:
+        ranges = _time_window_ranges(log_files, since, until, time_index)
+        if use_cache:
+            print("[WARN] --cache ignored: the event cache covers whole files, not time windows")
+            use_cache = False
+        if use_index:
+            print("[WARN] --index ignored: the GONetId index covers whole files, not time windows")
+            use_index = False
+
+    line_count = 0
+    uncached = list(analyzers)
+    if use_cache:
+        cached = [analyzer for analyzer in analyzers if analyzer.cache_name is not None]
+        if cached:
+            line_count = _serve_from_cache(log_files[0], cached, jobs, progress)
+        uncached = [analyzer for analyzer in analyzers if analyzer.cache_name is None]
+
+    gonetids = _index_filter(log_files, uncached) if use_index and uncached else None
+    if gonetids is not None:
+        line_count = max(line_count, _run_indexed_pass(log_files, uncached, gonetids, progress))
+    elif uncached:
+        line_count = max(line_count, _run_full_pass(ranges, uncached, jobs, progress))
+
+    for analyzer in analyzers:
+        analyzer.finalize()
+    return line_count
+
+
+def create_analyzers(names: Iterable[str], options: dict) -> List[LogAnalyzer]:
+    """Instantiate registered analyzers by name (raises KeyError for unknown names)."""
+    return [ANALYZER_REGISTRY[name](options) for name in names]
+
+
+def parse_int_option(argv: List[str], flag: str, default: Optional[int] = None) -> Optional[int]:
+    """Read an integer command line option such as "--jobs 8" (exits on bad values)."""
+    if flag not in argv:
+        return default
+    index = argv.index(flag)
+    if index + 1 >= len(argv):
+        print(f"[ERROR] {flag} requires a value")
+        sys.exit(1)
+    try:
+        return int(argv[index + 1])
+    except ValueError:
+        print(f"[ERROR] Invalid {flag} value '{argv[index + 1]}' (must be integer)")
+        sys.exit(1)
+
+
+def parse_float_option(argv: List[str], flag: str, default: Optional[float] = None) -> Optional[float]:
+    """Read a number command line option such as "--ping-pong-ms 2.5" (exits on bad values)."""
+    text = parse_str_option(argv, flag)
+    if text is None:
+        return default
+    try:
+        return float(text)
+    except ValueError:
+        print(f"[ERROR] Invalid {flag} value '{text}' (must be a number)")
+        sys.exit(1)
+
+
+def parse_int_list(text: str) -> List[int]:
+    """Parse "5119,5120" into [5119, 5120] (raises ValueError on bad values)."""
+    values = [int(part) for part in text.split(',') if part.strip()]
+    if not values:
+        raise ValueError(f"no values in '{text}'")
+    return values
+
+
+def parse_int_list_option(argv: List[str], flag: str) -> Optional[List[int]]:
+    """Read a comma-separated integer option such as "--gonetid 5119,5120" (exits on bad values)."""
+    text = parse_str_option(argv, flag)
+    if text is None:
+        return None
+    try:
+        return parse_int_list(text)
+    except ValueError:
+        print(f"[ERROR] Invalid {flag} value '{text}' (must be integers separated by commas)")
+        sys.exit(1)
+
+
+def parse_str_option(argv: List[str], flag: str, default: Optional[str] = None) -> Optional[str]:
+    """Read a text command line option such as "--since 12:30" (exits if the value is missing)."""
+    if flag not in argv:
+        return default
+    index = argv.index(flag)
+    if index + 1 >= len(argv):
+        print(f"[ERROR] {flag} requires a value")
+        sys.exit(1)
+    return argv[index + 1]
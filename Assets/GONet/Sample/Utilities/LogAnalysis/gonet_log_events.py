@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Streaming reader for GONet persistent event history exports.
+
+GONet.ExportPersistentEventHistory writes one export per peer on quit:
+
+    gonet-events-YYYY-MM-DD-HHmmss-[Server|ClientN].txt
+
+    Role: Client3
+    Authority ID: 3
+    Session GUID: 1234567890
+    ...
+    [Event 000042] Type=InstantiateGONetParticipantEvent
+      Timestamp: Ticks=123456789 (12.346s)
+      GONetId: 5119
+      Owner: Authority3
+      Details: GONet.InstantiateGONetParticipantEvent | DesignTimeLocation=project://... | Position=(...)
+
+The GONetId and Owner lines are omitted when the value is 0, so an event
+block is only ever read line by line up to the blank line that ends it.
+iter_export_events() yields one ExportEvent per block while reading the file,
+so memory stays constant for exports with millions of events. Compressed
+exports (.gz/.bz2/.zst) are read transparently.
+
+Usage:
+    from gonet_log_events import iter_export_events, read_export_header
+
+    header = read_export_header(path)
+    for event in iter_export_events(path, types=('InstantiateGONetParticipantEvent',)):
+        print(event.gonetid, event.owner, event.details.get('DesignTimeLocation'))
+"""
+
+import io
+import re
+import sys
+from typing import Dict, Iterable, Iterator, NamedTuple, Optional, TextIO
+
+from gonet_log_io import is_compressed, open_decompressed
+
+EXPORT_FILE_GLOB = 'gonet-events-*-*.txt'
+
+EVENT_HEADER_PATTERN = re.compile(r'\[Event (\d+)\] Type=(\S+)')
+TIMESTAMP_PATTERN = re.compile(r'Ticks=(-?\d+)(?: \((-?[\d.]+)s\))?')
+
+# OccurredAtElapsedTicks are .NET ticks (100ns) of GONetMain.Time, the clock of the "(frame:N/Es)" log header
+TICKS_PER_SECOND = 10_000_000
+
+# Details key holding the segments that are not "Key=Value" (usually the event's ToString())
+DETAILS_TEXT_KEY = 'Text'
+
+
+class ExportHeader(NamedTuple):
+    """Header lines of one export file (None when a line is missing)."""
+    role: Optional[str]          # "Server" or "ClientN"
+    authority_id: Optional[int]
+    session_guid: Optional[str]
+    export_time: Optional[str]
+    event_count: Optional[int]
+
+
+class ExportEvent(NamedTuple):
+    """One [Event NNNNNN] block of an export."""
+    index: int               # NNNNNN
+    type: str                # Event class name, e.g. "InstantiateGONetParticipantEvent"
+    ticks: int               # OccurredAtElapsedTicks
+    seconds: Optional[float]
+    gonetid: int             # 0 when the export omitted the GONetId line
+    owner: int               # Owner authority id, 0 when the export omitted the Owner line
+    details: Dict[str, str]  # "Key=Value" segments of the Details line, other text under DETAILS_TEXT_KEY
+
+
+def open_export(file_path: str) -> TextIO:
+    """Text stream of an export file (plain or compressed)."""
+    if is_compressed(file_path):
+        return io.TextIOWrapper(open_decompressed(file_path), encoding='utf-8', errors='replace')
+    return open(file_path, 'r', encoding='utf-8', errors='replace')
+
+
+def read_export_header(file_path: str) -> ExportHeader:
+    """Read only the header lines of an export (stops before the first event)."""
+    fields: Dict[str, str] = {}
+    with open_export(file_path) as f:
+        for line in f:
+            if line.startswith('[Event ') or line.startswith('EVENT INDEX'):
+                break
+            key, separator, value = line.partition(': ')
+            if separator:
+                fields.setdefault(key.strip(), value.strip())
+
+    authority_id = fields.get('Authority ID')
+    event_count = fields.get('Event Count')
+    return ExportHeader(
+        role=fields.get('Role'),
+        authority_id=int(authority_id) if authority_id and authority_id.isdigit() else None,
+        session_guid=fields.get('Session GUID'),
+        export_time=fields.get('Export Time'),
+        event_count=int(event_count) if event_count and event_count.isdigit() else None,
+    )
+
+
+def parse_event_details(text: str) -> Dict[str, str]:
+    """Split "Summary | Key=Value | Key=Value" into a dict."""
+    details: Dict[str, str] = {}
+    text_segments = []
+    for segment in text.split(' | '):
+        key, separator, value = segment.partition('=')
+        if separator and key.isidentifier():
+            details[sys.intern(key)] = value
+        elif segment:
+            text_segments.append(segment)
+    if text_segments:
+        details[DETAILS_TEXT_KEY] = ' | '.join(text_segments)
+    return details
+
+
+def iter_export_events(file_path: str, types: Optional[Iterable[str]] = None) -> Iterator[ExportEvent]:
+    """
+    Yield the events of an export in file order, one block at a time.
+
+    types restricts the output to those event class names; the lines of other
+    blocks are skipped without being parsed.
+    """
+    wanted = frozenset(types) if types is not None else None
+    with open_export(file_path) as f:
+        block = None  # [index, type, ticks, seconds, gonetid, owner, details] of the open block
+        for line in f:
+            if line.startswith('[Event '):
+                if block is not None:
+                    yield ExportEvent(*block)
+                match = EVENT_HEADER_PATTERN.match(line)
+                event_type = sys.intern(match.group(2)) if match else None
+                block = [int(match.group(1)), event_type, 0, None, 0, 0, {}] \
+                    if match and (wanted is None or event_type in wanted) else None
+                continue
+            if block is None:
+                continue
+
+            content = line.strip()
+            if not content or content.startswith('====='):
+                yield ExportEvent(*block)
+                block = None
+            elif content.startswith('Timestamp: '):
+                match = TIMESTAMP_PATTERN.search(content)
+                if match:
+                    block[2] = int(match.group(1))
+                    block[3] = float(match.group(2)) if match.group(2) else None
+            elif content.startswith('GONetId: ') and content[9:].isdigit():
+                block[4] = int(content[9:])
+            elif content.startswith('Owner: Authority') and content[16:].isdigit():
+                block[5] = int(content[16:])
+            elif content.startswith('Details: '):
+                block[6] = parse_event_details(content[9:])
+
+        if block is not None:
+            yield ExportEvent(*block)
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Live tail (--follow) support for the GONet log analyzers.
+
+GONetLog opens its log file with FileShare.ReadWrite, so it can be read while
+the game is still writing it. follow_log() keeps reading the complete lines
+appended to the log, feeds them to the analyzers and prints every analyzer's
+live_summary() every few seconds (e.g. anchor ratios or OnGONetReady delays
+during a load test). Ctrl+C stops following and prints the full reports.
+
+The last processed byte offset and every analyzer's get_state() are saved to
+a state file (default: <log>.follow.gonetcache next to a followed file, or
+.gonet-follow.state inside a followed folder), so a restarted follower of the
+same target resumes where it stopped instead of re-parsing the day's log. The
+position is stored as a JSON header (see gonet_log_cache.write_columns_file);
+the analyzer states are pickled and signed with a per-user key
+(~/.gonet-follow.key), and a state file whose signature does not match -
+e.g. one that came with someone else's zipped logs folder - is never unpickled.
+
+Daily rollover: GONetLog.GetLogFilePath() names the log gonet-YYYY-MM-DD.log
+and switches to the next date's file after midnight. When following such a
+file (or a whole logs folder), the follower finishes the old file and then
+continues with the newest gonet-YYYY-MM-DD.log in the same folder.
+"""
+
+import hashlib
+import hmac
+import os
+import pickle
+import sys
+import time
+from typing import Any, Optional, Sequence
+
+from gonet_log_cache import cache_file_path, prefix_digest, read_columns_file, write_columns_file
+from gonet_log_driver import LogAnalyzer, combined_markers, consume_range
+from gonet_log_io import DAILY_LOG_PATTERN, complete_lines_end, is_compressed
+
+FOLLOW_POLL_SECONDS = 1.0
+DEFAULT_REPORT_SECONDS = 10
+FOLLOW_STATE_FILE_NAME = '.gonet-follow.state'  # Inside a followed logs folder
+FOLLOW_STATE_CACHE_NAME = 'follow'             # <log>.follow.gonetcache next to a followed file
+FOLLOW_STATE_VERSION = 2
+FOLLOW_KEY_FILE = os.path.join(os.path.expanduser('~'), '.gonet-follow.key')
+FOLLOW_KEY_BYTES = 32
+FOLLOW_MAC_BYTES = hashlib.sha256().digest_size
+
+
+def latest_daily_log(directory: str) -> Optional[str]:
+    """Newest gonet-YYYY-MM-DD.log in directory (the dates sort chronologically)."""
+    try:
+        names = [name for name in os.listdir(directory) if DAILY_LOG_PATTERN.match(name)]
+    except FileNotFoundError:
+        return None
+    return os.path.join(directory, max(names)) if names else None
+
+
+def default_state_file(target: str) -> str:
+    """State file of one follow target, so followers of different logs never share one."""
+    if os.path.isdir(target):
+        return os.path.join(target, FOLLOW_STATE_FILE_NAME)
+    return cache_file_path(target, FOLLOW_STATE_CACHE_NAME)
+
+
+def _in_rollover_chain(target: str, log_file: str) -> bool:
+    """True if following target can have led to log_file (target itself or a later daily log of its folder)."""
+    target, log_file = os.path.abspath(target), os.path.abspath(log_file)
+    if log_file == target:
+        return True
+    name = os.path.basename(log_file)
+    if not DAILY_LOG_PATTERN.match(name):
+        return False
+    if os.path.isdir(target):
+        return os.path.dirname(log_file) == target
+    return (os.path.dirname(log_file) == os.path.dirname(target)
+            and DAILY_LOG_PATTERN.match(os.path.basename(target)) is not None
+            and name > os.path.basename(target))
+
+
+def _follow_state_key() -> bytes:
+    """Per-user secret that signs the pickled analyzer states (created on first use)."""
+    try:
+        with open(FOLLOW_KEY_FILE, 'rb') as f:
+            key = f.read()
+        if len(key) >= FOLLOW_KEY_BYTES:
+            return key
+    except FileNotFoundError:
+        pass
+    key = os.urandom(FOLLOW_KEY_BYTES)
+    descriptor = os.open(FOLLOW_KEY_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(descriptor, 'wb') as f:
+        f.write(key)
+    return key
+
+
+def _canonical_signature(value: Any) -> Any:
+    """JSON form of a signature: tuples become lists, sets sorted lists."""
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canonical_signature(item) for item in value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical_signature(item) for item in value]
+    return value
+
+
+def _load_follow_state(state_file: str, signature: Any) -> Optional[dict]:
+    try:
+        loaded = read_columns_file(state_file)
+        if loaded is None:
+            raise ValueError("not a follow state file")
+        payload, _, trailer = loaded
+        mac, states = trailer[:FOLLOW_MAC_BYTES], trailer[FOLLOW_MAC_BYTES:]
+        if not hmac.compare_digest(mac, hmac.new(_follow_state_key(), states, hashlib.sha256).digest()):
+            print(f"[WARN] {state_file} was not written by this user; starting from scratch")
+            return None
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"[WARN] Ignoring unreadable follow state {state_file}: {e}")
+        return None
+
+    if (payload.get('version') != FOLLOW_STATE_VERSION
+            or payload.get('signature') != _canonical_signature(signature)):
+        print(f"[WARN] {state_file} was written for another log/analyzers/options; starting from scratch")
+        return None
+
+    log_file, offset = payload['log_file'], payload['offset']
+    if (not os.path.exists(log_file) or os.path.getsize(log_file) < offset
+            or prefix_digest(log_file, offset) != payload['prefix_digest']):
+        print(f"[WARN] {log_file} changed since {state_file} was saved; starting from scratch")
+        return None
+    payload['states'] = pickle.loads(states)
+    return payload
+
+
+def _save_follow_state(state_file: str, signature: Any, log_file: str, offset: int, line_count: int,
+                       analyzers: Sequence[LogAnalyzer]):
+    header = {
+        'version': FOLLOW_STATE_VERSION,
+        'signature': _canonical_signature(signature),
+        'log_file': log_file,
+        'offset': offset,
+        'prefix_digest': prefix_digest(log_file, offset),
+        'line_count': line_count,
+    }
+    states = pickle.dumps([analyzer.get_state() for analyzer in analyzers], protocol=pickle.HIGHEST_PROTOCOL)
+    try:
+        mac = hmac.new(_follow_state_key(), states, hashlib.sha256).digest()
+        write_columns_file(state_file, header, {}, mac + states)
+    except OSError as e:
+        print(f"[WARN] Could not write follow state {state_file}: {e}")
+
+
+def _print_live_summaries(analyzers: Sequence[LogAnalyzer], log_file: str, line_count: int):
+    print(f"[{time.strftime('%H:%M:%S')}] {os.path.basename(log_file)} line {line_count:,}")
+    for analyzer in analyzers:
+        summary = analyzer.live_summary()
+        if summary:
+            print(f"    {analyzer.name}: {summary}")
+
+
+def follow_log(target: str, analyzers: Sequence[LogAnalyzer], state_file: Optional[str] = None,
+               report_seconds: int = DEFAULT_REPORT_SECONDS, signature: Any = None) -> int:
+    """
+    Tail a GONet log (or the newest daily log in a folder) until Ctrl+C.
+
+    Args:
+        target: Log file, or logs folder containing gonet-YYYY-MM-DD.log files
+        analyzers: Analyzers to feed; they are finalized when following stops
+        state_file: Where offset + analyzer state are persisted (default: see default_state_file)
+        report_seconds: Minimum seconds between live summaries / state saves
+        signature: Picklable description of the analyzer options (e.g. filters);
+                   a saved state is only resumed if it was written with the same one
+
+    Returns the number of lines read.
+    """
+    follow_directory = os.path.isdir(target)
+    if not follow_directory and is_compressed(target):
+        print(f"[ERROR] --follow needs a live (uncompressed) log, not {target}")
+        sys.exit(1)
+    directory = target if follow_directory else os.path.dirname(os.path.abspath(target))
+    rolls_over = follow_directory or DAILY_LOG_PATTERN.match(os.path.basename(target)) is not None
+    log_file = latest_daily_log(directory) if follow_directory else target
+    offset = 0
+    line_count = 0
+
+    # Analyzer state can only be saved/restored through the chunk interface
+    persist = all(analyzer.supports_chunks for analyzer in analyzers)
+    state_file = state_file or default_state_file(target)
+    signature = (os.path.abspath(target), [analyzer.name for analyzer in analyzers], signature)
+    if not persist:
+        unsupported = [analyzer.name for analyzer in analyzers if not analyzer.supports_chunks]
+        print(f"[WARN] Follow state will not be saved: no state support in {', '.join(unsupported)}")
+    else:
+        state = _load_follow_state(state_file, signature)
+        if state is not None and not _in_rollover_chain(target, state['log_file']):
+            print(f"[WARN] {state_file} was saved while following {state['log_file']}, not {target}; "
+                  f"starting from scratch")
+            state = None
+        if state is not None:
+            log_file, offset, line_count = state['log_file'], state['offset'], state['line_count']
+            for analyzer, analyzer_state in zip(analyzers, state['states']):
+                analyzer.merge_state(analyzer_state, 0)
+            print(f"[FOLLOW] Resuming {log_file} at byte {offset:,} (line {line_count:,})")
+
+    print(f"[FOLLOW] Following {log_file or directory} (Ctrl+C to stop)")
+    markers = combined_markers(analyzers)
+    last_report = time.monotonic()
+    has_news = False
+    reading = False
+    try:
+        while True:
+            if log_file is None:
+                log_file = latest_daily_log(directory)
+
+            if log_file is not None and os.path.exists(log_file):
+                size = os.path.getsize(log_file)
+                if size < offset:
+                    print(f"[FOLLOW] {os.path.basename(log_file)} was truncated; reading it again from the start")
+                    offset = 0
+
+                newer = latest_daily_log(directory) if rolls_over else None
+                rolled_over = newer is not None and os.path.basename(newer) > os.path.basename(log_file)
+                # A finished file is read to its very end, a live one only up to its last complete line
+                end = size if rolled_over else complete_lines_end(log_file, size)
+                if end > offset:
+                    reading = True
+                    lines, _ = consume_range(log_file, analyzers, markers, offset, end, line_count)
+                    reading = False
+                    line_count += lines
+                    offset = end
+                    has_news = True
+
+                if rolled_over:
+                    print(f"[FOLLOW] Daily rollover: {os.path.basename(log_file)} -> {os.path.basename(newer)}")
+                    log_file, offset = newer, 0
+                    continue
+
+            now = time.monotonic()
+            if has_news and now - last_report >= report_seconds:
+                _print_live_summaries(analyzers, log_file, line_count)
+                if persist:
+                    _save_follow_state(state_file, signature, log_file, offset, line_count, analyzers)
+                last_report = now
+                has_news = False
+
+            time.sleep(FOLLOW_POLL_SECONDS)
+    except KeyboardInterrupt:
+        print("\n[FOLLOW] Stopped")
+
+    if reading:
+        # Analyzers hold part of a range whose offset was never recorded
+        print(f"[WARN] Interrupted while reading; {state_file} keeps the previous checkpoint")
+    elif persist and log_file is not None and os.path.exists(log_file):
+        _save_follow_state(state_file, signature, log_file, offset, line_count, analyzers)
+        print(f"[FOLLOW] Saved position {os.path.basename(log_file)}:{offset:,} to {state_file}")
+
+    for analyzer in analyzers:
+        analyzer.finalize()
+    return line_count
@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Log file input helpers shared by the GONet log analysis scripts.
+
+Splitting a log into newline-aligned byte ranges lets several worker
+processes parse one huge file in parallel (see gonet_log_driver.run_analyzers).
+
+For needle-in-haystack analyses, iter_marked_lines() memory-maps the file and
+searches the raw bytes for literal markers such as b'[QUANT-CHECK]'; only the
+lines that contain a marker are ever decoded into Python strings.
+
+Archived logs compressed with gzip (.gz), bzip2 (.bz2) or zstd (.zst) are read
+transparently: a background thread inflates fixed-size blocks into a bounded
+queue while the caller scans them, so decompression and parsing overlap and
+nothing is ever written to disk. zstd needs Python 3.14+ or the optional
+'zstandard' package. expand_log_inputs() turns folders and globs into the
+list of daily logs to read.
+"""
+
+import bz2
+import glob
+import gzip
+import mmap
+import os
+import queue
+import re
+import threading
+from typing import BinaryIO, Generator, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+# Block size used when counting newlines without decoding
+COUNT_BLOCK_SIZE = 16 * 1024 * 1024
+
+# Decompressed bytes handed from the inflating thread to the parser per block,
+# and how many blocks may be buffered (bounds memory to ~8MB per file)
+DECOMPRESS_BLOCK_SIZE = 1024 * 1024
+DECOMPRESS_QUEUE_BLOCKS = 8
+
+# Main logs written by GONetLog.GetLogFilePath (profile logs such as
+# gonet-MessageFlow-YYYY-MM-DD.log are not included)
+DAILY_LOG_PATTERN = re.compile(r'^gonet-\d{4}-\d{2}-\d{2}\.log$')
+ARCHIVED_DAILY_LOG_PATTERN = re.compile(r'^gonet-\d{4}-\d{2}-\d{2}\.log(?:\.gz|\.bz2|\.zst)?$')
+
+
+def _open_zstd(file_path: str) -> BinaryIO:
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd.open(file_path, 'rb')
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError(f"Reading {file_path} needs Python 3.14+ or the 'zstandard' package (pip install zstandard)")
+    return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), read_across_frames=True, closefd=True)
+
+
+COMPRESSED_OPENERS = {
+    '.gz': lambda file_path: gzip.open(file_path, 'rb'),
+    '.bz2': lambda file_path: bz2.open(file_path, 'rb'),
+    '.zst': _open_zstd,
+}
+
+
+def is_compressed(file_path: str) -> bool:
+    return os.path.splitext(file_path)[1].lower() in COMPRESSED_OPENERS
+
+
+def open_decompressed(file_path: str) -> BinaryIO:
+    """Binary stream of the decompressed contents of a .gz/.bz2/.zst file."""
+    return COMPRESSED_OPENERS[os.path.splitext(file_path)[1].lower()](file_path)
+
+
+def expand_log_inputs(log_input: Union[str, Sequence[str]]) -> List[str]:
+    """
+    Resolve files, folders and glob patterns into the list of logs to read.
+
+    A folder stands for its gonet-YYYY-MM-DD.log files (plain or compressed).
+    Files are returned oldest day first (daily log names sort by date).
+    Raises FileNotFoundError if nothing matches.
+    """
+    inputs = [log_input] if isinstance(log_input, str) else list(log_input)
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            files.extend(os.path.join(item, name) for name in os.listdir(item)
+                         if ARCHIVED_DAILY_LOG_PATTERN.match(name))
+        elif glob.has_magic(item):
+            files.extend(path for path in glob.glob(item) if os.path.isfile(path))
+        elif os.path.exists(item):
+            files.append(item)
+        else:
+            raise FileNotFoundError(item)
+
+    if not files:
+        raise FileNotFoundError(', '.join(inputs))
+    if len(files) == 1:
+        return files
+    return sorted(set(files), key=lambda path: (os.path.basename(path), path))
+
+# Block size used when searching backwards for the last complete line
+TAIL_BLOCK_SIZE = 64 * 1024
+
+
+def split_byte_ranges(file_path: str, count: int, start: int = 0, end: Optional[int] = None) -> List[Tuple[int, int]]:
+    """
+    Split the [start, end) byte range of a file (default: the whole file)
+    into at most `count` [start, end) ranges.
+
+    `start` must be the beginning of a line. Every range starts at the
+    beginning of a line and ends right after a newline (or at `end`), so no
+    line is ever split between two ranges.
+    """
+    if end is None:
+        end = os.path.getsize(file_path)
+    size = end - start
+    if size <= 0:
+        return []
+
+    count = max(1, min(count, size))
+    boundaries = [start]
+    with open(file_path, 'rb') as f:
+        for i in range(1, count):
+            target = start + size * i // count
+            if target <= boundaries[-1]:
+                continue
+            # Finish the line that contains byte target-1; the next line starts at tell()
+            f.seek(target - 1)
+            f.readline()
+            position = f.tell()
+            if position >= end:
+                break
+            if position > boundaries[-1]:
+                boundaries.append(position)
+    boundaries.append(end)
+
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def iter_lines_in_range(file_path: str, start: int, end: int) -> Iterator[str]:
+    """Yield the decoded lines of the [start, end) byte range of a file."""
+    remaining = end - start
+    if remaining <= 0:
+        return
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        for raw in f:
+            yield raw.decode('utf-8', 'ignore')
+            remaining -= len(raw)
+            if remaining <= 0:
+                break
+
+
+def count_lines_in_range(file_path: str, start: int, end: int) -> int:
+    """Number of lines in the [start, end) byte range (a trailing partial line counts)."""
+    count = 0
+    last_byte = b''
+    with open(file_path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(COUNT_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            count += block.count(b'\n')
+            last_byte = block[-1:]
+            remaining -= len(block)
+    if last_byte and last_byte != b'\n':
+        count += 1
+    return count
+
+
+def complete_lines_end(file_path: str, size: Optional[int] = None) -> int:
+    """
+    Byte offset just past the last newline within the first `size` bytes.
+
+    A log that is still being written may end with a half-written line;
+    everything before the returned offset is made of complete lines.
+    """
+    if size is None:
+        size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        position = size
+        while position > 0:
+            block_start = max(0, position - TAIL_BLOCK_SIZE)
+            f.seek(block_start)
+            block = f.read(position - block_start)
+            newline = block.rfind(b'\n')
+            if newline >= 0:
+                return block_start + newline + 1
+            position = block_start
+    return 0
+
+
+def _compile_byte_search(markers: Iterable[str]):
+    """Fastest search(buffer, pos, end) -> (match_start, match_end) for the given markers."""
+    encoded = [marker.encode('utf-8') for marker in markers]
+    if len(encoded) == 1:
+        needle = encoded[0]
+
+        def search(buffer, pos, end):
+            index = buffer.find(needle, pos, end)
+            return (index, index + len(needle)) if index >= 0 else None
+        return search
+
+    pattern = re.compile(b'|'.join(re.escape(marker) for marker in encoded))
+
+    def search(buffer, pos, end):
+        match = pattern.search(buffer, pos, end)
+        return match.span() if match else None
+    return search
+
+
+def count_newlines(buffer, start: int, end: int) -> int:
+    """
+    Number of newlines in buffer[start:end] (bytes or mmap).
+
+    mmap has no count(), so the range is copied out COUNT_BLOCK_SIZE bytes at
+    a time; memory stays bounded however large the range is.
+    """
+    count = 0
+    while start < end:
+        block_end = min(start + COUNT_BLOCK_SIZE, end)
+        count += buffer[start:block_end].count(b'\n')
+        start = block_end
+    return count
+
+
+def _scan_marked_lines(buffer, search, start: int, end: int) -> Generator[Tuple[int, str], None, int]:
+    """
+    (line_number, line) for the marked lines of buffer[start:end], numbered from 1.
+
+    Returns the number of lines in the range (as count_lines_in_range), so
+    callers need no second pass over the bytes to count them.
+    """
+    line_number = 1
+    counted_to = start
+    pos = start
+    while pos < end:
+        span = search(buffer, pos, end)
+        if span is None:
+            break
+
+        newline = buffer.rfind(b'\n', start, span[0])
+        line_start = newline + 1 if newline >= 0 else start
+        line_end = buffer.find(b'\n', span[1], end)
+        line_end = line_end + 1 if line_end >= 0 else end
+
+        line_number += count_newlines(buffer, counted_to, line_start)
+        counted_to = line_start
+
+        yield line_number, buffer[line_start:line_end].decode('utf-8', 'ignore')
+        pos = line_end
+
+    if start >= end:
+        return 0
+    line_count = line_number - 1 + count_newlines(buffer, counted_to, end)
+    return line_count + 1 if buffer[end - 1:end] != b'\n' else line_count
+
+
+def iter_marked_lines(file_path: str, markers: Iterable[str],
+                      start: int = 0, end: Optional[int] = None) -> Generator[Tuple[int, str], None, int]:
+    """
+    Yield (line_number, line) for every line containing at least one marker.
+
+    The file is memory-mapped and scanned as bytes; non-matching lines are
+    never decoded. Line numbers are 1-based and relative to `start`.
+    Compressed files are scanned block by block as they are inflated (whole
+    file only). The generator returns the number of lines scanned.
+    """
+    if is_compressed(file_path):
+        scan = LogLineScan(file_path, markers, start, end)
+        yield from scan
+        return scan.line_count
+
+    search = _compile_byte_search(markers)
+
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if end is None or end > size:
+            end = size
+        if start >= end:
+            return 0
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return (yield from _scan_marked_lines(mm, search, start, end))
+
+
+def iter_decompressed_blocks(file_path: str) -> Iterator[bytes]:
+    """
+    Yield the decompressed contents of file_path in DECOMPRESS_BLOCK_SIZE blocks.
+
+    Inflating runs on a background thread (zlib/bz2/zstd release the GIL)
+    that stays at most DECOMPRESS_QUEUE_BLOCKS blocks ahead of the consumer.
+    """
+    blocks: queue.Queue = queue.Queue(maxsize=DECOMPRESS_QUEUE_BLOCKS)
+    stopped = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                blocks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def inflate():
+        try:
+            with open_decompressed(file_path) as f:
+                while True:
+                    block = f.read(DECOMPRESS_BLOCK_SIZE)
+                    if not block or not put(block):
+                        break
+        except BaseException as e:
+            put(e)
+        put(done)
+
+    thread = threading.Thread(target=inflate, name=f"inflate {os.path.basename(file_path)}", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = blocks.get()
+            if item is done:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Also reached when the consumer stops early; lets the thread exit
+        stopped.set()
+
+
+class LogLineScan:
+    """
+    Iterable of (line_number, line) over a plain or compressed log file.
+
+    With markers, only lines containing one of them are yielded (see
+    iter_marked_lines); otherwise every line is. Plain files may be limited
+    to the [start, end) byte range; compressed files are always read whole.
+    Line numbers are 1-based and relative to `start`. Once iteration has
+    finished, line_count holds the number of lines in the scanned range.
+    """
+
+    def __init__(self, file_path: str, markers: Optional[Iterable[str]] = None,
+                 start: int = 0, end: Optional[int] = None):
+        self.file_path = file_path
+        self.markers = None if markers is None else tuple(markers)
+        self.start = start
+        self.end = end
+        self.line_count = 0
+        if start and is_compressed(file_path):
+            raise ValueError(f"Compressed log {file_path} can only be read from the start")
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        if is_compressed(self.file_path):
+            yield from self._iter_compressed()
+            return
+
+        end = self.end if self.end is not None else os.path.getsize(self.file_path)
+        if self.markers is not None:
+            self.line_count = yield from iter_marked_lines(self.file_path, self.markers, self.start, end)
+        else:
+            line_number = 0
+            for line_number, line in enumerate(iter_lines_in_range(self.file_path, self.start, end), 1):
+                yield line_number, line
+            self.line_count = line_number
+
+    def _iter_compressed(self) -> Iterator[Tuple[int, str]]:
+        search = _compile_byte_search(self.markers) if self.markers is not None else None
+        lines_before = 0
+        pending = b''
+        for block in iter_decompressed_blocks(self.file_path):
+            buffer = pending + block if pending else block
+            cut = buffer.rfind(b'\n') + 1
+            if cut:
+                yield from self._iter_buffer(buffer, cut, search, lines_before)
+                lines_before += buffer.count(b'\n', 0, cut)
+            pending = buffer[cut:]
+        if pending:
+            yield from self._iter_buffer(pending, len(pending), search, lines_before)
+            lines_before += 1
+        self.line_count = lines_before
+
+    @staticmethod
+    def _iter_buffer(buffer: bytes, end: int, search, lines_before: int) -> Iterator[Tuple[int, str]]:
+        if search is not None:
+            for line_number, line in _scan_marked_lines(buffer, search, 0, end):
+                yield lines_before + line_number, line
+        else:
+            lines = buffer[:end].split(b'\n')
+            last = lines.pop()  # b'' after a final newline, else an unterminated last line
+            line_number = lines_before
+            for line_number, raw in enumerate(lines, lines_before + 1):
+                yield line_number, raw.decode('utf-8', 'ignore') + '\n'
+            if last:
+                yield line_number + 1, last.decode('utf-8', 'ignore')
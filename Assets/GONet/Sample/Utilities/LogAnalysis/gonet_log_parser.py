@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Shared GONetLog line tokenizer used by all of the log analysis scripts.
+
+Every GONetLog line starts with the same header, so it is split exactly once
+per line into a compact LogRecord instead of each analyzer re-deriving the
+pieces with its own re.search() calls.
+
+Supported header layouts (see GONetLog.cs):
+    File output (logger thread):
+        [INFO][Server] (Thread:5) 2025-10-13 12:34:56.789 (frame:123/4.5678s) Log:Info [Tag] message
+    Profile output routed to the main log:
+        [DEBUG][Client:2] (Thread:5) 2025-10-13 12:34:56.789 [Log:Debug][Client:2] (Thread:5) (frame:123/4.5678s) [Tag] message
+    Editor console / profile files:
+        [Log:Info][Client:1] (Thread:1) (13 Oct 2025 9:05:01.123) (frame:123/4.5678s) [Tag] message
+
+Lines without a header (stack traces, multi-line messages) yield no record.
+
+Diagnostic messages written as "key:value key:value" ([PhysicsTime],
+[VelocitySync][ANCHOR-FALLBACK], ...) are decoded by FieldTokenizer, which
+pulls every field out in one scan into a typed NamedTuple.
+
+Usage (as a library):
+    from gonet_log_parser import iter_log_records
+
+    for line_number, record in iter_log_records("gonet-2025-10-13.log"):
+        if record.tag == 'PhysicsTime':
+            ...
+"""
+
+import re
+import sys
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple, Union, get_args, get_origin, get_type_hints
+
+from gonet_log_io import LogLineScan
+
+
+class LogRecord(NamedTuple):
+    """Tokenized GONetLog header plus the remaining message text."""
+    level: str                   # INFO, DEBUG, WARNING, ERROR, FATAL, VERBOSE
+    role: Optional[str]          # "Server", "Client" or None (role not yet known)
+    authority_id: Optional[int]  # Client authority id, None for server/unknown
+    thread_id: int
+    timestamp: str               # Wall-clock timestamp as written ("" if absent)
+    frame: Optional[int]         # GONet frame count
+    elapsed: Optional[float]     # GONet elapsed seconds
+    tag: Optional[str]           # First bracketed tag of the message, e.g. "PhysicsTime"
+    message: str                 # Message text after the header (tag included)
+
+    @property
+    def peer(self) -> Optional[str]:
+        """Peer label as it appears in the header: "Server" or "Client:N" (one shared string per peer)."""
+        if self.role == 'Client' and self.authority_id is not None:
+            label = _CLIENT_PEER_LABELS.get(self.authority_id)
+            if label is None:
+                label = _CLIENT_PEER_LABELS[self.authority_id] = sys.intern(f"Client:{self.authority_id}")
+            return label
+        return self.role
+
+
+# Authority id -> "Client:N", so millions of records share a handful of peer strings
+_CLIENT_PEER_LABELS: Dict[int, str] = {}
+
+
+def peer_sort_key(peer: str) -> Tuple[bool, str, int]:
+    """Server first, then clients by authority id ("Client:2" before "Client:10")"""
+    role, _, authority = peer.partition(':')
+    return (role != 'Server', role, int(authority) if authority.isdigit() else -1)
+
+
+# Single pass over the header. Groups:
+#   1 level, 2 role, 3 authority id, 4 thread id, 5 timestamp,
+#   6 frame, 7 elapsed seconds, 8 tag (lookahead, not consumed), 9 message
+LOG_HEADER_PATTERN = re.compile(
+    r'\[([^\]\[]+)\]'
+    r'(?:\[(Server|Client)(?::(\d+))?\])?'
+    r' \(Thread:(\d+)\) '
+    r'(?:\(?(\d{4}-\d{2}-\d{2} \d{1,2}:\d{2}:\d{2}[.,]\d{3}|\d{1,2} \w{3} \d{4} \d{1,2}:\d{2}:\d{2}\.\d{3})\)? )?'
+    r'(?:\[[^\]\[]+\](?:\[[^\]\[]+\])? \(Thread:\d+\) )?'
+    r'\(frame:(\d*)/([^s)]*)s\) ?'
+    r'(?:Log:\w+ )?'
+    r'(?:(?=\[([^\]\[]+)\]))?'
+    r'(.*)'
+)
+
+
+def _normalize_level(level: str) -> str:
+    """Map both "INFO" and the editor's "Log:Info" key to "INFO"."""
+    if level.startswith('Log:'):
+        level = level[4:]
+    return sys.intern(level.upper())
+
+
+# Consecutive lines usually share their millisecond timestamp; records that
+# are kept (e.g. in analyzer event lists) then share one string object
+_last_timestamp = ""
+
+
+def _shared_timestamp(timestamp: Optional[str]) -> str:
+    global _last_timestamp
+    if not timestamp:
+        return ""
+    if timestamp != _last_timestamp:
+        _last_timestamp = timestamp
+    return _last_timestamp
+
+
+def _parse_elapsed(text: str) -> Optional[float]:
+    if not text:
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        # ElapsedSeconds is written with the current culture (e.g. "4,5678")
+        try:
+            return float(text.replace(',', '.'))
+        except ValueError:
+            return None
+
+
+# Layouts of LogRecord.timestamp: file output and editor console
+TIMESTAMP_FORMATS = ('%Y-%m-%d %H:%M:%S.%f', '%d %b %Y %H:%M:%S.%f')
+
+
+def parse_log_timestamp(timestamp: str) -> Optional[datetime]:
+    """Convert a LogRecord.timestamp string to a datetime (None if empty/unknown)."""
+    if not timestamp:
+        return None
+    timestamp = timestamp.replace(',', '.')
+    for timestamp_format in TIMESTAMP_FORMATS:
+        try:
+            return datetime.strptime(timestamp, timestamp_format)
+        except ValueError:
+            pass
+    return None
+
+
+# Date layouts of the date part of LogRecord.timestamp, and the epoch seconds of each date seen
+DATE_FORMATS = ('%Y-%m-%d', '%d %b %Y')
+_EPOCH = datetime(1970, 1, 1)
+_day_seconds: Dict[str, Optional[float]] = {}
+
+
+def timestamp_seconds(timestamp: str) -> Optional[float]:
+    """
+    LogRecord.timestamp as wall-clock seconds since 1970 (None if empty/unknown).
+
+    Cheap enough to call on every line: the date is parsed once per day and
+    the time of day is split by hand instead of going through strptime().
+    """
+    day, _, time_of_day = timestamp.rpartition(' ')
+    day_seconds = _day_seconds.get(day)
+    if day_seconds is None:
+        if day in _day_seconds or not day:
+            return None
+        for date_format in DATE_FORMATS:
+            try:
+                day_seconds = (datetime.strptime(day, date_format) - _EPOCH).total_seconds()
+                break
+            except ValueError:
+                pass
+        _day_seconds[day] = day_seconds
+        if day_seconds is None:
+            return None
+    try:
+        hours, minutes, seconds = time_of_day.split(':')
+        return day_seconds + int(hours) * 3600 + int(minutes) * 60 + float(seconds.replace(',', '.'))
+    except ValueError:
+        return None
+
+
+def parse_log_line(line: str) -> Optional[LogRecord]:
+    """
+    Tokenize a single GONetLog line.
+
+    Returns None for lines that do not carry a GONetLog header. The level,
+    role and tag strings are interned, so stored records do not each carry
+    their own copies.
+    """
+    match = LOG_HEADER_PATTERN.match(line)
+    if not match:
+        return None
+
+    level, role, authority, thread, timestamp, frame, elapsed, tag, message = match.groups()
+    return LogRecord(
+        level=_normalize_level(level),
+        role=sys.intern(role) if role else None,
+        authority_id=int(authority) if authority else None,
+        thread_id=int(thread),
+        timestamp=_shared_timestamp(timestamp),
+        frame=int(frame) if frame else None,
+        elapsed=_parse_elapsed(elapsed),
+        tag=sys.intern(tag) if tag else tag,
+        message=message.rstrip('\r\n'),
+    )
+
+
+def iter_log_records(file_path: str, markers: Optional[Iterable[str]] = None) -> Iterator[Tuple[int, LogRecord]]:
+    """
+    Stream (line_number, LogRecord) pairs from a GONetLog file.
+
+    Line numbers are 1-based and count every physical line, including the
+    header-less lines that are skipped. Compressed logs (.gz, .bz2, .zst) are
+    decompressed on the fly.
+
+    Args:
+        file_path: Path to log file
+        markers: Optional literal substrings (e.g. '[PhysicsTime]'); lines
+                 containing none of them are skipped before tokenizing. Such
+                 files are scanned as raw bytes so skipped lines are never decoded.
+    """
+    for line_number, line in LogLineScan(file_path, markers):
+        record = parse_log_line(line)
+        if record is not None:
+            yield line_number, record
+
+
+# One "key:value" field of a diagnostic message that has parenthesized values. Groups:
+#   1 key, 2 parenthesized value, e.g. "moving:(x:False y:True z:False)",
+#   3 bare value, which ends at whitespace or a separating comma/semicolon
+#     (a comma between digits is kept for decimal-comma cultures: "std:0,0200000")
+FIELD_PATTERN = re.compile(r'(?<![\w.])([A-Za-z_][\w.]*):(?:\(([^()]*)\)|([^\s(),;]+(?:,\d[^\s(),;]*)*))')
+
+# Leading number of a value with a unit or trailing punctuation ("1.312s", "0.0200000.")
+NUMBER_PREFIX_PATTERN = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+
+
+def iter_fields(text: str) -> Iterator[Tuple[str, str]]:
+    """
+    Yield the (key, value) pairs of a "key:value key:value" message in order.
+
+    A parenthesized value is yielded as its inner text; when it holds key:value
+    pairs itself they are also yielded under "outer.inner" keys
+    ("moving:(x:False)" gives ("moving", "x:False") and ("moving.x", "False")).
+    """
+    if '(' not in text:
+        # Plain whitespace-separated fields: str.split() is several times faster than the pattern
+        for token in text.split():
+            key, separator, value = token.partition(':')
+            if separator and key:
+                yield key, value.rstrip(',;')
+        return
+    for key, group, value in FIELD_PATTERN.findall(text):
+        if value:
+            yield key, value
+        else:
+            yield key, group
+            for inner_key, inner_group, inner_value in FIELD_PATTERN.findall(group):
+                yield f"{key}.{inner_key}", inner_value or inner_group
+
+
+def _to_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        match = NUMBER_PREFIX_PATTERN.match(text.replace(',', '.'))
+        if match:
+            return float(match.group())
+        raise
+
+
+def _to_int(text: str) -> int:
+    try:
+        return int(text)
+    except ValueError:
+        match = NUMBER_PREFIX_PATTERN.match(text)
+        if match and match.group().lstrip('+-').isdigit():
+            return int(match.group())
+        raise
+
+
+_BOOLEANS = {'True': True, 'False': False, 'true': True, 'false': False}
+
+
+def _to_bool(text: str) -> bool:
+    try:
+        return _BOOLEANS[text]
+    except KeyError:
+        raise ValueError(text) from None
+
+
+_FIELD_CONVERTERS = {float: _to_float, int: _to_int, bool: _to_bool, str: sys.intern}
+_MISSING = object()
+
+
+class FieldTokenizer:
+    """
+    Decodes the key:value fields of a diagnostic message into a NamedTuple in one scan.
+
+    The record's annotations pick each field's converter (float, int, bool or
+    str, optionally Optional[...]); floats tolerate a unit suffix such as
+    "1.312s". Fields with a default are optional and keep the default when the
+    key is missing or its value does not convert. A message missing a field
+    without a default, or holding an unconvertible value for one, decodes to None.
+    When a key repeats, the first occurrence wins.
+
+    Usage:
+        class AnchorFallback(NamedTuple):
+            gonetid: int
+            idx: int
+            time_since_anchor: float
+
+        tokenizer = FieldTokenizer(AnchorFallback, {'GONetId': 'gonetid', 'timeSinceAnchor': 'time_since_anchor'})
+        tokenizer.parse("[VelocitySync][ANCHOR-FALLBACK] GONetId:1050 idx:0 type:Vector3 timeSinceAnchor:1.312s")
+    """
+
+    def __init__(self, record_type: type, keys: Optional[Dict[str, str]] = None):
+        """
+        Args:
+            record_type: NamedTuple class of the decoded record
+            keys: Message key -> record field, for keys not spelled like their
+                  field (e.g. {'gonet.std': 'gonet_std', 'moving.x': 'moving_x'});
+                  other fields are read from the key of the same name
+        """
+        hints = get_type_hints(record_type)
+        defaults = record_type._field_defaults
+        names = dict(keys or {})
+        for field_name in names.values():
+            if field_name not in record_type._fields:
+                raise ValueError(f"{record_type.__name__} has no field '{field_name}'")
+        names.update((field_name, field_name) for field_name in record_type._fields if field_name not in names.values())
+
+        self.record_type = record_type
+        self._defaults = [defaults.get(field_name, _MISSING) for field_name in record_type._fields]
+        # key -> (field index, converter)
+        self._slots = {key: (record_type._fields.index(field_name), self._converter(hints[field_name]))
+                       for key, field_name in names.items()}
+        self._required = any(default is _MISSING for default in self._defaults)
+
+    @staticmethod
+    def _converter(hint) -> Callable[[str], object]:
+        if get_origin(hint) is Union:
+            hint = next(arg for arg in get_args(hint) if arg is not type(None))
+        converter = _FIELD_CONVERTERS.get(hint)
+        if converter is None:
+            raise TypeError(f"Unsupported field type {hint!r}")
+        return converter
+
+    def parse(self, text: str):
+        """Decode the fields of text into a record (None when a required field is missing or invalid)."""
+        pending = self._slots.copy()
+        values = self._defaults.copy()
+        for key, value in iter_fields(text):
+            slot = pending.pop(key, None)
+            if slot is None:
+                continue
+            index, convert = slot
+            try:
+                values[index] = convert(value)
+            except ValueError:
+                if values[index] is _MISSING:
+                    return None
+            if not pending:
+                break
+        if self._required and _MISSING in values:
+            return None
+        return self.record_type._make(values)
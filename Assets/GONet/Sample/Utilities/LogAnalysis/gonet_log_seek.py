@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Time-window seeking (--since / --until) for GONet logs.
+
+Every GONetLog header carries a wall-clock timestamp, and the logger thread
+writes lines in time order. find_time_window() therefore binary-searches a
+log by byte offset - jumping to an offset, resyncing to the next line start
+and reading the first timestamp found there - to locate the bytes of the
+requested window. Only that slice is handed to the analyzers.
+
+An optional sidecar index (<log>.timeindex.gonetcache, built with
+--time-index) samples one timestamp per TIME_INDEX_SPACING bytes, so repeated
+window queries narrow the search to a single sample gap without any probing
+of the log. It is extended incrementally while a live log grows.
+"""
+
+import os
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import BinaryIO, Callable, List, Optional, Sequence, Tuple
+
+from gonet_log_cache import load_event_cache, save_event_cache
+from gonet_log_io import complete_lines_end, is_compressed
+from gonet_log_parser import LOG_HEADER_PATTERN, parse_log_timestamp
+
+# Below this many bytes the binary search switches to a line-by-line scan
+SEEK_LINEAR_BYTES = 64 * 1024
+
+# Distance between two samples of the optional timestamp -> offset index
+TIME_INDEX_SPACING = 1024 * 1024
+TIME_INDEX_CACHE_NAME = 'timeindex'
+
+# Accepted --since/--until layouts; time-only values use the date of the first log line
+TIME_BOUND_FORMATS = ('%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M', '%Y-%m-%d')
+TIME_OF_DAY_FORMATS = ('%H:%M:%S.%f', '%H:%M:%S', '%H:%M')
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _line_timestamp(line: bytes) -> Optional[datetime]:
+    match = LOG_HEADER_PATTERN.match(line.decode('utf-8', 'ignore'))
+    return parse_log_timestamp(match.group(5)) if match else None
+
+
+def _next_timestamped_line(f: BinaryIO, offset: int, size: int) -> Optional[Tuple[int, int, datetime]]:
+    """(line start, line end, timestamp) of the first timestamped line starting at or after offset."""
+    if offset > 0:
+        f.seek(offset - 1)
+        if f.read(1) != b'\n':
+            f.readline()  # Resync: finish the line that contains offset
+    else:
+        f.seek(0)
+
+    position = f.tell()
+    while position < size:
+        line = f.readline()
+        if not line:
+            break
+        timestamp = _line_timestamp(line)
+        if timestamp is not None:
+            return position, position + len(line), timestamp
+        position += len(line)
+    return None
+
+
+def _lower_bound(f: BinaryIO, size: int, reached: Callable[[datetime], bool], lo: int, hi: int) -> int:
+    """
+    Start of the first timestamped line for which reached(timestamp) is true
+    (size if there is none).
+
+    lo must be a line start with every earlier line not reached yet; the
+    answer must start at or before hi.
+    """
+    while hi - lo > SEEK_LINEAR_BYTES:
+        mid = (lo + hi) // 2
+        found = _next_timestamped_line(f, mid, size)
+        if found is None or reached(found[2]):
+            hi = mid
+        else:
+            lo = found[1]
+
+    position = lo
+    while True:
+        found = _next_timestamped_line(f, position, size)
+        if found is None:
+            return size
+        if reached(found[2]):
+            return found[0]
+        position = found[1]
+
+
+def _epoch_seconds(timestamp: datetime) -> float:
+    return (timestamp - EPOCH).total_seconds()
+
+
+def load_time_index(file_path: str) -> Tuple[array, array]:
+    """(offsets, epoch seconds) samples of the timestamp index, built or extended as needed."""
+    size = os.path.getsize(file_path)
+    mtime_ns = os.stat(file_path).st_mtime_ns
+    cached = load_event_cache(file_path, TIME_INDEX_CACHE_NAME)
+    if cached is not None and cached.is_current:
+        return cached.columns['offset'], cached.columns['timestamp']
+
+    if cached is not None:
+        offsets, stamps = cached.columns['offset'], cached.columns['timestamp']
+        start = cached.end_offset
+    else:
+        print(f"[INDEX] Building timestamp index for {file_path}")
+        offsets, stamps = array('q'), array('d')
+        start = 0
+
+    end = complete_lines_end(file_path, size)
+    with open(file_path, 'rb') as f:
+        for position in range(start, end, TIME_INDEX_SPACING):
+            found = _next_timestamped_line(f, position, end)
+            if found is not None and (not offsets or found[0] > offsets[-1]):
+                offsets.append(found[0])
+                stamps.append(_epoch_seconds(found[2]))
+
+    save_event_cache(file_path, TIME_INDEX_CACHE_NAME, {'offset': offsets, 'timestamp': stamps},
+                     end, 0, 0, size, mtime_ns)
+    return offsets, stamps
+
+
+def _search_bounds(index: Optional[Tuple[array, array]], bound: datetime, inclusive: bool,
+                   size: int) -> Tuple[int, int]:
+    """Byte range [lo, hi] that must contain the window bound (whole file without an index)."""
+    if index is None:
+        return 0, size
+    offsets, stamps = index
+    seconds = _epoch_seconds(bound)
+    sample = bisect_left(stamps, seconds) if inclusive else bisect_right(stamps, seconds)
+    lo = offsets[sample - 1] if sample > 0 else 0
+    hi = offsets[sample] if sample < len(offsets) else size
+    return lo, hi
+
+
+def find_time_window(file_path: str, since: Optional[datetime], until: Optional[datetime],
+                     use_index: bool = False) -> Tuple[int, int]:
+    """
+    Byte range [start, end) of the lines logged between since and until (inclusive).
+
+    Either bound may be None (start/end of file). Assumes the log's
+    timestamps increase through the file, as GONetLog writes them.
+    """
+    size = os.path.getsize(file_path)
+    index = load_time_index(file_path) if use_index else None
+    with open(file_path, 'rb') as f:
+        start = 0
+        if since is not None:
+            lo, hi = _search_bounds(index, since, True, size)
+            start = _lower_bound(f, size, lambda timestamp: timestamp >= since, lo, hi)
+        end = size
+        if until is not None:
+            lo, hi = _search_bounds(index, until, False, size)
+            end = max(start, _lower_bound(f, size, lambda timestamp: timestamp > until, max(lo, start), max(hi, start)))
+    return start, end
+
+
+def first_log_timestamp(file_path: str) -> Optional[datetime]:
+    with open(file_path, 'rb') as f:
+        found = _next_timestamped_line(f, 0, os.path.getsize(file_path))
+    return found[2] if found else None
+
+
+def parse_time_bound(text: str, reference: Optional[datetime]) -> datetime:
+    """
+    Parse a --since/--until value: "2025-10-13 12:34:56[.789]", "2025-10-13 12:34"
+    or a time of day "12:34[:56[.789]]" on the date of `reference`.
+
+    Raises ValueError for anything else.
+    """
+    text = text.strip().replace('T', ' ').replace(',', '.')
+    for bound_format in TIME_BOUND_FORMATS:
+        try:
+            return datetime.strptime(text, bound_format)
+        except ValueError:
+            pass
+    for time_format in TIME_OF_DAY_FORMATS:
+        try:
+            time_of_day = datetime.strptime(text, time_format).time()
+        except ValueError:
+            continue
+        if reference is None:
+            raise ValueError(f"'{text}' has no date and the log has no timestamps to take it from")
+        return datetime.combine(reference.date(), time_of_day)
+    raise ValueError(f"'{text}' is not a date/time such as '2025-10-13 12:34:56' or '12:34:56'")
+
+
+def resolve_time_window(log_files: Sequence[str], since: Optional[str],
+                        until: Optional[str]) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Turn --since/--until text into datetimes (exits with an error message on bad values)."""
+    if any(is_compressed(log_file) for log_file in log_files):
+        print("[ERROR] --since/--until need seekable (uncompressed) logs")
+        sys.exit(1)
+
+    reference = first_log_timestamp(log_files[0])
+    bounds: List[Optional[datetime]] = []
+    for flag, text in (('--since', since), ('--until', until)):
+        try:
+            bounds.append(parse_time_bound(text, reference) if text else None)
+        except ValueError as e:
+            print(f"[ERROR] Invalid {flag} value: {e}")
+            sys.exit(1)
+    return bounds[0], bounds[1]
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory streaming statistics shared by the GONet log analyzers.
+
+StreamingStats replaces "collect every value in a list, then min/avg/max":
+
+    - count, mean and variance are kept with Welford's online algorithm
+    - min and max are exact
+    - percentiles (p50, p90, p99, p99.9, ...) come from a log-bucketed
+      histogram in the spirit of HDR histograms / DDSketch: a value v lands
+      in bucket ceil(log(|v|) / log(gamma)), so every reported percentile is
+      within PERCENTILE_RELATIVE_ACCURACY (1%) of the true value
+
+Memory depends on the value RANGE (a few hundred buckets per decade of
+magnitudes at most), not on how many values were added, so a week-long
+session costs the same as a one-minute test. Two StreamingStats merge
+exactly (counts add, Welford moments combine), so partial results from
+parallel chunks or several log files can be combined.
+
+Usage:
+    from gonet_log_stats import StreamingStats
+
+    delays = StreamingStats()
+    for delay in ...:
+        delays.add(delay)
+    print(delays.mean, delays.max, delays.percentile(99.9))
+    print(delays.format_percentiles('.2f', ' frames'))
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # Optional: only speeds up StreamingStats.update() on NumPy arrays
+    np = None
+
+# Maximum relative error of a reported percentile
+PERCENTILE_RELATIVE_ACCURACY = 0.01
+
+# Percentiles printed by format_percentiles() unless told otherwise
+REPORT_PERCENTILES = (50, 90, 99, 99.9)
+
+_GAMMA = (1 + PERCENTILE_RELATIVE_ACCURACY) / (1 - PERCENTILE_RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(_GAMMA)
+
+
+class StreamingStats:
+    """Mergeable count/mean/variance/min/max plus log-bucketed percentiles. NaN values are ignored."""
+
+    __slots__ = ('count', 'mean', '_m2', 'min', 'max', '_positive', '_negative', '_zeros')
+
+    def __init__(self, values: Iterable[float] = ()):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._positive: Dict[int, int] = {}  # bucket key -> count, for values > 0
+        self._negative: Dict[int, int] = {}  # bucket key of |value| -> count, for values < 0
+        self._zeros = 0
+        self.update(values)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+
+    def add(self, value: float):
+        if value != value:
+            return
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value > 0:
+            key = math.ceil(math.log(value) / _LOG_GAMMA)
+            self._positive[key] = self._positive.get(key, 0) + 1
+        elif value < 0:
+            key = math.ceil(math.log(-value) / _LOG_GAMMA)
+            self._negative[key] = self._negative.get(key, 0) + 1
+        else:
+            self._zeros += 1
+
+    def update(self, values: Iterable[float]):
+        """Add many values (NumPy arrays are bucketed in one vectorized step)."""
+        if np is not None and isinstance(values, np.ndarray):
+            self.merge(_from_array(values))
+            return
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: 'StreamingStats'):
+        """Combine other's values into this one (Chan et al. parallel variance)."""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self._m2 = other.count, other.mean, other._m2
+        else:
+            count = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / count
+            self._m2 += other._m2 + delta * delta * self.count * other.count / count
+            self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        for key, count in other._positive.items():
+            self._positive[key] = self._positive.get(key, 0) + count
+        for key, count in other._negative.items():
+            self._negative[key] = self._negative.get(key, 0) + count
+        self._zeros += other._zeros
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Value at the given percentile (0-100), None if nothing was added."""
+        return self.percentiles((percent,))[0]
+
+    def percentiles(self, percents: Sequence[float]) -> List[Optional[float]]:
+        if not self.count:
+            return [None] * len(percents)
+
+        # Buckets in ascending value order: most negative first, zeros, then positives
+        buckets = [(-_bucket_value(key), count) for key, count in sorted(self._negative.items(), reverse=True)]
+        if self._zeros:
+            buckets.append((0.0, self._zeros))
+        buckets.extend((_bucket_value(key), count) for key, count in sorted(self._positive.items()))
+
+        results = []
+        for percent in percents:
+            if percent <= 0:
+                results.append(self.min)
+                continue
+            if percent >= 100:
+                results.append(self.max)
+                continue
+            rank = percent / 100 * (self.count - 1)
+            seen = 0
+            for value, count in buckets:
+                seen += count
+                if seen > rank:
+                    break
+            results.append(min(max(value, self.min), self.max))
+        return results
+
+    def format_percentiles(self, value_format: str = '.3f', unit: str = '', scale: float = 1.0,
+                           percents: Sequence[float] = REPORT_PERCENTILES) -> str:
+        """E.g. "p50=16.67ms p90=16.70ms p99=33.40ms p99.9=50.10ms" (values multiplied by scale)."""
+        return ' '.join(f"p{percent:g}={value * scale:{value_format}}{unit}"
+                        for percent, value in zip(percents, self.percentiles(percents)) if value is not None)
+
+
+def _bucket_value(key: int) -> float:
+    """Representative value of bucket (gamma^(key-1), gamma^key]: within the relative accuracy of every member."""
+    return 2 * _GAMMA ** key / (_GAMMA + 1)
+
+
+def _from_array(values) -> StreamingStats:
+    stats = StreamingStats()
+    values = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+    if not len(values):
+        return stats
+    values = values.astype(np.float64)
+    stats.count = int(len(values))
+    stats.mean = float(values.mean())
+    stats._m2 = float(((values - stats.mean) ** 2).sum())
+    stats.min = float(values.min())
+    stats.max = float(values.max())
+    for sign, buckets in ((1, stats._positive), (-1, stats._negative)):
+        magnitudes = values[values * sign > 0] * sign
+        if len(magnitudes):
+            keys, counts = np.unique(np.ceil(np.log(magnitudes) / _LOG_GAMMA).astype(np.int64), return_counts=True)
+            buckets.update(zip(keys.tolist(), counts.tolist()))
+    stats._zeros = int(np.count_nonzero(values == 0))
+    return stats
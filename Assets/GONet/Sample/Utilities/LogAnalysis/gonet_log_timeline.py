@@ -0,0 +1,419 @@
+#!/usr/bin/env python3
+"""
+Cross-peer timeline: every peer's log lines and event exports merged into
+one stream ordered on a single clock.
+
+Wall-clock timestamps differ per machine, and a client's GONet time only
+follows the time authority (the server) through TimeSync: before the first
+sync it is the client's own uptime, afterwards it is off by the residual the
+next sync corrects. The timeline therefore puts every entry on the time
+authority's GONet clock:
+
+    aligned seconds = local GONet seconds + offset(peer, local GONet seconds)
+
+where offset is "FromAuthority - EffectiveTicks" of the peer's next
+"[TimeSync-DIAG] SetFromAuthority" line: each sync measures the error that
+built up since the previous one (before the first sync, the whole initial
+gap) and then corrects it, so the lines after a peer's last sync keep
+offset 0. Peers without such lines - the server, or clients with the
+diagnostic disabled - keep offset 0 throughout. Log lines use the
+"(frame:N/Es)" header time, export events their OccurredAtElapsedTicks.
+
+Each source - one log file, a folder of daily logs, one export - is read
+lazily in file order. Entries of a source are re-sorted within a small
+REORDER_WINDOW (a log shared by several peers interleaves them, and offsets
+move at every sync), then heapq.merge() combines the sources. Memory is
+bounded by the window, not by the size of the logs.
+
+Any LogAnalyzer can consume the merged stream (LogAnalyzer.consume_timeline,
+see run_timeline()), so cross-peer latency questions become one pass.
+
+Usage:
+    python3 gonet_log_timeline.py <log file or folder>... [--exports <folder or file>]...
+                                  [--grep <text>] [--limit <N>] [--ready-latency]
+                                  [--since <time>] [--until <time>] [--jobs <N>]
+
+    Prints the clock offsets per peer, then the merged timeline (optionally
+    only entries containing --grep text, at most --limit entries).
+    --ready-latency instead reports how long after the first peer every other
+    peer fired OnGONetReady for the same GONetId.
+
+    from gonet_log_timeline import estimate_clock_offsets, run_timeline
+
+    offsets = estimate_clock_offsets(['server/gonet-2025-10-13.log', 'client1/gonet-2025-10-13.log'])
+    run_timeline(['server/gonet-2025-10-13.log', 'client1/gonet-2025-10-13.log'], exports, [analyzer], offsets)
+"""
+
+import glob
+import heapq
+import os
+import re
+import sys
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from gonet_log_driver import LogAnalyzer, combined_markers, parse_int_option, parse_str_option, run_analyzers
+from gonet_log_events import EXPORT_FILE_GLOB, TICKS_PER_SECOND, ExportEvent, iter_export_events, read_export_header
+from gonet_log_io import LogLineScan, expand_log_inputs
+from gonet_log_parser import LogRecord, parse_log_line
+from gonet_log_seek import find_time_window, resolve_time_window
+from gonet_log_stats import StreamingStats
+
+SET_FROM_AUTHORITY_PATTERN = re.compile(r'EffectiveTicks=(-?\d+)ms, FromAuthority=(-?\d+)ms')
+
+# Seconds an entry may lag behind a later-timed entry of the same source and still be emitted in order
+REORDER_WINDOW = 5.0
+
+EXPORT_ROLE_PATTERN = re.compile(r'Client(\d+)$')
+
+
+class TimelineEntry(NamedTuple):
+    """One log line or export event on the aligned clock."""
+    time: float                               # Seconds on the time authority's GONet clock
+    peer: str                                 # "Server" / "Client:N" (exports use the same labels)
+    source: str                               # Log or export file
+    position: int                             # Line number in the log, event index in the export
+    record: Union[LogRecord, ExportEvent]
+
+
+class ClockOffsets:
+    """Per peer, piecewise-constant offsets from local GONet seconds to the time authority's.
+
+    A sample (t, offset) is the error a sync measured at local time t; it
+    applies back to the previous sample, since the sync then corrects it.
+    """
+
+    def __init__(self):
+        self._samples: Dict[str, Tuple[array, array]] = {}  # peer -> (local seconds, offset seconds)
+
+    def add(self, peer: str, local_seconds: float, offset_seconds: float):
+        times, offsets = self._samples.setdefault(peer, (array('d'), array('d')))
+        times.append(local_seconds)
+        offsets.append(offset_seconds)
+
+    def merge(self, other: 'ClockOffsets'):
+        for peer, (times, offsets) in other._samples.items():
+            for local_seconds, offset_seconds in zip(times, offsets):
+                self.add(peer, local_seconds, offset_seconds)
+
+    def sort(self):
+        for peer, (times, offsets) in self._samples.items():
+            order = sorted(range(len(times)), key=times.__getitem__)
+            self._samples[peer] = (array('d', (times[i] for i in order)), array('d', (offsets[i] for i in order)))
+
+    @property
+    def peers(self) -> List[str]:
+        return list(self._samples)
+
+    def samples(self, peer: str) -> Tuple[array, array]:
+        return self._samples.get(peer, (array('d'), array('d')))
+
+    def offset(self, peer: str, local_seconds: float) -> float:
+        """Offset measured by the first sync at or after local_seconds (0 after the last sync)."""
+        samples = self._samples.get(peer)
+        if samples is None:
+            return 0.0
+        times, offsets = samples
+        index = bisect_left(times, local_seconds)
+        return offsets[index] if index < len(offsets) else 0.0
+
+    def align(self, peer: str, local_seconds: float) -> float:
+        return local_seconds + self.offset(peer, local_seconds)
+
+
+class ClockOffsetAnalyzer(LogAnalyzer):
+    """Collects the "[TimeSync-DIAG] SetFromAuthority" samples of every peer."""
+
+    markers = ('SetFromAuthority:',)
+    supports_chunks = True
+
+    def __init__(self):
+        self.offsets = ClockOffsets()
+
+    def chunk_spec(self):
+        return ClockOffsetAnalyzer, ()
+
+    def get_state(self):
+        return self.offsets
+
+    def merge_state(self, state, line_offset):
+        self.offsets.merge(state)
+
+    def consume(self, line_number, record):
+        if record.tag != 'TimeSync-DIAG' or not record.peer:
+            return
+        match = SET_FROM_AUTHORITY_PATTERN.search(record.message)
+        if match:
+            effective_ms, authority_ms = int(match.group(1)), int(match.group(2))
+            # Keyed by the line's header time: the clock the entries being aligned carry
+            local_seconds = record.elapsed if record.elapsed is not None else effective_ms / 1000.0
+            self.offsets.add(record.peer, local_seconds, (authority_ms - effective_ms) / 1000.0)
+
+    def finalize(self):
+        self.offsets.sort()
+
+
+def estimate_clock_offsets(log_sources: Sequence[Union[str, Sequence[str]]], jobs: int = 1,
+                           since: Optional[str] = None, until: Optional[str] = None) -> ClockOffsets:
+    """Read only the SetFromAuthority lines of all log sources (in jobs processes) into ClockOffsets."""
+    log_files = [log_file for source in log_sources for log_file in expand_log_inputs(source)]
+    analyzer = ClockOffsetAnalyzer()
+    if log_files:
+        run_analyzers(log_files, [analyzer], progress=False, jobs=jobs, since=since, until=until)
+    return analyzer.offsets
+
+
+def export_peer_label(role: Optional[str]) -> str:
+    """Export role ("Server", "ClientN") as a log peer label ("Server", "Client:N")."""
+    match = EXPORT_ROLE_PATTERN.match(role or '')
+    return f"Client:{match.group(1)}" if match else (role or 'Unknown')
+
+
+def expand_export_inputs(export_inputs: Iterable[str]) -> List[str]:
+    """Export files named directly, or the gonet-events-*.txt exports of a folder."""
+    exports = []
+    for item in export_inputs:
+        if os.path.isdir(item):
+            exports.extend(sorted(glob.glob(os.path.join(item, EXPORT_FILE_GLOB))))
+        elif os.path.exists(item):
+            exports.append(item)
+        else:
+            raise FileNotFoundError(item)
+    return exports
+
+
+def _iter_log_source(log_files: Sequence[Tuple[str, int, Optional[int]]], offsets: ClockOffsets,
+                     markers: Optional[Tuple[str, ...]]) -> Iterator[TimelineEntry]:
+    """Entries of one log source ((file, start, end) ranges read back to back) in file order."""
+    time = float('-inf')
+    for log_file, start, end in log_files:
+        for line_number, line in LogLineScan(log_file, markers, start, end):
+            record = parse_log_line(line)
+            if record is None:
+                continue
+            peer = record.peer or 'Unknown'
+            # Lines without a GONet time keep the time of the line before them
+            if record.elapsed is not None:
+                time = offsets.align(peer, record.elapsed)
+            yield TimelineEntry(time, peer, log_file, line_number, record)
+
+
+def _iter_export_source(export_file: str, offsets: ClockOffsets,
+                        event_types: Optional[Iterable[str]]) -> Iterator[TimelineEntry]:
+    peer = export_peer_label(read_export_header(export_file).role)
+    for event in iter_export_events(export_file, types=event_types):
+        yield TimelineEntry(offsets.align(peer, event.ticks / TICKS_PER_SECOND), peer, export_file, event.index, event)
+
+
+class TimelineMerge:
+    """
+    Iterable of TimelineEntry over all sources, ordered by aligned time.
+
+    Entries that lag more than reorder_window behind their source are still
+    yielded (late, out of order); once iteration has finished, late_entries
+    holds how many there were.
+    """
+
+    def __init__(self, log_sources: Sequence[Union[str, Sequence[str]]] = (), export_files: Sequence[str] = (),
+                 offsets: Optional[ClockOffsets] = None, markers: Optional[Iterable[str]] = None,
+                 event_types: Optional[Iterable[str]] = None, since: Optional[str] = None,
+                 until: Optional[str] = None, reorder_window: float = REORDER_WINDOW):
+        self.log_sources = [expand_log_inputs(source) for source in log_sources]
+        self.export_files = list(export_files)
+        self.offsets = offsets if offsets is not None else ClockOffsets()
+        self.markers = None if markers is None else tuple(markers)
+        self.event_types = event_types
+        self.since = since
+        self.until = until
+        self.reorder_window = reorder_window
+        self.late_entries = 0
+
+    def _log_ranges(self, log_files: Sequence[str]) -> List[Tuple[str, int, Optional[int]]]:
+        if not (self.since or self.until):
+            return [(log_file, 0, None) for log_file in log_files]
+        since_time, until_time = resolve_time_window(log_files, self.since, self.until)
+        return [(log_file, *find_time_window(log_file, since_time, until_time)) for log_file in log_files]
+
+    def _reordered(self, entries: Iterator[TimelineEntry]) -> Iterator[TimelineEntry]:
+        """Entries sorted by time, holding each back until the source is reorder_window past it."""
+        heap = []
+        latest = float('-inf')
+        emitted = float('-inf')
+        for sequence, entry in enumerate(entries):
+            heapq.heappush(heap, (entry.time, sequence, entry))
+            if entry.time > latest:
+                latest = entry.time
+            while heap[0][0] <= latest - self.reorder_window:
+                entry = heapq.heappop(heap)[2]
+                if entry.time < emitted:
+                    self.late_entries += 1
+                emitted = max(emitted, entry.time)
+                yield entry
+        while heap:
+            entry = heapq.heappop(heap)[2]
+            if entry.time < emitted:
+                self.late_entries += 1
+            emitted = max(emitted, entry.time)
+            yield entry
+
+    def __iter__(self) -> Iterator[TimelineEntry]:
+        streams = [self._reordered(_iter_log_source(self._log_ranges(log_files), self.offsets, self.markers))
+                   for log_files in self.log_sources]
+        streams.extend(self._reordered(_iter_export_source(export_file, self.offsets, self.event_types))
+                       for export_file in self.export_files)
+        return heapq.merge(*streams, key=attrgetter('time'))
+
+
+def dispatch_timeline(entries: Iterable[TimelineEntry], analyzers: Sequence[LogAnalyzer]) -> int:
+    """Send every timeline entry to every analyzer; returns the number of entries."""
+    consumers = [analyzer.consume_timeline for analyzer in analyzers]
+    count = 0
+    for count, entry in enumerate(entries, 1):
+        for consume in consumers:
+            consume(entry)
+    return count
+
+
+def run_timeline(log_sources: Sequence[Union[str, Sequence[str]]], export_files: Sequence[str],
+                 analyzers: Sequence[LogAnalyzer], offsets: Optional[ClockOffsets] = None,
+                 event_types: Optional[Iterable[str]] = None, since: Optional[str] = None,
+                 until: Optional[str] = None) -> TimelineMerge:
+    """Feed the merged timeline to the analyzers (only their marker lines), then finalize them."""
+    timeline = TimelineMerge(log_sources, export_files, offsets, combined_markers(analyzers), event_types,
+                             since, until)
+    dispatch_timeline(timeline, analyzers)
+    for analyzer in analyzers:
+        analyzer.finalize()
+    return timeline
+
+
+class ReadyLatencyAnalyzer(LogAnalyzer):
+    """Aligned delay between the first peer's OnGONetReady FIRED of a GONetId and every other peer's."""
+
+    markers = ('OnGONetReady FIRED',)
+
+    GONETID_PATTERN = re.compile(r'GONetId: (\d+)')
+
+    def __init__(self):
+        self.first_ready: Dict[int, Tuple[float, str]] = {}  # GONetId -> (aligned time, peer)
+        self.reported = set()  # (GONetId, peer) already counted
+        self.latency: Dict[Tuple[str, str], StreamingStats] = defaultdict(StreamingStats)  # (first peer, peer) -> ms
+
+    def consume(self, line_number, record):
+        pass  # Needs the aligned time: only meaningful through consume_timeline()
+
+    def consume_timeline(self, entry):
+        if not isinstance(entry.record, LogRecord) or 'OnGONetReady FIRED' not in entry.record.message:
+            return
+        match = self.GONETID_PATTERN.search(entry.record.message)
+        if not match:
+            return
+        gonetid = int(match.group(1))
+        first = self.first_ready.get(gonetid)
+        if first is None:
+            self.first_ready[gonetid] = (entry.time, entry.peer)
+        elif first[1] != entry.peer and (gonetid, entry.peer) not in self.reported:
+            self.reported.add((gonetid, entry.peer))
+            self.latency[(first[1], entry.peer)].add((entry.time - first[0]) * 1000.0)
+
+    def report(self):
+        print("=" * 80)
+        print("OnGONetReady CROSS-PEER LATENCY (first peer -> other peers, aligned clock)")
+        print("=" * 80)
+        print(f"GONetIds ready on some peer: {len(self.first_ready)}")
+        print()
+        if not self.latency:
+            print("No GONetId became ready on more than one peer.")
+        for (first_peer, peer), stats in sorted(self.latency.items()):
+            print(f"  {first_peer:>10} -> {peer:<10} {stats.count:7d} ids | avg {stats.mean:8.1f}ms | "
+                  f"{stats.format_percentiles('.1f', 'ms')}")
+        print()
+
+
+def print_clock_offsets(offsets: ClockOffsets, peers: Iterable[str]):
+    print("=" * 80)
+    print("CLOCK OFFSETS (local GONet time -> time authority's GONet time)")
+    print("=" * 80)
+    for peer in sorted(set(peers) | set(offsets.peers)):
+        times, values = offsets.samples(peer)
+        if not times:
+            print(f"  {peer}: no SetFromAuthority lines (offset 0)")
+            continue
+        stats = StreamingStats(value * 1000.0 for value in values)
+        print(f"  {peer}: {len(times)} SetFromAuthority samples, offset {stats.min:+.0f}..{stats.max:+.0f}ms, "
+              f"latest {values[-1] * 1000.0:+.0f}ms at {times[-1]:.3f}s")
+    print()
+
+
+def format_entry(entry: TimelineEntry) -> str:
+    record = entry.record
+    if isinstance(record, LogRecord):
+        return f"{entry.time:14.6f} {entry.peer:<10} [{record.level}] {record.message}"
+    gonetid = f" GONetId={record.gonetid}" if record.gonetid else ""
+    return f"{entry.time:14.6f} {entry.peer:<10} [Event {record.index:06d}] {record.type}{gonetid}"
+
+
+def _positional_args(argv: Sequence[str], value_flags: Sequence[str]) -> List[str]:
+    args = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg in value_flags:
+            skip = True
+        elif not arg.startswith('--'):
+            args.append(arg)
+    return args
+
+
+def main():
+    value_flags = ('--exports', '--grep', '--limit', '--since', '--until', '--jobs')
+    log_sources = _positional_args(sys.argv[1:], value_flags)
+    export_inputs = [sys.argv[i + 1] for i, arg in enumerate(sys.argv[:-1]) if arg == '--exports']
+    if not log_sources and not export_inputs:
+        print(__doc__)
+        sys.exit(1)
+
+    grep = parse_str_option(sys.argv, '--grep')
+    limit = parse_int_option(sys.argv, '--limit')
+    since = parse_str_option(sys.argv, '--since')
+    until = parse_str_option(sys.argv, '--until')
+    jobs = parse_int_option(sys.argv, '--jobs', default=1)
+
+    try:
+        export_files = expand_export_inputs(export_inputs)
+        offsets = estimate_clock_offsets(log_sources, jobs, since, until)
+    except FileNotFoundError as e:
+        print(f"ERROR: Not found: {e}")
+        sys.exit(1)
+
+    export_peers = [export_peer_label(read_export_header(export_file).role) for export_file in export_files]
+    print_clock_offsets(offsets, export_peers)
+
+    if '--ready-latency' in sys.argv:
+        analyzer = ReadyLatencyAnalyzer()
+        timeline = run_timeline(log_sources, export_files, [analyzer], offsets, event_types=(), since=since,
+                                until=until)
+        analyzer.report()
+    else:
+        timeline = TimelineMerge(log_sources, export_files, offsets, (grep,) if grep else None, since=since,
+                                 until=until)
+        shown = 0
+        for entry in timeline:
+            line = format_entry(entry)
+            if grep and grep not in line:
+                continue
+            print(line)
+            shown += 1
+            if limit is not None and shown >= limit:
+                break
+    if timeline.late_entries:
+        print(f"[WARN] {timeline.late_entries} entries lagged more than {REORDER_WINDOW:g}s behind their "
+              f"source and are out of order")
+
+
+if __name__ == '__main__':
+    main()